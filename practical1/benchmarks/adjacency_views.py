@@ -0,0 +1,112 @@
+"""
+Compares the list returning parse_* functions of DirectedCostGraph with the iterate_* views that read the adjacency
+dicts of the graph in place.
+
+Every workload is run twice, once through each API, and the time and the tracemalloc peak (memory allocated on top of
+the graph itself while the workload runs) are reported. A last check modifies the graph in the middle of an iteration
+to make sure the view raises GraphError.
+
+Run from the practical1 folder:
+    python -m benchmarks.adjacency_views [graph file]
+"""
+import sys
+import time
+import tracemalloc
+
+from controller.graph_controller import GraphController
+from domain.graph import DirectedCostGraph
+from errors.exceptions import GraphError
+
+
+def all_edges_with_lists(graph):
+    return sum(1 for edge in graph.parse_all_edges())
+
+
+def all_edges_with_views(graph):
+    return sum(1 for edge in graph.iterate_all_edges())
+
+
+def cost_scan_with_lists(graph):
+    total = 0
+    for vertex in graph.parse_all_vertices():
+        for successor, cost in graph.parse_out_edge_costs(vertex):
+            total += cost
+    return total
+
+
+def cost_scan_with_views(graph):
+    total = 0
+    for vertex in graph.iterate_all_vertices():
+        for successor, cost in graph.iterate_out_edge_costs(vertex):
+            total += cost
+    return total
+
+
+def earliest_start_with_lists(graph, order):
+    earliest = {}
+    for vertex in order:
+        earliest[vertex] = max((earliest[predecessor] + graph.get_edge_cost(predecessor, vertex)
+                                for predecessor in graph.parse_in_vertices(vertex) if predecessor in earliest),
+                               default=0)
+    return len(earliest)
+
+
+def earliest_start_with_views(graph, order):
+    earliest = {}
+    for vertex in order:
+        earliest[vertex] = max((earliest[predecessor] + cost
+                                for predecessor, cost in graph.iterate_in_edge_costs(vertex) if predecessor in earliest),
+                               default=0)
+    return len(earliest)
+
+
+def measure(function, *arguments):
+    """
+    :return: the tuple (result, seconds, peak bytes allocated while function ran); the time is taken on a separate
+            run, since tracing every allocation slows the function down
+    """
+    start = time.perf_counter()
+    result = function(*arguments)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function(*arguments)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def check_mutation_guard(graph):
+    vertex = next(vertex for vertex in graph.parse_all_vertices() if graph.get_out_degree(vertex) > 1)
+    successors = graph.iterate_out_vertices(vertex)
+    successor = next(successors)
+    graph.modify_edge_cost(vertex, successor, graph.get_edge_cost(vertex, successor))
+    try:
+        next(successors)
+    except GraphError:
+        return True
+    return False
+
+
+def main(file_path="data/graph10k.txt"):
+    graph = DirectedCostGraph()
+    graph.load_edges(*GraphController.parse_directed_graph_file(file_path))
+    order = graph.parse_all_vertices()
+    workloads = [
+        ("all edges", all_edges_with_lists, all_edges_with_views, ()),
+        ("edge cost scan", cost_scan_with_lists, cost_scan_with_views, ()),
+        ("earliest start", earliest_start_with_lists, earliest_start_with_views, (order,)),
+    ]
+    print(f'{file_path}: {graph.get_number_of_vertices()} vertices, {graph.get_number_of_edges()} edges')
+    print(f'{"workload":>15} {"lists ms":>9} {"views ms":>9} {"lists peak KiB":>15} {"views peak KiB":>15}')
+    for name, with_lists, with_views, arguments in workloads:
+        list_result, list_time, list_peak = measure(with_lists, graph, *arguments)
+        view_result, view_time, view_peak = measure(with_views, graph, *arguments)
+        if list_result != view_result:
+            print(f'{name}: the two versions disagree ({list_result} != {view_result})')
+        print(f'{name:>15} {list_time * 1000:>9.1f} {view_time * 1000:>9.1f} '
+              f'{list_peak / 1024:>15.1f} {view_peak / 1024:>15.1f}')
+    print(f'modifying the graph during iteration raises GraphError: {check_mutation_guard(graph)}')
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "data/graph10k.txt")
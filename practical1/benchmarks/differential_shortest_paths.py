@@ -0,0 +1,134 @@
+"""
+Differential check of the shortest path implementations on every graph file in data/.
+
+For every file that can be read as a directed graph, a sample of (start, end) pairs is answered by the reference, a
+copy of the plain Bellman-Ford that GraphController.shortest_path used before the shortest path engine, and by
+GraphController.shortest_path and GraphController.shortest_path_vectorized. Both must agree with the reference on
+whether there is a negative cycle and on the distance, and the returned paths must be real paths of the graph with
+exactly that cost (ties between equally cheap paths may be broken differently). An error raised by one of them counts
+as a mismatch too.
+
+Run from the practical1 folder:
+    python -m benchmarks.differential_shortest_paths
+The exit code is 1 if there is any mismatch.
+"""
+import glob
+import random
+import sys
+import time
+
+from controller.graph_controller import GraphController
+from domain.graph import DirectedCostGraph
+from errors.exceptions import GraphError
+
+IMPLEMENTATIONS = ["shortest_path", "shortest_path_vectorized"]
+
+
+def reference_shortest_path(graph, start_vertex, end_vertex):
+    """
+        The Bellman-Ford of the original GraphController.shortest_path, kept unchanged as the reference: every pass
+    relaxes all the edges, until a pass changes nothing or N passes were made
+    :return: False if there exists a negative cycle from the start vertex, else the tuple (distance, path)
+    """
+    distance = {}
+    predecessor = {}
+    for vertex in graph.parse_all_vertices():
+        distance[vertex] = float('inf')
+        predecessor[vertex] = None
+    distance[start_vertex] = 0
+
+    changed = True
+    i = 0
+    while changed and i < graph.get_number_of_vertices():
+        changed = False
+        i += 1
+        for edge in graph.parse_all_edges():
+            edge_start = edge[0]
+            edge_end = edge[1]
+            cost = graph.get_edge_cost(edge_start, edge_end)
+            if distance[edge_start] + cost < distance[edge_end]:
+                changed = True
+                distance[edge_end] = distance[edge_start] + cost
+                predecessor[edge_end] = edge_start
+
+    for vertex in graph.parse_all_vertices():
+        prev = predecessor[vertex]
+        if prev is None:
+            continue
+        cost = graph.get_edge_cost(prev, vertex)
+        if distance[prev] + cost < distance[vertex]:
+            return False
+
+    path = GraphController.find_path_from_predecessors(predecessor, end_vertex)
+    return distance[end_vertex], path
+
+
+def path_cost(controller, path):
+    return sum(controller.get_edge_cost(edge_start, edge_end) for edge_start, edge_end in zip(path, path[1:]))
+
+
+def check_result(controller, start_vertex, end_vertex, result):
+    if result is False:
+        return True
+    distance, path = result
+    if distance == float('inf'):
+        return path == [end_vertex]
+    return path[0] == start_vertex and path[-1] == end_vertex and path_cost(controller, path) == distance
+
+
+def check_file(file_path, number_of_pairs=20, seed=0):
+    """
+    :return: the number of mismatching pairs, or None if the file is not a directed graph file
+    """
+    try:
+        vertices, edge_starts, edge_ends, edge_costs = GraphController.parse_directed_graph_file(file_path)
+    except (ValueError, GraphError):
+        return None
+    # The reference reads its own graph, so nothing the controller caches or changes can leak into it
+    reference_graph = DirectedCostGraph()
+    reference_graph.load_edges(vertices, edge_starts, edge_ends, edge_costs)
+    controller = GraphController(DirectedCostGraph())
+    controller.read_directed_graph(file_path)
+    vertices = controller.get_all_vertices()
+    if not vertices:
+        print(f'{file_path:>28}: empty graph')
+        return 0
+    generator = random.Random(seed)
+    mismatches = 0
+    elapsed = dict.fromkeys(["reference"] + IMPLEMENTATIONS, 0.0)
+    for i in range(number_of_pairs):
+        start_vertex = generator.choice(vertices)
+        end_vertex = generator.choice(vertices)
+        start = time.perf_counter()
+        expected = reference_shortest_path(reference_graph, start_vertex, end_vertex)
+        elapsed["reference"] += time.perf_counter() - start
+        for name in IMPLEMENTATIONS:
+            start = time.perf_counter()
+            try:
+                actual = getattr(controller, name)(start_vertex, end_vertex)
+            except (GraphError, ValueError) as error:
+                actual = error
+            elapsed[name] += time.perf_counter() - start
+            same_distance = (expected is False) == (actual is False) and \
+                (expected is False or isinstance(actual, tuple) and expected[0] == actual[0])
+            if not same_distance or not check_result(controller, start_vertex, end_vertex, actual):
+                mismatches += 1
+                print(f'  {file_path} {start_vertex} -> {end_vertex}: reference {expected} != {name} {actual}')
+    print(f'{file_path:>28}: {mismatches} mismatches, ' +
+          ", ".join(f'{name} {seconds * 1000:.1f} ms' for name, seconds in elapsed.items()))
+    return mismatches
+
+
+def main():
+    total_mismatches = 0
+    for file_path in sorted(glob.glob("data/*.txt")):
+        mismatches = check_file(file_path)
+        if mismatches is None:
+            print(f'{file_path:>28}: skipped, not a directed graph file')
+            continue
+        total_mismatches += mismatches
+    return 1 if total_mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
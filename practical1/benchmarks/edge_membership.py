@@ -0,0 +1,90 @@
+"""
+Microbenchmark for edge membership, insertion and removal on hub-heavy graphs.
+
+Every graph built here has a single hub vertex 0 connected in both directions to all the other vertices, which is the
+worst case for adjacency lists: each is_edge / add_edge / remove_edge touching the hub used to scan a list as long as
+the hub's degree. With the per-vertex dicts of DirectedCostGraph the time per operation should stay flat while the
+degree grows. The list based reference reproduces the previous representation for comparison.
+
+Run from the practical1 folder:
+    python -m benchmarks.edge_membership
+"""
+import random
+import time
+
+from domain.graph import DirectedCostGraph
+
+
+class ListAdjacencyReference:
+    """
+        The previous adjacency representation (lists of neighbours plus a dict of costs), kept only as a baseline
+    """
+    def __init__(self, number_of_vertices):
+        self.dict_in = {vertex: [] for vertex in range(number_of_vertices)}
+        self.dict_out = {vertex: [] for vertex in range(number_of_vertices)}
+        self.dict_costs = {}
+
+    def is_edge(self, edge_start, edge_end):
+        return edge_start in self.dict_in[edge_end] and edge_end in self.dict_out[edge_start]
+
+    def add_edge(self, edge_start, edge_end, cost=0):
+        if self.is_edge(edge_start, edge_end):
+            return False
+        self.dict_in[edge_end].append(edge_start)
+        self.dict_out[edge_start].append(edge_end)
+        self.dict_costs[(edge_start, edge_end)] = cost
+        return True
+
+    def remove_edge(self, edge_start, edge_end):
+        if not self.is_edge(edge_start, edge_end):
+            return False
+        self.dict_in[edge_end].remove(edge_start)
+        self.dict_out[edge_start].remove(edge_end)
+        self.dict_costs.pop((edge_start, edge_end))
+        return True
+
+
+def build_hub_graph(graph, hub_degree):
+    for leaf in range(1, hub_degree + 1):
+        graph.add_edge(0, leaf, leaf)
+        graph.add_edge(leaf, 0, leaf)
+    return graph
+
+
+def time_operations(graph, hub_degree, number_of_operations=2000, seed=0):
+    """
+    :return: a dict with the average time in microseconds of is_edge, remove_edge and add_edge on hub edges
+    """
+    leaves = random.Random(seed).sample(range(1, hub_degree + 1), min(number_of_operations, hub_degree))
+    timings = {}
+    start = time.perf_counter()
+    for leaf in leaves:
+        graph.is_edge(0, leaf)
+    timings["is_edge"] = (time.perf_counter() - start) / len(leaves) * 1e6
+    start = time.perf_counter()
+    for leaf in leaves:
+        graph.remove_edge(0, leaf)
+    timings["remove_edge"] = (time.perf_counter() - start) / len(leaves) * 1e6
+    start = time.perf_counter()
+    for leaf in leaves:
+        graph.add_edge(0, leaf, leaf)
+    timings["add_edge"] = (time.perf_counter() - start) / len(leaves) * 1e6
+    return timings
+
+
+def main():
+    print(f'{"hub degree":>10} {"graph":>10} {"is_edge us":>11} {"remove us":>10} {"add us":>10}')
+    for hub_degree in (1000, 10000, 100000):
+        graph = DirectedCostGraph()
+        graph.initialize_vertices(hub_degree + 1)
+        implementations = [("dict", build_hub_graph(graph, hub_degree))]
+        if hub_degree <= 10000:
+            implementations.append(("list", build_hub_graph(ListAdjacencyReference(hub_degree + 1), hub_degree)))
+        for name, implementation in implementations:
+            timings = time_operations(implementation, hub_degree)
+            print(f'{hub_degree:>10} {name:>10} {timings["is_edge"]:>11.2f} {timings["remove_edge"]:>10.2f} '
+                  f'{timings["add_edge"]:>10.2f}')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Compares repairing a DynamicShortestPathTree after an edge change with recomputing the tree from scratch.
+
+A random sequence of edge insertions, removals and cost changes is applied to the graph; after every change the
+maintained tree is repaired and, separately, a full single-source computation is timed. The distances of both are
+compared so the benchmark also checks the repair.
+
+Run from the practical1 folder:
+    python -m benchmarks.incremental_shortest_paths [graph file] [number of updates]
+"""
+import random
+import sys
+import time
+
+from controller.dynamic_shortest_paths import DynamicShortestPathTree
+from controller.graph_controller import GraphController
+from controller.shortest_paths import ShortestPathEngine
+from domain.graph import DirectedCostGraph
+
+
+def apply_random_update(graph, vertices, generator):
+    """
+        Changes one random edge of the graph: adds a new edge, removes an edge or changes the cost of an edge
+    :return: the (edge_start, edge_end) of the changed edge and the kind of change
+    """
+    edge_start = generator.choice(vertices)
+    successors = graph.parse_out_vertices(edge_start)
+    kind = generator.choice(["insert", "delete", "increase", "decrease"])
+    if kind == "insert" or not successors:
+        edge_end = generator.choice(vertices)
+        graph.add_edge(edge_start, edge_end, generator.randint(0, 99))
+        return (edge_start, edge_end), "insert"
+    edge_end = generator.choice(successors)
+    if kind == "delete":
+        graph.remove_edge(edge_start, edge_end)
+    else:
+        cost = graph.get_edge_cost(edge_start, edge_end)
+        new_cost = cost + generator.randint(1, 50) if kind == "increase" else max(0, cost - generator.randint(1, 50))
+        graph.modify_edge_cost(edge_start, edge_end, new_cost)
+    return (edge_start, edge_end), kind
+
+
+def main(file_path="data/graph10k.txt", number_of_updates=200, start_vertex=1, seed=0):
+    graph = DirectedCostGraph()
+    vertices, edge_starts, edge_ends, edge_costs = GraphController.parse_directed_graph_file(file_path)
+    graph.load_edges(vertices, edge_starts, edge_ends, edge_costs)
+    vertices = graph.parse_all_vertices()
+    generator = random.Random(seed)
+
+    tree = DynamicShortestPathTree.from_graph(graph, start_vertex)
+    update_times = {}
+    recompute_times = []
+    mismatches = 0
+    for i in range(number_of_updates):
+        edge, kind = apply_random_update(graph, vertices, generator)
+        start = time.perf_counter()
+        tree.update_edge(*edge)
+        update_times.setdefault(kind, []).append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        distance, predecessor = ShortestPathEngine(graph).single_source(start_vertex)
+        recompute_times.append(time.perf_counter() - start)
+        if distance != tree.get_tree()[0]:
+            mismatches += 1
+
+    average_recompute = sum(recompute_times) / len(recompute_times)
+    print(f'{file_path}: {number_of_updates} updates, {mismatches} mismatches with full recomputation')
+    print(f'{"change":>10} {"count":>6} {"repair ms":>10} {"recompute ms":>13} {"speedup":>8}')
+    for kind, times in sorted(update_times.items()):
+        average_update = sum(times) / len(times)
+        print(f'{kind:>10} {len(times):>6} {average_update * 1000:>10.3f} {average_recompute * 1000:>13.3f} '
+              f'{average_recompute / max(average_update, 1e-9):>8.0f}')
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    main(arguments[0] if arguments else "data/graph10k.txt", int(arguments[1]) if len(arguments) > 1 else 200)
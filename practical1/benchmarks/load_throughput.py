@@ -0,0 +1,38 @@
+"""
+Measures how many edges per second GraphController.read_directed_graph loads.
+
+Run from the practical1 folder, optionally giving the files to load:
+    python -m benchmarks.load_throughput [data/graph10k.txt ...]
+"""
+import sys
+import time
+
+from controller.graph_controller import GraphController
+from domain.graph import DirectedCostGraph
+
+DEFAULT_FILES = ["data/graph1k.txt", "data/graph10k.txt"]
+
+
+def load_throughput(file_path, repeats=3):
+    """
+    :return: the tuple (number_of_edges, best_time_in_seconds, edges_per_second) of loading the file
+    """
+    controller = GraphController(DirectedCostGraph())
+    best_time = float('inf')
+    for i in range(repeats):
+        start = time.perf_counter()
+        controller.read_directed_graph(file_path)
+        best_time = min(best_time, time.perf_counter() - start)
+    number_of_edges = controller.get_number_of_edges()
+    return number_of_edges, best_time, number_of_edges / best_time
+
+
+def main(file_paths):
+    print(f'{"file":>24} {"edges":>10} {"seconds":>9} {"edges/s":>12}')
+    for file_path in file_paths:
+        number_of_edges, best_time, edges_per_second = load_throughput(file_path)
+        print(f'{file_path:>24} {number_of_edges:>10} {best_time:>9.4f} {edges_per_second:>12.0f}')
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or DEFAULT_FILES)
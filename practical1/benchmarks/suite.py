@@ -0,0 +1,232 @@
+"""
+Benchmark suite timing the main GraphController operations on graphs of growing size.
+
+For every size n (1k = 1000 vertices, ...) two graph files are generated with a fixed seed and written to a temporary
+folder: a random graph with n vertices and 4n edges (the shape of graph1k.txt and graph10k.txt) and a layered DAG of n
+vertices with 4 predecessors per vertex for the scheduling functions. Timed on them:
+    read_directed_graph                     loading the random graph file
+    shortest_path                           SHORTEST_PATH_QUERIES random queries on the random graph
+    connected_components_BFS                on the random graph read as an undirected graph
+    topological_sort_counting_predecessors  on the DAG
+    critical_activities                     on the DAG
+    get_copy                                of the random graph
+    write_graph_data                        of the random graph
+Every operation is run once under tracemalloc for its peak memory (the memory it allocates on top of the graph it works
+on), then timed without tracemalloc, which slows Python down, keeping the best of the repeats and their spread (the
+slowest minus the best). The shortest path queries and the scheduling functions get a new GraphController every time,
+so their cached shortest path trees and schedule are not reused.
+
+The results are written as JSON with the machine they were measured on. Given a baseline (an earlier results file),
+every operation slower or hungrier than the baseline by more than the threshold is reported as a regression, and the
+exit code is 1 if there is any. A time difference is only reported if it is above MIN_SECONDS_DIFFERENCE and above the
+spread of the operation in both runs, which is the noise of its timing.
+
+Run from the practical1 folder:
+    python -m benchmarks.suite [--sizes 1k,10k,100k,1m] [--repeats 3] [--output results.json]
+                               [--baseline baseline.json] [--threshold 0.25]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from controller.graph_controller import GraphController
+from controller.graph_generators import write_layered_dag
+from domain.graph import DirectedCostGraph
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+DEFAULT_SIZES = "1k,10k,100k"
+EDGES_PER_VERTEX = 4
+DAG_LAYER_WIDTH = 100
+SHORTEST_PATH_QUERIES = 10
+SEED = 0
+# Differences smaller than these are noise, whatever the ratio
+MIN_SECONDS_DIFFERENCE = 0.01
+MIN_BYTES_DIFFERENCE = 1 << 20
+
+
+def parse_size(text: str) -> int:
+    """
+        "1k" -> 1000, "1m" -> 1000000, "2500" -> 2500
+    """
+    text = text.strip().lower()
+    multiplier = {"k": 1000, "m": 1000000}.get(text[-1:], 1)
+    return int(text[:-1] if multiplier != 1 else text) * multiplier
+
+
+def get_machine_metadata() -> dict:
+    metadata = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "numpy": numpy.__version__ if numpy is not None else None,
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+    }
+    try:
+        metadata["commit"] = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                            check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        metadata["commit"] = None
+    return metadata
+
+
+def generate_graph_files(number_of_vertices: int, folder: str):
+    """
+        Writes the random graph and the DAG of the given size to the folder
+    :return: the tuple (random graph path, DAG path)
+    """
+    graph_path = os.path.join(folder, f'random-{number_of_vertices}.txt')
+    dag_path = os.path.join(folder, f'dag-{number_of_vertices}.txt')
+    controller = GraphController(DirectedCostGraph())
+    controller.random_directed_graph(number_of_vertices, EDGES_PER_VERTEX * number_of_vertices, seed=SEED)
+    controller.write_graph_data(graph_path, with_header=True)
+    layer_width = min(DAG_LAYER_WIDTH, number_of_vertices)
+    write_layered_dag(dag_path, number_of_vertices // layer_width, layer_width, min(EDGES_PER_VERTEX, layer_width),
+                      seed=SEED)
+    return graph_path, dag_path
+
+
+def load_graph(file_path: str) -> DirectedCostGraph:
+    vertices, edge_starts, edge_ends, edge_costs = GraphController.parse_directed_graph_file(file_path)
+    graph = DirectedCostGraph()
+    graph.load_edges(vertices, edge_starts, edge_ends, edge_costs)
+    return graph
+
+
+def prepare_operations(graph_path: str, dag_path: str, folder: str):
+    """
+        Loads what the operations work on, outside of the measurements
+    :return: the list of (operation name, number of calls, function to measure)
+    """
+    graph = load_graph(graph_path)
+    controller = GraphController(graph)
+    vertices = graph.parse_all_vertices()
+    generator = random.Random(SEED)
+    queries = [(generator.choice(vertices), generator.choice(vertices)) for i in range(SHORTEST_PATH_QUERIES)]
+    undirected_controller = GraphController(DirectedCostGraph())
+    undirected_controller.read_undirected_graph(graph_path)
+    dag = load_graph(dag_path)
+    output_path = os.path.join(folder, "output.txt")
+    return [
+        ("read_directed_graph", 1, lambda: GraphController(DirectedCostGraph()).read_directed_graph(graph_path)),
+        ("shortest_path", len(queries),
+         lambda: [GraphController(graph).shortest_path(start_vertex, end_vertex)
+                  for start_vertex, end_vertex in queries]),
+        ("connected_components_BFS", 1, undirected_controller.connected_components_BFS),
+        ("topological_sort_counting_predecessors", 1,
+         lambda: GraphController(dag).topological_sort_counting_predecessors()),
+        ("critical_activities", 1, lambda: GraphController(dag).critical_activities()),
+        ("get_copy", 1, graph.get_copy),
+        ("write_graph_data", 1, lambda: controller.write_graph_data(output_path)),
+    ]
+
+
+def measure(function, repeats: int):
+    """
+    :return: the tuple (best time in seconds, slowest minus best time in seconds, peak traced memory in bytes) of
+            calling the function
+    """
+    tracemalloc.start()
+    try:
+        function()
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    times = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times), max(times) - min(times), peak_bytes
+
+
+def run_suite(sizes, repeats: int) -> dict:
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        for size_name in sizes:
+            number_of_vertices = parse_size(size_name)
+            start = time.perf_counter()
+            graph_path, dag_path = generate_graph_files(number_of_vertices, folder)
+            operations = prepare_operations(graph_path, dag_path, folder)
+            print(f'{size_name}: graphs generated and loaded in {time.perf_counter() - start:.1f} s', flush=True)
+            for operation, calls, function in operations:
+                seconds, spread_seconds, peak_bytes = measure(function, repeats)
+                results.append({"size": size_name, "vertices": number_of_vertices,
+                                "edges": EDGES_PER_VERTEX * number_of_vertices, "operation": operation,
+                                "calls": calls, "seconds": seconds, "spread_seconds": spread_seconds,
+                                "peak_bytes": peak_bytes})
+                print(f'{size_name:>6} {operation:<40} {seconds:>10.4f} s {peak_bytes / (1 << 20):>9.1f} MiB',
+                      flush=True)
+            os.remove(graph_path)
+            os.remove(dag_path)
+    return {"metadata": get_machine_metadata(), "repeats": repeats, "seed": SEED, "results": results}
+
+
+def compare_with_baseline(report: dict, baseline: dict, threshold: float) -> list:
+    """
+    :return: the list of regression messages: every (size, operation) measured in both reports whose time or peak
+            memory grew by more than threshold (0.25 = 25%) and by more than its noise
+    """
+    baseline_results = {(result["size"], result["operation"]): result for result in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        old_result = baseline_results.get((result["size"], result["operation"]))
+        if old_result is None:
+            continue
+        # Baselines written before the spread was measured have none
+        min_seconds_difference = max(MIN_SECONDS_DIFFERENCE, result.get("spread_seconds", 0),
+                                     old_result.get("spread_seconds", 0))
+        for key, min_difference in (("seconds", min_seconds_difference), ("peak_bytes", MIN_BYTES_DIFFERENCE)):
+            old_value = old_result[key]
+            new_value = result[key]
+            if new_value > old_value * (1 + threshold) and new_value - old_value > min_difference:
+                regressions.append(f'{result["size"]} {result["operation"]}: {key} {old_value:.4g} -> {new_value:.4g}')
+    return regressions
+
+
+def main(arguments) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite",
+                                     description="Times the GraphController operations on graphs of growing size.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f'comma separated sizes (default {DEFAULT_SIZES})')
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per operation, the best is kept")
+    parser.add_argument("--output", help="JSON file to write the results to")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="relative slowdown or memory growth reported as a regression (default 0.25)")
+    options = parser.parse_args(arguments)
+
+    report = run_suite(options.sizes.split(","), options.repeats)
+    if options.output:
+        output_file = open(options.output, "wt")
+        json.dump(report, output_file, indent=2)
+        output_file.close()
+        print(f'Results written to {options.output}')
+    if options.baseline:
+        baseline_file = open(options.baseline, "rt")
+        baseline = json.load(baseline_file)
+        baseline_file.close()
+        regressions = compare_with_baseline(report, baseline, options.threshold)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            return 1
+        print(f'No regression above {options.threshold * 100:.0f}% compared to {options.baseline}')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,68 @@
+"""
+Benchmarks the level decomposition of controller/topological_levels.py on a generated DAG.
+
+The DAG has the vertices 0 .. n - 1 and edges only from a smaller to a greater vertex, each edge reaching at most
+"span" vertices ahead, so there are many levels of moderate width, like in a large dependency graph. Timed:
+    - GraphController.earliest_start: the single topological sort + forward pass of the scheduling engine
+    - topological_levels: the same sort, one Kahn frontier per round
+    - vectorized_earliest_start: levels and earliest times with NumPy, one batch per level (including the conversion
+      to a CompactDirectedCostGraph, timed separately)
+The earliest times of the two earliest start versions are compared.
+
+Run from the practical1 folder:
+    python -m benchmarks.topological_levels [number of vertices] [number of edges]
+"""
+import random
+import sys
+import time
+
+from controller.graph_controller import GraphController
+from controller.topological_levels import topological_levels, get_antichain_width, vectorized_earliest_start
+from domain.compact_graph import CompactDirectedCostGraph
+from domain.graph import DirectedCostGraph
+
+
+def generate_dag(number_of_vertices, number_of_edges, span=1000, seed=0):
+    generator = random.Random(seed)
+    edge_starts = []
+    edge_ends = []
+    edge_costs = []
+    for i in range(number_of_edges):
+        edge_start = generator.randrange(number_of_vertices - 1)
+        edge_starts.append(edge_start)
+        edge_ends.append(min(number_of_vertices - 1, edge_start + generator.randint(1, span)))
+        edge_costs.append(generator.randint(0, 99))
+    graph = DirectedCostGraph()
+    graph.load_edges(range(number_of_vertices), edge_starts, edge_ends, edge_costs)
+    return graph
+
+
+def timed(function, *arguments):
+    start = time.perf_counter()
+    result = function(*arguments)
+    return result, time.perf_counter() - start
+
+
+def main(number_of_vertices=100000, number_of_edges=1000000):
+    graph, elapsed = timed(generate_dag, number_of_vertices, number_of_edges)
+    print(f'DAG with {graph.get_number_of_vertices()} vertices and {graph.get_number_of_edges()} edges '
+          f'generated in {elapsed:.1f} s')
+    controller = GraphController(graph)
+
+    earliest, sort_time = timed(controller.earliest_start)
+    levels, levels_time = timed(topological_levels, graph)
+    compact_graph, conversion_time = timed(CompactDirectedCostGraph.from_graph, graph)
+    (vectorized_levels, vectorized_earliest), vectorized_time = timed(vectorized_earliest_start, compact_graph)
+
+    print(f'{len(levels)} levels, antichain width {get_antichain_width(levels)}')
+    print(f'{"earliest_start (topological sort + forward pass)":<55} {sort_time:>7.2f} s')
+    print(f'{"topological_levels":<55} {levels_time:>7.2f} s')
+    print(f'{"conversion to CompactDirectedCostGraph":<55} {conversion_time:>7.2f} s')
+    print(f'{"vectorized_earliest_start":<55} {vectorized_time:>7.2f} s')
+    print(f'same levels: {[sorted(level) for level in levels] == [sorted(level) for level in vectorized_levels]}, '
+          f'same earliest times: {earliest == vectorized_earliest}')
+
+
+if __name__ == "__main__":
+    arguments = [int(argument) for argument in sys.argv[1:]]
+    main(*arguments)
@@ -0,0 +1,75 @@
+"""
+Streaming loader for activity networks.
+
+Every line of an activity file describes one activity:
+    name predecessors duration
+where predecessors is a comma separated list of activity names, or "-" if the activity can start right away, e.g.
+    A - 3
+    B A 2
+    C A,B 4
+
+The file is read one line at a time and the activity names are interned to dense integer vertex ids, so the graph
+never holds strings: vertex 0 is a synthetic source, the activities get 1, 2, ... in the order they first appear and
+the last vertex is a synthetic sink. The duration of an activity is the cost of all its inbound edges, so the earliest
+time of a vertex is the moment the activity can be finished at the earliest, and the earliest time of the sink is the
+duration of the whole project. Activities without successors get an edge of cost 0 to the sink.
+"""
+from controller.text_graph_file import open_graph_file
+from errors.exceptions import GraphError
+
+SOURCE_NAME = "source"
+SINK_NAME = "sink"
+
+
+def parse_activity_file(file_path: str):
+    """
+        Reads an activity file into parallel edge lists, ready for DirectedCostGraph.load_edges
+    :return: the tuple (names, edge_starts, edge_ends, edge_costs) where names[v] is the name of vertex v: SOURCE_NAME
+            for 0, SINK_NAME for the last vertex and the activity names in between; the vertices are 0 .. len(names) - 1
+            raises GraphError if a line is not "name predecessors duration"
+    """
+    names = [SOURCE_NAME]
+    ids = {}
+    edge_starts = []
+    edge_ends = []
+    edge_costs = []
+    has_successors = bytearray(1)
+
+    def intern(name):
+        vertex = ids.get(name)
+        if vertex is None:
+            vertex = ids[name] = len(names)
+            names.append(name)
+            has_successors.append(0)
+        return vertex
+
+    input_file = open_graph_file(file_path, "rt")
+    try:
+        for line_number, line in enumerate(input_file, 1):
+            fields = line.split()
+            if not fields:
+                continue
+            if len(fields) != 3:
+                raise GraphError(f'Line {line_number} of {file_path} is not "name predecessors duration".')
+            activity = intern(fields[0])
+            try:
+                duration = int(fields[2])
+            except ValueError:
+                raise GraphError(f'The duration on line {line_number} of {file_path} is not an integer.')
+            predecessors = [0] if fields[1] == '-' else [intern(name) for name in fields[1].split(',')]
+            for predecessor in predecessors:
+                edge_starts.append(predecessor)
+                edge_ends.append(activity)
+                edge_costs.append(duration)
+                has_successors[predecessor] = 1
+    finally:
+        input_file.close()
+
+    sink = len(names)
+    names.append(SINK_NAME)
+    for vertex in range(1, sink):
+        if not has_successors[vertex]:
+            edge_starts.append(vertex)
+            edge_ends.append(sink)
+            edge_costs.append(0)
+    return names, edge_starts, edge_ends, edge_costs
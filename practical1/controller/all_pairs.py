@@ -0,0 +1,247 @@
+"""
+All-pairs shortest paths with Johnson's algorithm, computed by a pool of worker processes.
+
+1. One Bellman-Ford pass from a virtual vertex linked to every vertex with cost 0 gives the potentials h, or finds a
+   negative cycle.
+2. Every edge (u, v) is reweighted to cost(u, v) + h(u) - h(v) >= 0, so Dijkstra can be used from every source.
+3. The reweighted graph is put once in shared memory as CSR arrays. Every worker process attaches to it instead of
+   receiving a pickled copy of the graph, runs Dijkstra for its share of the sources and writes the resulting rows
+   straight into the output file, at the position of every row, through a file object of its own.
+
+Distance matrix file (all values little-endian):
+    header (16 bytes): magic b'DCGM', format version (uint32), number_of_vertices (int64)
+    vertices:          n int64, the vertex id of every row / column
+    distances:         n rows of n float64; row i holds the distances from vertex i, inf if unreachable
+so a 10k x 10k matrix never has to be held in memory as Python objects; DistanceMatrixFile reads it with mmap.
+"""
+import mmap
+import struct
+import sys
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappush, heappop
+from multiprocessing import shared_memory
+
+from domain.compact_graph import CompactDirectedCostGraph, ARRAY_TYPECODE
+from errors.exceptions import GraphError
+
+MATRIX_MAGIC = b'DCGM'
+MATRIX_FORMAT_VERSION = 1
+MATRIX_HEADER = struct.Struct('<4sIq')
+SOURCES_PER_TASK = 32
+
+# The shared arrays of the worker process, filled by _attach_worker
+_worker_state = {}
+
+
+def compute_potentials(out_offsets, out_targets, out_costs):
+    """
+        Runs queue-based Bellman-Ford from a virtual vertex with a 0 cost edge to every vertex of the CSR graph
+    :return: the list of potentials h of the dense vertices, or None if the graph has a negative cycle
+    """
+    number_of_vertices = len(out_offsets) - 1
+    potential = [0] * number_of_vertices
+    # Number of edges on the best path from the virtual vertex, which is one more vertex of the graph
+    path_length = [1] * number_of_vertices
+    queue = deque(range(number_of_vertices))
+    in_queue = [True] * number_of_vertices
+    while queue:
+        vertex = queue.popleft()
+        in_queue[vertex] = False
+        current_potential = potential[vertex]
+        for position in range(out_offsets[vertex], out_offsets[vertex + 1]):
+            successor = out_targets[position]
+            new_potential = current_potential + out_costs[position]
+            if new_potential < potential[successor]:
+                potential[successor] = new_potential
+                path_length[successor] = path_length[vertex] + 1
+                if path_length[successor] > number_of_vertices:
+                    return None
+                if not in_queue[successor]:
+                    in_queue[successor] = True
+                    queue.append(successor)
+    return potential
+
+
+def _dijkstra_row(source, out_offsets, out_targets, reweighted_costs, potential):
+    """
+        Dijkstra on the reweighted CSR graph from the dense vertex source
+    :return: the array of float64 real distances from source to every dense vertex
+    """
+    number_of_vertices = len(out_offsets) - 1
+    infinity = float('inf')
+    distance = [infinity] * number_of_vertices
+    distance[source] = 0
+    heap = [(0, source)]
+    while heap:
+        current_distance, vertex = heappop(heap)
+        if current_distance > distance[vertex]:
+            continue
+        for position in range(out_offsets[vertex], out_offsets[vertex + 1]):
+            successor = out_targets[position]
+            new_distance = current_distance + reweighted_costs[position]
+            if new_distance < distance[successor]:
+                distance[successor] = new_distance
+                heappush(heap, (new_distance, successor))
+    source_potential = potential[source]
+    return array('d', [value - source_potential + potential[vertex] if value != infinity else infinity
+                       for vertex, value in enumerate(distance)])
+
+
+def _attach_worker(shared_memory_names, number_of_vertices, number_of_edges, output_path):
+    """
+        Initializer of every worker process: maps the shared CSR arrays and opens the output file
+    """
+    lengths = [number_of_vertices + 1, number_of_edges, number_of_edges, number_of_vertices]
+    arrays = []
+    blocks = []
+    for name, length in zip(shared_memory_names, lengths):
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        arrays.append(block.buf[:8 * length].cast(ARRAY_TYPECODE))
+    _worker_state["blocks"] = blocks
+    _worker_state["arrays"] = arrays
+    _worker_state["output_file"] = _open_rows_file(output_path)
+    _worker_state["rows_offset"] = MATRIX_HEADER.size + 8 * number_of_vertices
+
+
+def _open_rows_file(output_path: str):
+    """
+        Opens the output file for the rows of one process. It is not buffered, so every row is in the file as soon as
+    it is written, and nothing is lost when a worker process exits without closing it.
+    """
+    return open(output_path, "r+b", buffering=0)
+
+
+def _compute_rows(sources):
+    """
+        Worker task: computes the distance rows of the given dense sources and writes them to the output file
+    :return: the number of rows written
+    """
+    out_offsets, out_targets, reweighted_costs, potential = _worker_state["arrays"]
+    output_file = _worker_state["output_file"]
+    row_size = 8 * (len(out_offsets) - 1)
+    for source in sources:
+        row = _dijkstra_row(source, out_offsets, out_targets, reweighted_costs, potential)
+        if sys.byteorder != 'little':
+            row.byteswap()
+        # Every process has its own file object, so the position set by seek is not shared with the other workers
+        output_file.seek(_worker_state["rows_offset"] + source * row_size)
+        output_file.write(row.tobytes())
+    return len(sources)
+
+
+def _create_shared_array(values):
+    values = array(ARRAY_TYPECODE, values)
+    block = shared_memory.SharedMemory(create=True, size=max(8, 8 * len(values)))
+    block.buf[:8 * len(values)] = values.tobytes()
+    return block
+
+
+def johnson_all_pairs(graph, output_path: str, max_workers=None) -> bool:
+    """
+        Computes the distances between all pairs of vertices of the graph and writes them to output_path in the
+    distance matrix format described above
+    :param graph: a DirectedCostGraph or CompactDirectedCostGraph
+    :param output_path: the distance matrix file to be written
+    :param max_workers: the number of worker processes, os.cpu_count() if None; with 1 everything runs in this process
+    :return: False if the graph has a negative cycle (no file is written), True otherwise
+    """
+    if not isinstance(graph, CompactDirectedCostGraph):
+        graph = CompactDirectedCostGraph.from_graph(graph)
+    vertices, out_offsets, out_targets, out_costs, in_offsets, in_sources = graph.get_csr_arrays()
+    number_of_vertices = graph.get_number_of_vertices()
+    number_of_edges = graph.get_number_of_edges()
+    potential = compute_potentials(out_offsets, out_targets, out_costs)
+    if potential is None:
+        return False
+    reweighted_costs = array(ARRAY_TYPECODE, out_costs)
+    for vertex in range(number_of_vertices):
+        for position in range(out_offsets[vertex], out_offsets[vertex + 1]):
+            reweighted_costs[position] += potential[vertex] - potential[out_targets[position]]
+
+    # The header and the vertex table are written now; the rows are filled in by the workers
+    output_file = open(output_path, "wb")
+    output_file.write(MATRIX_HEADER.pack(MATRIX_MAGIC, MATRIX_FORMAT_VERSION, number_of_vertices))
+    vertex_table = array(ARRAY_TYPECODE, vertices if vertices is not None else range(number_of_vertices))
+    if sys.byteorder != 'little':
+        vertex_table.byteswap()
+    output_file.write(vertex_table.tobytes())
+    output_file.truncate(MATRIX_HEADER.size + 8 * number_of_vertices * (number_of_vertices + 1))
+    output_file.close()
+
+    tasks = [range(start, min(start + SOURCES_PER_TASK, number_of_vertices))
+             for start in range(0, number_of_vertices, SOURCES_PER_TASK)]
+    if max_workers == 1:
+        _worker_state["arrays"] = [out_offsets, out_targets, reweighted_costs, potential]
+        _worker_state["output_file"] = _open_rows_file(output_path)
+        _worker_state["rows_offset"] = MATRIX_HEADER.size + 8 * number_of_vertices
+        try:
+            for sources in tasks:
+                _compute_rows(sources)
+        finally:
+            _worker_state["output_file"].close()
+            _worker_state.clear()
+        return True
+
+    blocks = [_create_shared_array(values) for values in (out_offsets, out_targets, reweighted_costs, potential)]
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach_worker,
+                                 initargs=([block.name for block in blocks], number_of_vertices, number_of_edges,
+                                           output_path)) as executor:
+            for written_rows in executor.map(_compute_rows, tasks):
+                pass
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+    return True
+
+
+class DistanceMatrixFile:
+    def __init__(self, file_path: str):
+        """
+            Opens a distance matrix file written by johnson_all_pairs with mmap, without reading the distances
+        raises GraphError if the file is not a distance matrix file
+        """
+        input_file = open(file_path, "rb")
+        try:
+            self.__mapped_file = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise GraphError(f'{file_path} is empty.')
+        finally:
+            input_file.close()
+        magic, version, number_of_vertices = MATRIX_HEADER.unpack_from(self.__mapped_file)
+        if magic != MATRIX_MAGIC or version != MATRIX_FORMAT_VERSION:
+            raise GraphError(f'{file_path} is not a distance matrix file.')
+        if len(self.__mapped_file) != MATRIX_HEADER.size + 8 * number_of_vertices * (number_of_vertices + 1):
+            raise GraphError(f'{file_path} is truncated or corrupted.')
+        self.__number_of_vertices = number_of_vertices
+        payload = memoryview(self.__mapped_file)[MATRIX_HEADER.size:]
+        self.__vertices = payload[:8 * number_of_vertices].cast(ARRAY_TYPECODE)
+        self.__distances = payload[8 * number_of_vertices:].cast('d')
+        self.__index = {vertex: index for index, vertex in enumerate(self.__vertices)}
+
+    def get_vertices(self) -> list:
+        return list(self.__vertices)
+
+    def get_distance(self, start_vertex, end_vertex):
+        """
+        :return: the distance from start_vertex to end_vertex (an int, or inf if it is unreachable)
+                raises GraphError if one of the vertices is not in the matrix
+        """
+        if start_vertex not in self.__index or end_vertex not in self.__index:
+            raise GraphError("Vertex is not within the graph.")
+        value = self.__distances[self.__index[start_vertex] * self.__number_of_vertices + self.__index[end_vertex]]
+        return value if value == float('inf') else int(value)
+
+    def get_row(self, start_vertex) -> dict:
+        """
+        :return: dict mapping every vertex to its distance from start_vertex
+        """
+        if start_vertex not in self.__index:
+            raise GraphError("Vertex is not within the graph.")
+        row_start = self.__index[start_vertex] * self.__number_of_vertices
+        row = self.__distances[row_start:row_start + self.__number_of_vertices]
+        return {vertex: value if value == float('inf') else int(value) for vertex, value in zip(self.__vertices, row)}
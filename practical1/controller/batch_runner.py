@@ -0,0 +1,200 @@
+"""
+Batch runner for shortest path queries over many graphs.
+
+A query file has one query per line:
+    graph_path start_vertex end_vertex
+e.g.
+    data/graph1k.txt 1 100
+    data/graph1k.txt 1 200
+    data/graph10k.txt 5 7
+Blank lines and lines starting with # are skipped. The graph files may be in any format read_directed_graph accepts,
+compressed or not.
+
+The queries are grouped by graph and then by start vertex, so every graph is loaded once and every start vertex is
+searched once: a start vertex with a single query uses GraphController.shortest_path (which may stop early), one with
+several queries computes its shortest path tree once and answers all of them from it. Every graph is a task of a pool
+of worker processes, and the results of a graph are written as soon as its task is done, so they do not all wait in
+memory.
+
+Every query gets one record:
+    query      the line number of the query in the query file (or its position in the list of queries)
+    graph, start_vertex, end_vertex
+    distance   the cost of the path, None if end_vertex can not be reached
+    path       the list of vertices of the path, None if end_vertex can not be reached
+    seconds    the time taken to answer the query; the first query of a start vertex includes its search
+    error      only when the query could not be answered (missing graph file, unknown vertex, negative cycle), instead
+               of distance, path and seconds
+The records are written as JSON lines, or as CSV (the path as space separated vertices) if the output file name ends
+in .csv. Records are grouped by graph, in the order the graphs are done; within a graph they are in query order.
+"""
+import csv
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from controller.graph_controller import GraphController
+from domain.graph import DirectedCostGraph
+from errors.exceptions import GraphError
+
+CSV_FIELDS = ["query", "graph", "start_vertex", "end_vertex", "distance", "path", "seconds", "error"]
+
+
+def read_query_file(file_path: str) -> list:
+    """
+    :return: the list of (query number, graph_path, start_vertex, end_vertex) tuples of the query file, the query
+            number being the line number
+            raises GraphError if a line is not "graph_path start_vertex end_vertex" with integer vertices
+    """
+    queries = []
+    input_file = open(file_path, "rt")
+    try:
+        for line_number, line in enumerate(input_file, 1):
+            fields = line.split()
+            if not fields or fields[0].startswith('#'):
+                continue
+            if len(fields) != 3:
+                raise GraphError(f'Line {line_number} of {file_path} is not "graph_path start_vertex end_vertex".')
+            try:
+                queries.append((line_number, fields[0], int(fields[1]), int(fields[2])))
+            except ValueError:
+                raise GraphError(f'The vertices on line {line_number} of {file_path} are not integers.')
+    finally:
+        input_file.close()
+    return queries
+
+
+def group_queries(queries) -> dict:
+    """
+    :return: dict mapping every graph_path to a dict mapping every start_vertex to its list of (query number,
+            end_vertex) pairs, all in query order
+    """
+    groups = {}
+    for query_number, graph_path, start_vertex, end_vertex in queries:
+        groups.setdefault(graph_path, {}).setdefault(start_vertex, []).append((query_number, end_vertex))
+    return groups
+
+
+def _error_records(graph_path, queries_by_start_vertex, message):
+    return [{"query": query_number, "graph": graph_path, "start_vertex": start_vertex, "end_vertex": end_vertex,
+             "error": message}
+            for start_vertex, queries in queries_by_start_vertex.items() for query_number, end_vertex in queries]
+
+
+def answer_graph_queries(graph_path: str, queries_by_start_vertex: dict) -> list:
+    """
+        Worker task: loads one graph and answers all its queries
+    :param queries_by_start_vertex: one value of the dict returned by group_queries
+    :return: the list of records of the queries, sorted by query number
+    """
+    try:
+        vertices, edge_starts, edge_ends, edge_costs = GraphController.parse_directed_graph_file(graph_path)
+    except (OSError, ValueError, GraphError) as error:
+        return _error_records(graph_path, queries_by_start_vertex, f'Could not read {graph_path}: {error}')
+    graph = DirectedCostGraph()
+    graph.load_edges(vertices, edge_starts, edge_ends, edge_costs)
+    graph_controller = GraphController(graph)
+
+    records = []
+    for start_vertex, queries in queries_by_start_vertex.items():
+        if not graph.is_vertex(start_vertex):
+            records.extend(_error_records(graph_path, {start_vertex: queries}, "Vertex is not within the graph."))
+            continue
+        start = time.perf_counter()
+        shortest_path_tree = None
+        if len(queries) > 1:
+            shortest_path_tree = graph_controller.shortest_paths_from(start_vertex)
+        for query_number, end_vertex in queries:
+            record = {"query": query_number, "graph": graph_path, "start_vertex": start_vertex,
+                      "end_vertex": end_vertex}
+            records.append(record)
+            if not graph.is_vertex(end_vertex):
+                record["error"] = "Vertex is not within the graph."
+                continue
+            if shortest_path_tree is None:
+                result = graph_controller.shortest_path(start_vertex, end_vertex)
+            elif shortest_path_tree is False:
+                result = False
+            else:
+                distance, predecessor = shortest_path_tree
+                result = distance[end_vertex], GraphController.find_path_from_predecessors(predecessor, end_vertex)
+            if result is False:
+                record["error"] = "There is a negative cycle reachable from the start vertex."
+                continue
+            distance, path = result
+            if distance == float('inf'):
+                distance, path = None, None
+            record["distance"] = distance
+            record["path"] = path
+            record["seconds"] = time.perf_counter() - start
+            start = time.perf_counter()
+    records.sort(key=lambda record: record["query"])
+    return records
+
+
+class _RecordWriter:
+    def __init__(self, file_path: str):
+        """
+            Writes records to file_path as JSON lines, or as CSV if its name ends in .csv
+        """
+        self.__output_file = open(file_path, "wt", newline="")
+        self.__csv_writer = None
+        if file_path.endswith(".csv"):
+            self.__csv_writer = csv.DictWriter(self.__output_file, CSV_FIELDS)
+            self.__csv_writer.writeheader()
+
+    def write(self, records) -> None:
+        if self.__csv_writer is None:
+            self.__output_file.write("".join([json.dumps(record) + "\n" for record in records]))
+            return
+        for record in records:
+            if record.get("path") is not None:
+                record = dict(record, path=" ".join(map(str, record["path"])))
+            self.__csv_writer.writerow(record)
+
+    def close(self) -> None:
+        self.__output_file.close()
+
+
+def run_queries(queries, output_path: str, max_workers=None):
+    """
+        Answers the queries, one graph per worker process, and writes their records to output_path as the graphs are
+    done
+    :param queries: (query number, graph_path, start_vertex, end_vertex) tuples, like read_query_file returns
+    :param max_workers: the number of worker processes, os.cpu_count() if None; with 1 everything runs in this process
+    :return: the tuple (number of queries answered, number of error records)
+    """
+    groups = group_queries(queries)
+    number_of_answers = 0
+    number_of_errors = 0
+    writer = _RecordWriter(output_path)
+    try:
+        if max_workers == 1:
+            results = (answer_graph_queries(graph_path, queries_by_start_vertex)
+                       for graph_path, queries_by_start_vertex in groups.items())
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+            results = (task.result() for task in as_completed(
+                [executor.submit(answer_graph_queries, graph_path, queries_by_start_vertex)
+                 for graph_path, queries_by_start_vertex in groups.items()]))
+        try:
+            for records in results:
+                writer.write(records)
+                errors = sum(1 for record in records if "error" in record)
+                number_of_errors += errors
+                number_of_answers += len(records) - errors
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+    finally:
+        writer.close()
+    return number_of_answers, number_of_errors
+
+
+def run_query_file(query_file_path: str, output_path: str, max_workers=None):
+    """
+        Reads the query file and answers its queries with run_queries
+    :return: the tuple (number of queries answered, number of error records)
+            raises GraphError if the query file is malformed
+    """
+    return run_queries(read_query_file(query_file_path), output_path, max_workers)
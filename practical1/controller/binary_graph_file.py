@@ -0,0 +1,114 @@
+"""
+Binary on-disk format for CompactDirectedCostGraph, loaded with mmap.
+
+Layout (all integers little-endian):
+    header (32 bytes):  magic b'DCGB', format version (uint32), flags (uint32), crc32 of the payload (uint32),
+                        number_of_vertices (int64), number_of_edges (int64)
+    payload:            [vertices (n int64), only if flags has HAS_VERTEX_TABLE]
+                        out_offsets (n + 1 int64), out_targets (m int64), out_costs (m int64),
+                        in_offsets (n + 1 int64), in_sources (m int64)
+
+Every array starts at a multiple of 8 bytes, so the loader can use the mapped file directly as the arrays of the graph:
+opening a file only maps it, no edge is read or copied until an algorithm touches it.
+
+Converting a text graph file from the command line (run from the practical1 folder):
+    python -m controller.binary_graph_file data/graph10k.txt data/graph10k.dcg
+"""
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+
+from domain.compact_graph import CompactDirectedCostGraph, ARRAY_TYPECODE
+from errors.exceptions import GraphError
+
+MAGIC = b'DCGB'
+FORMAT_VERSION = 1
+HAS_VERTEX_TABLE = 1
+HEADER = struct.Struct('<4sIIIqq')
+
+
+def _little_endian_bytes(values) -> bytes:
+    values = array(ARRAY_TYPECODE, values)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_binary_graph(graph: CompactDirectedCostGraph, file_path: str) -> None:
+    """
+        Writes the compact graph to file_path in the binary format described above
+    """
+    vertices, out_offsets, out_targets, out_costs, in_offsets, in_sources = graph.get_csr_arrays()
+    flags = 0
+    payload = []
+    if vertices is not None:
+        flags |= HAS_VERTEX_TABLE
+        payload.append(vertices)
+    payload += [out_offsets, out_targets, out_costs, in_offsets, in_sources]
+    payload = [_little_endian_bytes(values) for values in payload]
+    checksum = 0
+    for chunk in payload:
+        checksum = zlib.crc32(chunk, checksum)
+    output_file = open(file_path, "wb")
+    output_file.write(HEADER.pack(MAGIC, FORMAT_VERSION, flags, checksum,
+                                  graph.get_number_of_vertices(), graph.get_number_of_edges()))
+    for chunk in payload:
+        output_file.write(chunk)
+    output_file.close()
+
+
+def read_binary_graph(file_path: str, verify_checksum: bool = True) -> CompactDirectedCostGraph:
+    """
+        Maps a file written by write_binary_graph into memory and returns the compact graph backed by it
+    :param file_path: the binary graph file
+    :param verify_checksum: if True the crc32 of the payload is checked, which reads the whole file once
+    :return: the CompactDirectedCostGraph using the mapped file as its arrays
+            raises GraphError if the file is not a binary graph file, is truncated or is corrupted
+    """
+    input_file = open(file_path, "rb")
+    try:
+        mapped_file = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        raise GraphError(f'{file_path} is empty.')
+    finally:
+        input_file.close()
+    if len(mapped_file) < HEADER.size:
+        raise GraphError(f'{file_path} is not a binary graph file.')
+    magic, version, flags, checksum, number_of_vertices, number_of_edges = HEADER.unpack_from(mapped_file)
+    if magic != MAGIC:
+        raise GraphError(f'{file_path} is not a binary graph file.')
+    if version != FORMAT_VERSION:
+        raise GraphError(f'Unsupported binary graph format version {version}.')
+
+    array_lengths = [number_of_vertices + 1, number_of_edges, number_of_edges, number_of_vertices + 1, number_of_edges]
+    if flags & HAS_VERTEX_TABLE:
+        array_lengths.insert(0, number_of_vertices)
+    if len(mapped_file) != HEADER.size + 8 * sum(array_lengths):
+        raise GraphError(f'{file_path} is truncated or corrupted.')
+    payload = memoryview(mapped_file)[HEADER.size:]
+    if verify_checksum and zlib.crc32(payload) != checksum:
+        raise GraphError(f'{file_path} is corrupted (checksum mismatch).')
+
+    arrays = []
+    offset = 0
+    for length in array_lengths:
+        values = payload[offset:offset + 8 * length].cast(ARRAY_TYPECODE)
+        if sys.byteorder != 'little':
+            values = array(ARRAY_TYPECODE, values)
+            values.byteswap()
+        arrays.append(values)
+        offset += 8 * length
+    if not flags & HAS_VERTEX_TABLE:
+        arrays.insert(0, None)
+    return CompactDirectedCostGraph(*arrays)
+
+
+if __name__ == "__main__":
+    from controller.graph_controller import GraphController
+
+    if len(sys.argv) != 3:
+        print("usage: python -m controller.binary_graph_file <text graph file> <binary graph file>")
+        sys.exit(1)
+    GraphController.convert_text_to_binary(sys.argv[1], sys.argv[2])
@@ -0,0 +1,307 @@
+"""
+Connected components of undirected graphs (stored, like read_undirected_graph does, with every edge in both
+directions), computed without building a subgraph per component. On a directed graph the edges are followed both ways,
+which gives its weakly connected components.
+
+The result is compact: a label per vertex (an array indexed like parse_all_vertices) and the vertices of every
+component stored one after the other, in the order the breadth-first search found them, with an offsets array
+marking where each component starts. A component is only turned into a DirectedCostGraph when it is asked for.
+
+StronglyConnectedComponents does the same for directed graphs with an iterative Tarjan, and builds the condensation:
+the DAG with one vertex per strongly connected component, on which topological sorting and scheduling work even when
+the original graph has cycles.
+
+count_components_in_file uses union-find to count the components of an undirected graph file while it is read,
+without building any adjacency at all.
+"""
+from array import array
+from collections import deque
+from itertools import chain
+
+from controller.text_graph_file import open_graph_file
+from domain.graph import DirectedCostGraph
+from errors.exceptions import GraphError
+
+
+class DisjointSet:
+    def __init__(self):
+        """
+            Union-find over arbitrary vertex ids, with path halving and union by size
+
+        parent -> dict mapping every vertex to its parent; the roots are their own parents
+        size -> dict mapping every root to the number of vertices of its set
+        """
+        self.__parent = {}
+        self.__size = {}
+        self.__number_of_sets = 0
+
+    def add(self, vertex) -> None:
+        if vertex not in self.__parent:
+            self.__parent[vertex] = vertex
+            self.__size[vertex] = 1
+            self.__number_of_sets += 1
+
+    def find(self, vertex):
+        parent = self.__parent
+        while parent[vertex] != vertex:
+            # Path halving: every visited vertex is linked to its grandparent
+            parent[vertex] = parent[parent[vertex]]
+            vertex = parent[vertex]
+        return vertex
+
+    def union(self, first_vertex, second_vertex) -> bool:
+        """
+        :return: True if the two vertices were in different sets, which are now joined; False otherwise
+        """
+        first_root = self.find(first_vertex)
+        second_root = self.find(second_vertex)
+        if first_root == second_root:
+            return False
+        if self.__size[first_root] < self.__size[second_root]:
+            first_root, second_root = second_root, first_root
+        self.__parent[second_root] = first_root
+        self.__size[first_root] += self.__size.pop(second_root)
+        self.__number_of_sets -= 1
+        return True
+
+    def get_number_of_sets(self) -> int:
+        return self.__number_of_sets
+
+
+class ConnectedComponents:
+    def __init__(self, graph):
+        """
+            Labels the vertices of the graph with the id of their connected component, using an iterative
+        breadth-first search from every vertex that is not labelled yet. The search follows the inbound edges as well
+        as the outbound ones, so every edge of the graph joins two vertices of the same component, even when the graph
+        was read as a directed graph.
+
+        vertices -> the vertices of the graph, in the order of parse_all_vertices
+        index -> dict from vertex to its position in vertices
+        labels -> array with the component id of the vertex at every position
+        members, offsets -> positions of the vertices of component c are members[offsets[c]:offsets[c + 1]]
+        """
+        self.__graph = graph
+        self.__vertices = graph.parse_all_vertices()
+        self.__index = {vertex: position for position, vertex in enumerate(self.__vertices)}
+        self.__labels = array('l', [-1]) * len(self.__vertices)
+        self.__members = array('l')
+        self.__offsets = array('l', [0])
+        for position in range(len(self.__vertices)):
+            if self.__labels[position] == -1:
+                self.__label_component(position, len(self.__offsets) - 1)
+                self.__offsets.append(len(self.__members))
+
+    def __label_component(self, start_position, component):
+        labels = self.__labels
+        index = self.__index
+        labels[start_position] = component
+        self.__members.append(start_position)
+        queue = deque([self.__vertices[start_position]])
+        while queue:
+            vertex = queue.popleft()
+            for neighbours in (self.__graph.iterate_out_vertices(vertex), self.__graph.iterate_in_vertices(vertex)):
+                for neighbour in neighbours:
+                    position = index[neighbour]
+                    if labels[position] == -1:
+                        labels[position] = component
+                        self.__members.append(position)
+                        queue.append(neighbour)
+
+    def get_number_of_components(self) -> int:
+        return len(self.__offsets) - 1
+
+    def get_labels(self) -> array:
+        """
+        :return: the array of component ids, aligned with the vertices returned by get_all_vertices
+        """
+        return self.__labels
+
+    def get_all_vertices(self) -> list:
+        return self.__vertices
+
+    def get_component_of(self, vertex) -> int:
+        if vertex not in self.__index:
+            raise GraphError("Vertex is not within the graph.")
+        return self.__labels[self.__index[vertex]]
+
+    def get_component_vertices(self, component: int) -> list:
+        """
+        :return: the vertices of the component, in the order the breadth-first search found them
+        """
+        if not 0 <= component < self.get_number_of_components():
+            raise GraphError(f'There is no component {component}.')
+        return [self.__vertices[position]
+                for position in self.__members[self.__offsets[component]:self.__offsets[component + 1]]]
+
+    def get_subgraph(self, component: int) -> DirectedCostGraph:
+        """
+            Builds the subgraph of the component, with all the edges of its vertices and their costs
+        """
+        vertices = self.get_component_vertices(component)
+        edge_starts = []
+        edge_ends = []
+        edge_costs = []
+        for vertex in vertices:
+            for neighbour, cost in self.__graph.iterate_out_edge_costs(vertex):
+                edge_starts.append(vertex)
+                edge_ends.append(neighbour)
+                edge_costs.append(cost)
+        subgraph = DirectedCostGraph()
+        subgraph.load_edges(vertices, edge_starts, edge_ends, edge_costs)
+        return subgraph
+
+
+class StronglyConnectedComponents:
+    def __init__(self, graph):
+        """
+            Finds the strongly connected components of a directed graph with Tarjan's algorithm. The depth-first
+        search keeps its own stack of (vertex, successor iterator) frames instead of recursing, so there is no recursion
+        limit, and every vertex and edge is visited once.
+            The components are numbered in topological order of the condensation: every edge of the graph goes from a
+        component to itself or to a component with a greater id.
+
+        vertices, index, labels, members, offsets -> as in ConnectedComponents
+        """
+        self.__graph = graph
+        self.__vertices = graph.parse_all_vertices()
+        self.__index = {vertex: position for position, vertex in enumerate(self.__vertices)}
+        number_of_vertices = len(self.__vertices)
+        self.__labels = array('l', [-1]) * number_of_vertices
+        # Tarjan finds the components in reverse topological order; they are renumbered at the end
+        found_members = array('l')
+        found_offsets = array('l', [0])
+        discovery = array('l', [-1]) * number_of_vertices
+        low = array('l', [0]) * number_of_vertices
+        on_stack = bytearray(number_of_vertices)
+        stack = []
+        counter = 0
+        for root in range(number_of_vertices):
+            if discovery[root] != -1:
+                continue
+            discovery[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            call_stack = [(root, graph.iterate_out_vertices(self.__vertices[root]))]
+            while call_stack:
+                position, successors = call_stack[-1]
+                for successor in successors:
+                    successor_position = self.__index[successor]
+                    if discovery[successor_position] == -1:
+                        discovery[successor_position] = low[successor_position] = counter
+                        counter += 1
+                        stack.append(successor_position)
+                        on_stack[successor_position] = 1
+                        call_stack.append((successor_position, graph.iterate_out_vertices(successor)))
+                        break
+                    if on_stack[successor_position] and discovery[successor_position] < low[position]:
+                        low[position] = discovery[successor_position]
+                else:
+                    # Every successor of position is done
+                    call_stack.pop()
+                    if call_stack and low[position] < low[call_stack[-1][0]]:
+                        low[call_stack[-1][0]] = low[position]
+                    if low[position] == discovery[position]:
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = 0
+                            found_members.append(member)
+                            if member == position:
+                                break
+                        found_offsets.append(len(found_members))
+
+        number_of_components = len(found_offsets) - 1
+        self.__members = array('l')
+        self.__offsets = array('l', [0])
+        for component in range(number_of_components):
+            found_component = number_of_components - 1 - component
+            for member in found_members[found_offsets[found_component]:found_offsets[found_component + 1]]:
+                self.__labels[member] = component
+                self.__members.append(member)
+            self.__offsets.append(len(self.__members))
+
+    def get_number_of_components(self) -> int:
+        return len(self.__offsets) - 1
+
+    def is_acyclic(self) -> bool:
+        """
+            Checks if the graph is a DAG: every component is a single vertex without a loop
+        """
+        if self.get_number_of_components() != len(self.__vertices):
+            return False
+        return not any(self.__graph.is_edge(vertex, vertex) for vertex in self.__vertices)
+
+    def get_labels(self) -> array:
+        """
+        :return: the array of component ids, aligned with the vertices returned by get_all_vertices
+        """
+        return self.__labels
+
+    def get_all_vertices(self) -> list:
+        return self.__vertices
+
+    def get_component_of(self, vertex) -> int:
+        if vertex not in self.__index:
+            raise GraphError("Vertex is not within the graph.")
+        return self.__labels[self.__index[vertex]]
+
+    def get_component_vertices(self, component: int) -> list:
+        if not 0 <= component < self.get_number_of_components():
+            raise GraphError(f'There is no component {component}.')
+        return [self.__vertices[position]
+                for position in self.__members[self.__offsets[component]:self.__offsets[component + 1]]]
+
+    def get_condensation(self) -> DirectedCostGraph:
+        """
+            Builds the condensation of the graph: vertex c stands for component c and there is an edge (c1, c2) if
+        some edge of the graph goes from component c1 to a different component c2. Of several such edges the one with
+        the greatest cost is kept, since that is the one that constrains a schedule.
+        :return: a new DirectedCostGraph, which is always a DAG
+        """
+        labels = self.__labels
+        index = self.__index
+        condensation_costs = {}
+        for vertex in self.__vertices:
+            start_component = labels[index[vertex]]
+            for successor, cost in self.__graph.iterate_out_edge_costs(vertex):
+                end_component = labels[index[successor]]
+                if start_component != end_component:
+                    edge = (start_component, end_component)
+                    if edge not in condensation_costs or cost > condensation_costs[edge]:
+                        condensation_costs[edge] = cost
+        condensation = DirectedCostGraph()
+        condensation.load_edges(range(self.get_number_of_components()),
+                                [edge[0] for edge in condensation_costs],
+                                [edge[1] for edge in condensation_costs],
+                                list(condensation_costs.values()))
+        return condensation
+
+
+def count_components_in_file(file_path: str) -> int:
+    """
+        Counts the connected components of the undirected graph stored in file_path (in any format accepted by
+    read_undirected_graph). The file is read line by line straight into a DisjointSet, so no adjacency is built.
+    """
+    disjoint_set = DisjointSet()
+    input_file = open_graph_file(file_path, "rt")
+    first_line = input_file.readline().split()
+    if len(first_line) == 2:
+        # The header only gives the number of vertices, which are 0 .. number_of_vertices - 1
+        for vertex in range(int(first_line[0])):
+            disjoint_set.add(vertex)
+        lines = input_file
+    else:
+        lines = chain([" ".join(first_line)], input_file)
+    for line in lines:
+        correct_line = line.split()
+        if len(correct_line) == 1:
+            disjoint_set.add(int(correct_line[0]))
+        elif len(correct_line) == 3:
+            edge_start = int(correct_line[0])
+            edge_end = int(correct_line[1])
+            disjoint_set.add(edge_start)
+            disjoint_set.add(edge_end)
+            disjoint_set.union(edge_start, edge_end)
+    input_file.close()
+    return disjoint_set.get_number_of_sets()
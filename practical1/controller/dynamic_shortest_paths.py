@@ -0,0 +1,219 @@
+"""
+Single-source shortest path tree that is repaired incrementally when the graph changes.
+
+After changing an edge of the graph (adding it, removing it or modifying its cost) the caller tells the tree which edge
+changed with update_edge and only the affected part of the tree is recomputed:
+    - a cheaper edge (u, v) only propagates the new, smaller distance from v to the vertices it improves
+    - a more expensive or removed tree edge (u, v) only invalidates the subtree rooted at v, whose vertices are then
+      reattached through their cheapest inbound edge from outside the subtree and relaxed among themselves
+    - any other change can not affect the tree and costs O(1)
+Both repairs are label-correcting, so they work with negative costs as well.
+"""
+from collections import deque
+
+from controller.shortest_paths import ShortestPathEngine, find_path_from_predecessors
+from errors.exceptions import GraphError
+
+
+class DynamicShortestPathTree:
+    def __init__(self, graph, start_vertex, distance: dict, predecessor: dict):
+        """
+            Wraps a shortest path tree computed on the current version of the graph
+
+        distance, predecessor -> the dicts produced by ShortestPathEngine.single_source / GraphController.shortest_path
+        children -> dict mapping every vertex to the set of vertices whose predecessor it is
+        has_negative_cycle -> True after a change created a negative cycle reachable from start_vertex; the distances
+                                are meaningless until a later change removes it (the tree is then recomputed)
+        version -> the version of the graph the tree is up to date with
+        """
+        self.__graph = graph
+        self.__start_vertex = start_vertex
+        self.__distance = distance
+        self.__predecessor = predecessor
+        self.__children = {}
+        self.__has_negative_cycle = False
+        self.__version = graph.get_version()
+        self.__build_children()
+
+    @classmethod
+    def from_graph(cls, graph, start_vertex):
+        """
+            Computes the shortest path tree of start_vertex from scratch
+        :return: the new DynamicShortestPathTree
+                raises GraphError if there is a negative cycle reachable from start_vertex
+        """
+        shortest_path_tree = ShortestPathEngine(graph).single_source(start_vertex)
+        if shortest_path_tree is None:
+            raise GraphError("There exists a negative cycle reachable from the start vertex.")
+        distance, predecessor = shortest_path_tree
+        return cls(graph, start_vertex, distance, predecessor)
+
+    def __build_children(self):
+        self.__children = {vertex: set() for vertex in self.__distance}
+        for vertex, parent in self.__predecessor.items():
+            if parent is not None:
+                self.__children[parent].add(vertex)
+
+    def __recompute(self):
+        shortest_path_tree = ShortestPathEngine(self.__graph).single_source(self.__start_vertex)
+        self.__has_negative_cycle = shortest_path_tree is None
+        if not self.__has_negative_cycle:
+            self.__distance, self.__predecessor = shortest_path_tree
+            self.__build_children()
+
+    def __set_parent(self, vertex, parent):
+        old_parent = self.__predecessor[vertex]
+        if old_parent is not None:
+            self.__children[old_parent].discard(vertex)
+        self.__predecessor[vertex] = parent
+        if parent is not None:
+            self.__children[parent].add(vertex)
+
+    def get_start_vertex(self):
+        return self.__start_vertex
+
+    def has_negative_cycle(self) -> bool:
+        return self.__has_negative_cycle
+
+    def is_up_to_date(self) -> bool:
+        """
+            Checks that every change of the graph since the tree was built was reported to the tree
+        """
+        return self.__version == self.__graph.get_version()
+
+    def get_tree(self):
+        """
+        :return: False if there is a negative cycle reachable from the start vertex, else the (distance, predecessor)
+                dicts of the tree (not copies, they must not be modified)
+        """
+        if self.__has_negative_cycle:
+            return False
+        return self.__distance, self.__predecessor
+
+    def shortest_path(self, end_vertex):
+        """
+        :return: the same result as GraphController.shortest_path(start_vertex, end_vertex)
+        """
+        if self.__has_negative_cycle:
+            return False
+        return self.__distance[end_vertex], find_path_from_predecessors(self.__predecessor, end_vertex)
+
+    def vertex_added(self, vertex) -> None:
+        """
+            Reports that an isolated vertex was added to the graph
+        """
+        self.__distance[vertex] = float('inf')
+        self.__predecessor[vertex] = None
+        self.__children[vertex] = set()
+        self.__version = self.__graph.get_version()
+
+    def vertex_removed(self, vertex) -> None:
+        """
+            Reports that a vertex was removed from the graph together with all its edges
+        """
+        if vertex == self.__start_vertex:
+            raise GraphError("The start vertex of the tree was removed.")
+        self.__version = self.__graph.get_version()
+        if self.__has_negative_cycle:
+            self.__recompute()
+            return
+        orphans = self.__children.pop(vertex)
+        self.__set_parent(vertex, None)
+        del self.__distance[vertex]
+        del self.__predecessor[vertex]
+        for orphan in orphans:
+            self.__predecessor[orphan] = None
+        self.__repair_subtrees(list(orphans))
+
+    def update_edge(self, edge_start, edge_end) -> bool:
+        """
+            Reports that the edge (edge_start, edge_end) was added, removed or had its cost modified, and repairs the
+        tree by reading the current state of that edge from the graph
+        :return: False if there is now a negative cycle reachable from the start vertex, True otherwise
+        """
+        self.__version = self.__graph.get_version()
+        if self.__has_negative_cycle:
+            # The change may have broken the cycle, which can only be found out by starting over
+            self.__recompute()
+            return not self.__has_negative_cycle
+
+        cost = None
+        if self.__graph.is_edge(edge_start, edge_end):
+            cost = self.__graph.get_edge_cost(edge_start, edge_end)
+        start_distance = self.__distance[edge_start]
+        if cost is not None and start_distance + cost < self.__distance[edge_end]:
+            return self.__propagate_decrease(edge_start, edge_end, start_distance + cost)
+        if self.__predecessor[edge_end] == edge_start:
+            if cost is None or start_distance + cost > self.__distance[edge_end]:
+                self.__repair_subtrees([edge_end])
+        return True
+
+    def __propagate_decrease(self, edge_start, edge_end, new_distance) -> bool:
+        """
+            Lowers the distance of edge_end through edge_start and relaxes only the vertices that get improved.
+        Every improvement starts at edge_end, so improving edge_end a second time means there is a negative cycle.
+        The change may also make a negative cycle that does not go through edge_end reachable; then the improvements
+        go around that cycle forever, which is caught by counting the edges of every improving path from edge_end:
+        a path without a cycle has fewer edges than there are vertices.
+        """
+        self.__distance[edge_end] = new_distance
+        self.__set_parent(edge_end, edge_start)
+        number_of_vertices = self.__graph.get_number_of_vertices()
+        path_length = {edge_end: 0}
+        queue = deque([edge_end])
+        in_queue = {edge_end}
+        while queue:
+            vertex = queue.popleft()
+            in_queue.discard(vertex)
+            current_distance = self.__distance[vertex]
+            for successor, cost in self.__graph.iterate_out_edge_costs(vertex):
+                if current_distance + cost < self.__distance[successor]:
+                    path_length[successor] = path_length[vertex] + 1
+                    if successor == edge_end or successor == self.__start_vertex or \
+                            path_length[successor] >= number_of_vertices:
+                        self.__has_negative_cycle = True
+                        return False
+                    self.__distance[successor] = current_distance + cost
+                    self.__set_parent(successor, vertex)
+                    if successor not in in_queue:
+                        in_queue.add(successor)
+                        queue.append(successor)
+        return True
+
+    def __repair_subtrees(self, roots) -> None:
+        """
+            Recomputes the distances of the subtrees rooted at the given vertices after their distances may have
+        increased. The subtrees are repaired together, since they can be reattached through each other.
+        """
+        # Collect and detach the subtrees
+        subtree = list(roots)
+        index = 0
+        while index < len(subtree):
+            subtree.extend(self.__children[subtree[index]])
+            index += 1
+        in_subtree = set(subtree)
+        for vertex in subtree:
+            self.__set_parent(vertex, None)
+            self.__distance[vertex] = float('inf')
+
+        # Reattach every vertex through its cheapest inbound edge coming from outside the subtree
+        for vertex in subtree:
+            for predecessor, cost in self.__graph.iterate_in_edge_costs(vertex):
+                if predecessor not in in_subtree and self.__distance[predecessor] + cost < self.__distance[vertex]:
+                    self.__distance[vertex] = self.__distance[predecessor] + cost
+                    self.__set_parent(vertex, predecessor)
+
+        # Relax the edges inside the subtree; distances outside of it can not improve since none got smaller
+        queue = deque(vertex for vertex in subtree if self.__distance[vertex] != float('inf'))
+        in_queue = set(queue)
+        while queue:
+            vertex = queue.popleft()
+            in_queue.discard(vertex)
+            current_distance = self.__distance[vertex]
+            for successor, cost in self.__graph.iterate_out_edge_costs(vertex):
+                if successor in in_subtree and current_distance + cost < self.__distance[successor]:
+                    self.__distance[successor] = current_distance + cost
+                    self.__set_parent(successor, vertex)
+                    if successor not in in_queue:
+                        in_queue.add(successor)
+                        queue.append(successor)
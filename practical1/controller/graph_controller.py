@@ -3,17 +3,54 @@
 12.   Write the graph from a text file (as an external function); see the format below.
 13.   Create a random graph with specified number of vertices and of edges (as an external function).
 """
-import random
+import io
 
 from domain.graph import DirectedCostGraph
-from collections import deque
+from domain.compact_graph import CompactDirectedCostGraph
+from controller.components import ConnectedComponents, StronglyConnectedComponents, count_components_in_file
+from controller.traversal import breadth_first, is_reachable
+from controller.journal import MutationJournal, apply_operations, revert_operations, read_journal_file
+from controller.scheduling import compute_schedule
+from controller.activity_network import parse_activity_file
+from controller.topological_levels import topological_levels, get_antichain_width, vectorized_earliest_start
+from controller.graph_generators import random_directed_edges, random_undirected_edges
+from controller.text_graph_file import open_graph_file, write_text_graph, write_text_graph_in_background
+from controller.binary_graph_file import write_binary_graph, read_binary_graph
+from controller.shortest_paths import ShortestPathEngine, ShortestPathTreeCache, find_path_from_predecessors
+from controller.dynamic_shortest_paths import DynamicShortestPathTree
+from controller.all_pairs import johnson_all_pairs
+from controller.vectorized_bellman_ford import EdgeArrays
+from errors.exceptions import GraphError
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MAX_SNAPSHOTS = 10
 
 
 class GraphController:
     def __init__(self, graph: DirectedCostGraph):
         self.__graph = graph
-        self.__last_copy = self.__graph
+        # Stack of (graph copy, graph_is_undirected), the most recent copy last
+        self.__snapshots = []
+        self.__max_snapshots = MAX_SNAPSHOTS
+        self.__journal = MutationJournal()
         self.__graph_is_undirected = False
+        self.__shortest_path_cache = ShortestPathTreeCache()
+        self.__shortest_path_engine = None
+        self.__shortest_path_engine_key = None
+        self.__maintained_tree = None
+        self.__maintained_tree_graph = None
+        self.__edge_arrays = None
+        self.__edge_arrays_key = None
+        self.__schedule = None
+        self.__levels = None
+        self.__levels_key = None
+        self.__compact_graph = None
+        self.__compact_graph_key = None
+        self.__activity_names = (None, None)
 
     def get_number_of_vertices(self) -> int:
         return self.__graph.get_number_of_vertices()
@@ -42,47 +79,230 @@ class GraphController:
         return self.__graph.parse_in_edges(vertex)
 
     def modify_cost(self, edge_start, edge_end, new_cost):
-        return self.__graph.modify_edge_cost(edge_start, edge_end, new_cost)
+        old_cost = None
+        if self.__graph.is_edge(edge_start, edge_end):
+            old_cost = self.__graph.get_edge_cost(edge_start, edge_end)
+        self.__modify_cost(edge_start, edge_end, new_cost)
+        self.__journal.record(self.__graph, ("modify_edge_cost", edge_start, edge_end, old_cost, new_cost))
 
     def get_edge_cost(self, edge_start, edge_end):
         return self.__graph.get_edge_cost(edge_start, edge_end)
 
     def add_vertex(self, new_vertex):
-        return self.__graph.add_vertex(new_vertex)
+        added = self.__add_vertex(new_vertex)
+        if added:
+            self.__journal.record(self.__graph, ("add_vertex", new_vertex))
+        return added
 
     def add_edge(self, edge_start, edge_end, edge_cost):
-        return self.__graph.add_edge(edge_start, edge_end, edge_cost)
+        added = self.__add_edge(edge_start, edge_end, edge_cost)
+        if added:
+            self.__journal.record(self.__graph, ("add_edge", edge_start, edge_end, edge_cost))
+        return added
 
     def remove_vertex(self, vertex_to_remove):
-        return self.__graph.remove_vertex(vertex_to_remove)
+        if not self.__graph.is_vertex(vertex_to_remove):
+            return self.__remove_vertex(vertex_to_remove)
+        # A loop is only kept with the outbound edges, so undoing does not add it twice
+        inbound_edges = [(predecessor, cost)
+                         for predecessor, cost in self.__graph.iterate_in_edge_costs(vertex_to_remove)
+                         if predecessor != vertex_to_remove]
+        outbound_edges = list(self.__graph.iterate_out_edge_costs(vertex_to_remove))
+        removed = self.__remove_vertex(vertex_to_remove)
+        if removed:
+            self.__journal.record(self.__graph, ("remove_vertex", vertex_to_remove, inbound_edges, outbound_edges))
+        return removed
 
     def remove_edge(self, edge_start, edge_end):
-        return self.__graph.remove_edge(edge_start, edge_end)
+        if not self.__graph.is_edge(edge_start, edge_end):
+            return self.__remove_edge(edge_start, edge_end)
+        cost = self.__graph.get_edge_cost(edge_start, edge_end)
+        removed = self.__remove_edge(edge_start, edge_end)
+        if removed:
+            self.__journal.record(self.__graph, ("remove_edge", edge_start, edge_end, cost))
+        return removed
+
+    def __modify_cost(self, edge_start, edge_end, new_cost):
+        maintained_tree = self.__get_maintained_tree()
+        self.__graph.modify_edge_cost(edge_start, edge_end, new_cost)
+        if maintained_tree is not None:
+            maintained_tree.update_edge(edge_start, edge_end)
+
+    def __add_vertex(self, new_vertex):
+        maintained_tree = self.__get_maintained_tree()
+        added = self.__graph.add_vertex(new_vertex)
+        if added and maintained_tree is not None:
+            maintained_tree.vertex_added(new_vertex)
+        return added
+
+    def __add_edge(self, edge_start, edge_end, edge_cost):
+        maintained_tree = self.__get_maintained_tree()
+        added = self.__graph.add_edge(edge_start, edge_end, edge_cost)
+        if added and maintained_tree is not None:
+            maintained_tree.update_edge(edge_start, edge_end)
+        return added
+
+    def __remove_vertex(self, vertex_to_remove):
+        maintained_tree = self.__get_maintained_tree()
+        removed = self.__graph.remove_vertex(vertex_to_remove)
+        if removed and maintained_tree is not None:
+            if vertex_to_remove == maintained_tree.get_start_vertex():
+                self.__maintained_tree = None
+            else:
+                maintained_tree.vertex_removed(vertex_to_remove)
+        return removed
+
+    def __remove_edge(self, edge_start, edge_end):
+        maintained_tree = self.__get_maintained_tree()
+        removed = self.__graph.remove_edge(edge_start, edge_end)
+        if removed and maintained_tree is not None:
+            maintained_tree.update_edge(edge_start, edge_end)
+        return removed
+
+    def __apply_operations(self, operations) -> None:
+        changes = {
+            "add_vertex": self.__add_vertex,
+            "remove_vertex": self.__remove_vertex,
+            "add_edge": self.__add_edge,
+            "remove_edge": self.__remove_edge,
+            "modify_edge_cost": self.__modify_cost,
+        }
+        for name, arguments in operations:
+            changes[name](*arguments)
+
+    def undo(self) -> bool:
+        """
+            Reverts the most recent change made to the current graph through add_vertex, remove_vertex, add_edge,
+        remove_edge or modify_cost. A removed vertex comes back with all its edges and their costs.
+        :return: False if there is no change to undo, True otherwise
+        """
+        entry = self.__journal.pop_undo(self.__graph)
+        if entry is None:
+            return False
+        self.__apply_operations(revert_operations(entry))
+        return True
 
-    def read_activities_graph(self, file_path: str = "data/graph1k.txt") -> None:
-        self.__graph = DirectedCostGraph()
-        input_file = open(file_path, "rt")
-        for file_format in input_file.readlines():
-            file_format = file_format.strip('\n').split(' ')
-            self.__graph.add_vertex(0)
-            if len(file_format) == 3:
-                current_vertex = file_format[0]
-                cost = int(file_format[2])
-                self.__graph.add_vertex(current_vertex)
-                if file_format[1] != '-':
-                    vertex_list = file_format[1].split(',')
-                    for predecessor in vertex_list:
-                        self.__graph.add_vertex(predecessor)
-                        self.__graph.add_edge(predecessor, current_vertex, cost)
-                elif file_format[1] == '-':
-                    self.__graph.add_edge(0, current_vertex, cost)
+    def redo(self) -> bool:
+        """
+            Applies again the most recently undone change, as long as no other change was made since
+        :return: False if there is no change to redo, True otherwise
+        """
+        entry = self.__journal.pop_redo(self.__graph)
+        if entry is None:
+            return False
+        self.__apply_operations(apply_operations(entry))
+        return True
+
+    def get_journal_statistics(self) -> tuple:
+        """
+        :return: the tuple (number of changes of the current graph that can be undone, number of changes that can be
+                redone); a graph that was just read or reverted to has no changes yet
+        """
+        return self.__journal.get_number_of_entries(self.__graph)
+
+    def start_journal_file(self, file_path: str = "data/journal.txt") -> None:
+        """
+            Writes every following change, undo and redo to file_path as soon as it happens, so that the session can
+        be rebuilt with replay_journal_file if it ends unexpectedly. The changes made after the current graph is
+        replaced follow a reset line in the file, which replay_journal_file does not go past.
+        """
+        self.__journal.open_file(file_path, self.__graph)
 
+    def stop_journal_file(self) -> None:
+        self.__journal.close_file()
+
+    def replay_journal_file(self, file_path: str = "data/journal.txt") -> int:
+        """
+            Applies the changes, undos and redos of a journal file to the current graph, which should be the graph the
+        journal was started on. The changes are journaled again, so they can be undone.
+        :return: the number of journal entries replayed
+                raises GraphError if the file is not a journal, an entry can not be applied to the graph or the graph
+                was replaced while the journal was written (the entries before the reset line are replayed)
+        """
+        changes = {
+            "add_vertex": self.add_vertex,
+            "remove_vertex": self.remove_vertex,
+            "add_edge": self.add_edge,
+            "remove_edge": self.remove_edge,
+            "modify_edge_cost": self.modify_cost,
+        }
+        number_of_entries = 0
+        for entry in read_journal_file(file_path):
+            if entry[0] == "undo":
+                self.undo()
+            elif entry[0] == "redo":
+                self.redo()
+            elif entry[0] in changes:
+                for name, arguments in apply_operations(entry):
+                    changes[name](*arguments)
+            elif entry[0] == "reset":
+                raise GraphError(f'The graph was replaced after entry {number_of_entries} of the journal, the entries '
+                                 f'after it do not apply to this graph.')
+            else:
+                raise GraphError(f'Unknown journal entry {list(entry)}.')
+            number_of_entries += 1
+        return number_of_entries
+
+    def maintain_shortest_paths_from(self, start_vertex) -> bool:
+        """
+            Keeps the shortest path tree of start_vertex up to date while the graph is changed through this controller.
+        Instead of recomputing it, add_edge, remove_edge, modify_cost, add_vertex and remove_vertex repair only the
+        part of the tree affected by the change, and shortest_path queries from start_vertex are answered from it.
+        Only one tree is maintained at a time; it is dropped when the graph is replaced or changed directly.
+        :return: False if there exists a negative cycle reachable from start_vertex (nothing is maintained then)
+                True otherwise
+        """
+        shortest_path_tree = self.shortest_paths_from(start_vertex)
+        if shortest_path_tree is False:
+            return False
+        distance, predecessor = shortest_path_tree
+        # The cached dicts are copied since the maintained tree modifies its own
+        self.__maintained_tree = DynamicShortestPathTree(self.__graph, start_vertex, dict(distance), dict(predecessor))
+        self.__maintained_tree_graph = self.__graph
+        return True
+
+    def __get_maintained_tree(self):
+        """
+            Returns the maintained tree if it still describes the current graph, dropping it otherwise
+        """
+        if self.__maintained_tree is not None and \
+                (self.__maintained_tree_graph is not self.__graph or not self.__maintained_tree.is_up_to_date()):
+            self.__maintained_tree = None
+            self.__maintained_tree_graph = None
+        return self.__maintained_tree
+
+    def read_activities_graph(self, file_path: str = "data/activities.txt") -> None:
+        """
+            Replaces the current graph with the activity network read from the file (see controller/activity_network.py
+        for the format). The file is read line by line, the activity names become the integer vertices 1, 2, ... and
+        the graph gets a source vertex 0 and a sink vertex after the last activity. The names are kept by
+        get_activity_names.
+        :param file_path: path of input file to be read
+        raises GraphError if the file is not an activity file
+        """
+        names, edge_starts, edge_ends, edge_costs = parse_activity_file(file_path)
+        self.__graph = DirectedCostGraph()
+        self.__graph.load_edges(range(len(names)), edge_starts, edge_ends, edge_costs)
         self.__graph_is_undirected = False
-        input_file.close()
+        self.__activity_names = (self.__graph, names)
+
+    def get_activity_names(self):
+        """
+        :return: the list with the name of every vertex of the activity network read by read_activities_graph, or None
+                if the current graph is not that activity network
+        """
+        graph, names = self.__activity_names
+        if graph is not self.__graph:
+            return None
+        return names
+
     def read_directed_graph(self, file_path: str = "data/graph1k.txt") -> None:
         """
+            Replaces the current graph with the directed graph read from the file. The whole file is parsed at once and
+        the graph is built in a single pass by DirectedCostGraph.load_edges, without validating every edge on its own
+        (see benchmarks/load_throughput.py: about 1M edges per second on graph10k.txt, 2.4x the line by line loader).
         :param file_path: path of input file to be read
-        :return: None, changes internal dict_in, dict_out, dict_costs with values from the input file
+        :return: None, changes internal dict_in, dict_out with values from the input file
         having the convention format:
             line 0:    number_of_vertices number_of_edges
             line 1:    edge1_start edge1_end edge1_cost
@@ -104,204 +324,349 @@ class GraphController:
             1 3 8
             2 3 5
         """
+        vertices, edge_starts, edge_ends, edge_costs = self.parse_directed_graph_file(file_path)
         self.__graph = DirectedCostGraph()
-        input_file = open(file_path, "rt")
-        file_format = input_file.readline().strip('\n').split(' ')
-        if len(file_format) == 2:
-            number_of_vertices = int(file_format[0])
-            number_of_edges = int(file_format[1])
-            self.__graph.initialize_vertices(number_of_vertices)
-            for i in range(number_of_edges):
-                correct_line = input_file.readline().strip('\n').split(' ')
-                edge_start = int(correct_line[0])
-                edge_end = int(correct_line[1])
-                edge_cost = int(correct_line[2])
-                self.__graph.add_edge(edge_start, edge_end, edge_cost)
-        else:
-            if len(file_format) == 1:
-                self.__graph.add_vertex(int(file_format[0]))
-            elif len(file_format) == 3:
-                self.__graph.add_vertex(int(file_format[0]))
-                self.__graph.add_vertex(int(file_format[1]))
-                self.__graph.add_edge(int(file_format[0]), int(file_format[1]), int(file_format[2]))
-            for current_line in input_file.readlines():
-                correct_line = current_line.strip('\n').split(' ')
+        self.__graph.load_edges(vertices, edge_starts, edge_ends, edge_costs)
+        self.__graph_is_undirected = False
+
+    @staticmethod
+    def parse_edge_lines(data: bytes):
+        """
+            Converts lines of "edge_start edge_end edge_cost" to three parallel lists, using numpy's C parser when it is
+        available. Blank lines are skipped.
+        :return: the tuple (edge_starts, edge_ends, edge_costs), or None if a line is not made of exactly 3 integers
+        """
+        if not data.strip():
+            return [], [], []
+        if numpy is not None:
+            try:
+                edges = numpy.loadtxt(io.BytesIO(data), dtype=numpy.int64, comments=None, ndmin=2)
+            except ValueError:
+                return None
+            if edges.shape[1] != 3:
+                return None
+            return edges[:, 0].tolist(), edges[:, 1].tolist(), edges[:, 2].tolist()
+        lines = [fields for fields in map(bytes.split, data.splitlines()) if fields]
+        if any(len(fields) != 3 for fields in lines):
+            return None
+        try:
+            return [int(fields[0]) for fields in lines], [int(fields[1]) for fields in lines], \
+                [int(fields[2]) for fields in lines]
+        except ValueError:
+            return None
+
+    @staticmethod
+    def parse_directed_graph_file(file_path: str):
+        """
+            Reads a file in one of the formats accepted by read_directed_graph without building a graph.
+        The file is read in one go and its edge lines are converted to integers in a single batch; the per-line work
+        is only needed for headerless files that contain isolated vertices.
+        :param file_path: path of input file to be read
+        :return: the tuple (vertices, edge_starts, edge_ends, edge_costs), where vertices holds the vertex ids in the
+                order they appear in the file and the other three are parallel lists describing the edges
+                raises GraphError if a value is not an integer, or if the file does not have as many edges as its
+                header says
+        """
+        input_file = open_graph_file(file_path, "rb")
+        data = input_file.read()
+        input_file.close()
+        first_line_end = data.find(b'\n')
+        first_line = data[:first_line_end if first_line_end != -1 else len(data)].split()
+        if len(first_line) == 2:
+            try:
+                number_of_vertices = int(first_line[0])
+                number_of_edges = int(first_line[1])
+            except ValueError:
+                raise GraphError("The header of the file is not \"number_of_vertices number_of_edges\".")
+            edges = GraphController.parse_edge_lines(data[first_line_end + 1:] if first_line_end != -1 else b'')
+            if edges is None:
+                raise GraphError("An edge line of the file is not \"edge_start edge_end edge_cost\".")
+            if len(edges[0]) != number_of_edges:
+                raise GraphError(f'The file has {len(edges[0])} edges, its header says {number_of_edges}.')
+            return range(number_of_vertices), edges[0], edges[1], edges[2]
+
+        edges = GraphController.parse_edge_lines(data)
+        if edges is not None:
+            # Every line is an edge, so the vertices are the edge ends in the order they appear
+            edge_starts, edge_ends, edge_costs = edges
+            edge_endpoints = [None] * (2 * len(edge_starts))
+            edge_endpoints[0::2] = edge_starts
+            edge_endpoints[1::2] = edge_ends
+            return list(dict.fromkeys(edge_endpoints)), edge_starts, edge_ends, edge_costs
+
+        vertices = {}
+        edge_starts = []
+        edge_ends = []
+        edge_costs = []
+        try:
+            for line in data.splitlines():
+                correct_line = line.split()
                 if len(correct_line) == 1:
-                    self.__graph.add_vertex(int(correct_line[0]))
-                if len(correct_line) == 3:
+                    vertices[int(correct_line[0])] = None
+                elif len(correct_line) == 3:
                     edge_start = int(correct_line[0])
                     edge_end = int(correct_line[1])
-                    edge_cost = int(correct_line[2])
-                    self.__graph.add_vertex(edge_start)
-                    self.__graph.add_vertex(edge_end)
-                    self.__graph.add_edge(edge_start, edge_end, edge_cost)
+                    vertices[edge_start] = None
+                    vertices[edge_end] = None
+                    edge_starts.append(edge_start)
+                    edge_ends.append(edge_end)
+                    edge_costs.append(int(correct_line[2]))
+        except ValueError:
+            raise GraphError("The file contains a value that is not an integer.")
+        return list(vertices), edge_starts, edge_ends, edge_costs
+
+    def read_compact_directed_graph(self, file_path: str = "data/graph1k.txt") -> None:
+        """
+            Reads a directed graph in the same formats as read_directed_graph, but stores it as an immutable
+        CompactDirectedCostGraph. All the read-only operations and algorithms work on it unchanged, while the
+        operations that modify the graph raise GraphError.
+        :param file_path: path of input file to be read
+        """
+        vertices, edge_starts, edge_ends, edge_costs = self.parse_directed_graph_file(file_path)
+        self.__graph = CompactDirectedCostGraph.from_edges(vertices, edge_starts, edge_ends, edge_costs)
         self.__graph_is_undirected = False
-        input_file.close()
+
+    def make_graph_compact(self) -> None:
+        """
+            Replaces the current graph with an immutable CompactDirectedCostGraph holding the same vertices and edges
+        """
+        self.__graph = CompactDirectedCostGraph.from_graph(self.__graph)
 
     def read_undirected_graph(self, file_path: str = "data/input.tx"):
+        """
+            Reads an undirected graph in the same formats as read_directed_graph. Every edge is stored in both
+        directions and loops are skipped.
+        :param file_path: path of input file to be read
+        """
+        vertices, edge_starts, edge_ends, edge_costs = self.parse_directed_graph_file(file_path)
+        edges = [(edge_start, edge_end, cost) for edge_start, edge_end, cost in zip(edge_starts, edge_ends, edge_costs)
+                 if edge_start != edge_end]
+        edges += [(edge_end, edge_start, cost) for edge_start, edge_end, cost in edges]
         self.__graph = DirectedCostGraph()
-        input_file = open(file_path, "rt")
-        file_format = input_file.readline().strip('\n').split(' ')
-        if len(file_format) == 2:
-            number_of_vertices = int(file_format[0])
-            number_of_edges = int(file_format[1])
-            self.__graph.initialize_vertices(number_of_vertices)
-            for i in range(number_of_edges):
-                correct_line = input_file.readline().strip('\n').split(' ')
-                edge_start = int(correct_line[0])
-                edge_end = int(correct_line[1])
-                edge_cost = int(correct_line[2])
-                if edge_start == edge_end:
-                    continue
-                self.__graph.add_edge(edge_start, edge_end, edge_cost)
-                self.__graph.add_edge(edge_end, edge_start, edge_cost)
+        if edges:
+            edge_starts, edge_ends, edge_costs = zip(*edges)
+            self.__graph.load_edges(vertices, edge_starts, edge_ends, edge_costs)
         else:
-            if len(file_format) == 1:
-                self.__graph.add_vertex(int(file_format[0]))
-            elif len(file_format) == 3:
-                edge_start = int(file_format[0])
-                edge_end = int(file_format[1])
-                edge_cost = int(file_format[2])
-                self.__graph.add_vertex(edge_start)
-                if edge_start != edge_end:
-                    self.__graph.add_vertex(edge_end)
-                    self.__graph.add_edge(edge_start, edge_end, edge_cost)
-                    self.__graph.add_edge(edge_end, edge_start, edge_cost)
-            for current_line in input_file.readlines():
-                correct_line = current_line.strip('\n').split(' ')
-                if len(correct_line) == 1:
-                    self.__graph.add_vertex(int(correct_line[0]))
-                if len(correct_line) == 3:
-                    edge_start = int(correct_line[0])
-                    edge_end = int(correct_line[1])
-                    edge_cost = int(correct_line[2])
-                    self.__graph.add_vertex(edge_start)
-                    if edge_start == edge_end:
-                        continue
-                    self.__graph.add_vertex(edge_end)
-                    self.__graph.add_edge(edge_start, edge_end, edge_cost)
-                    self.__graph.add_edge(edge_end, edge_start, edge_cost)
+            self.__graph.load_edges(vertices, (), (), ())
         self.__graph_is_undirected = True
-        input_file.close()
 
-    def write_graph_data(self, file_path: str = "data/input.txt"):
+    def write_graph_data(self, file_path: str = "data/input.txt", with_header: bool = False,
+                         in_background: bool = False):
         """
-        This function writes the graph into the file specified by file_path parameter in a certain format
+        This function writes the graph into the file specified by file_path parameter, in chunks of many lines (see
+        controller/text_graph_file.py); the file is gzip or zstd compressed if its name ends in .gz or .zst
         :parameter file_path: the path of the file to be written
+        :parameter with_header: write the "number_of_vertices number_of_edges" line first, if the vertices are
+                                0 .. number_of_vertices - 1
+        :parameter in_background: write a copy of the graph on a background thread and return at once
+        :return: a concurrent.futures.Future of the write if in_background is True, None otherwise
         file format after write is:
-            line 0 :            edge1_start edge1_end edge1_cost
-            line 0 :            edge1 --------> isolated node
+            line 0:    edge1_start edge1_end edge1_cost
+            line 1:    isolated_node
+            ............................................
+            line n:    edgeN_start edgeN_end edgeN_costs
+        or with the header, where isolated vertices need no line:
             line 0:    number_of_vertices number_of_edges
             line 1:    edge1_start edge1_end edge1_cost
-            line 2:    edge2_start edge2_end edge2_cost
             ............................................
-            line n:    edgeN_start edgeN_end edgeN_costs
         E.g:
             2 3
             1 1 1
             0 1 5
             1 0 3
         """
-        output_file = open(file_path, "wt")
-        for vertex in self.__graph.parse_all_vertices():
-            # isolated node case
-            if self.__graph.get_in_degree(vertex) == 0 and self.__graph.get_out_degree(vertex) == 0:
-                output_file.write(f'{vertex}' + "\n")
-                continue
-            for edge in self.__graph.parse_out_edges(vertex):
-                output_file.write(f'{edge[0]} {edge[1]} {self.get_edge_cost(edge[0], edge[1])}' + "\n")
-        output_file.close()
+        if in_background:
+            return write_text_graph_in_background(self.__graph, file_path, with_header)
+        write_text_graph(self.__graph, file_path, with_header)
+
+    def write_graph_binary(self, file_path: str = "data/output.dcg") -> None:
+        """
+            Writes the graph in the binary format of controller/binary_graph_file.py, which read_graph_binary can open
+        almost instantly by mapping the file into memory
+        :param file_path: the path of the file to be written
+        """
+        graph = self.__graph
+        if not isinstance(graph, CompactDirectedCostGraph):
+            graph = CompactDirectedCostGraph.from_graph(graph)
+        write_binary_graph(graph, file_path)
+
+    def read_graph_binary(self, file_path: str = "data/output.dcg", verify_checksum: bool = True) -> None:
+        """
+            Replaces the current graph with the read-only CompactDirectedCostGraph stored in a binary graph file.
+        The file is memory-mapped, so its arrays are only read from disk when they are used.
+        :param file_path: path of the binary file to be read
+        :param verify_checksum: if True the file is checked for corruption before it is used
+                raises GraphError if the file is not a valid binary graph file
+        """
+        self.__graph = read_binary_graph(file_path, verify_checksum)
+        self.__graph_is_undirected = False
+
+    @staticmethod
+    def convert_text_to_binary(text_file_path: str, binary_file_path: str) -> None:
+        """
+            Converts a graph file in one of the text formats of read_directed_graph to the binary graph format
+        """
+        vertices, edge_starts, edge_ends, edge_costs = GraphController.parse_directed_graph_file(text_file_path)
+        graph = CompactDirectedCostGraph.from_edges(vertices, edge_starts, edge_ends, edge_costs)
+        write_binary_graph(graph, binary_file_path)
 
-    def random_directed_graph(self, number_of_vertices, number_of_edges, cost_range: tuple = (0, 99)) -> bool:
+    def random_directed_graph(self, number_of_vertices, number_of_edges, cost_range: tuple = (0, 99),
+                              seed=None) -> bool:
         """
-        Replaces the current graph with a random graph with specified number of vertices and edges
+        Replaces the current graph with a random graph with specified number of vertices and edges. The edges are
+        sampled without rejection (see controller/graph_generators.py) and bulk loaded, so even dense graphs with
+        millions of edges take seconds.
         :param number_of_vertices: the number of vertices that the random graph will have
         :param number_of_edges: number of edges the random graph will have
         :param cost_range: a range of values that the edge costs may take
+        :param seed: the seed of the random generator, the same seed giving the same graph; None for a random seed
         :return False if the precondition that number of edges is less than number the number of vertices^2
                 True if built successfully
         """
         if number_of_edges > number_of_vertices * number_of_vertices:
             return False
-        random_graph = DirectedCostGraph()
-        random_graph.initialize_vertices(number_of_vertices)
-        cost_range_start = cost_range[0]
-        cost_range_end = cost_range[1]
-        i = 0
-        while i < number_of_edges:
-            edge_start = random.randint(0, number_of_vertices - 1)
-            edge_end = random.randint(0, number_of_vertices - 1)
-            cost = random.randint(cost_range_start, cost_range_end)
-            if random_graph.add_edge(edge_start, edge_end, cost):
-                i += 1
-        self.__graph = random_graph
+        edge_starts, edge_ends, edge_costs = random_directed_edges(number_of_vertices, number_of_edges, cost_range,
+                                                                   seed)
+        self.__graph = DirectedCostGraph()
+        self.__graph.load_edges(range(number_of_vertices), edge_starts, edge_ends, edge_costs)
         self.__graph_is_undirected = False
         return True
 
-    def random_undirected_graph(self, number_of_vertices, number_of_edges, cost_range: tuple = (0, 99)):
-        pass
+    def random_undirected_graph(self, number_of_vertices, number_of_edges, cost_range: tuple = (0, 99),
+                                seed=None) -> bool:
+        """
+        Replaces the current graph with a random undirected graph without loops with specified number of vertices and
+        edges. Like in read_undirected_graph, every edge is stored in both directions with the same cost.
+        :param number_of_vertices: the number of vertices that the random graph will have
+        :param number_of_edges: number of undirected edges the random graph will have
+        :param cost_range: a range of values that the edge costs may take
+        :param seed: the seed of the random generator, the same seed giving the same graph; None for a random seed
+        :return False if the number of edges is greater than number_of_vertices * (number_of_vertices - 1) / 2
+                True if built successfully
+        """
+        if number_of_edges > number_of_vertices * (number_of_vertices - 1) // 2:
+            return False
+        edge_starts, edge_ends, edge_costs = random_undirected_edges(number_of_vertices, number_of_edges, cost_range,
+                                                                     seed)
+        self.__graph = DirectedCostGraph()
+        self.__graph.load_edges(range(number_of_vertices), edge_starts + edge_ends, edge_ends + edge_starts,
+                                edge_costs + edge_costs)
+        self.__graph_is_undirected = True
+        return True
 
     def make_graph_copy(self):
-        self.__last_copy = self.__graph.get_copy()
-        if self.__last_copy != self.__graph:
-            return True
-        return False
+        """
+            Pushes a copy of the current graph on the stack of snapshots, dropping the oldest snapshot if there are
+        already max_snapshots of them. Copies are copy on write (see DirectedCostGraph.get_copy), so this is O(1).
+        :return: False if the graph can not be modified (a compact graph), so a copy is not needed; True otherwise
+        """
+        copy = self.__graph.get_copy()
+        if copy is self.__graph:
+            return False
+        self.__snapshots.append((copy, self.__graph_is_undirected))
+        if len(self.__snapshots) > self.__max_snapshots:
+            self.__snapshots.pop(0)
+        return True
 
     def revert_to_last_copy(self):
-        if self.__last_copy == self.__graph:
+        """
+            Replaces the current graph with the most recent snapshot, which is removed from the stack
+        :return: False if there is no snapshot, True otherwise
+        """
+        if not self.__snapshots:
             return False
-        self.__graph = self.__last_copy
+        self.__graph, self.__graph_is_undirected = self.__snapshots.pop()
         return True
 
+    def set_max_snapshots(self, max_snapshots: int) -> None:
+        """
+            Bounds the number of snapshots kept by make_graph_copy, dropping the oldest ones if there are too many
+        """
+        if max_snapshots < 1:
+            raise GraphError("At least one snapshot must be kept.")
+        self.__max_snapshots = max_snapshots
+        del self.__snapshots[:-max_snapshots]
+
+    def get_snapshot_statistics(self) -> list:
+        """
+        :return: a list with a dict for every snapshot, the most recent first, holding its number of vertices and edges
+                and the bytes of memory it is responsible for: the dicts it does not share with the next more recent
+                snapshot (or with the current graph, for the most recent one)
+        """
+        statistics = []
+        newer_graph = self.__graph
+        for snapshot, is_undirected in reversed(self.__snapshots):
+            shared_with = newer_graph if isinstance(newer_graph, DirectedCostGraph) else None
+            statistics.append({
+                "vertices": snapshot.get_number_of_vertices(),
+                "edges": snapshot.get_number_of_edges() // 2 if is_undirected else snapshot.get_number_of_edges(),
+                "unshared_bytes": snapshot.get_unshared_size(shared_with),
+            })
+            newer_graph = snapshot
+        return statistics
+
     def BFS(self, start: int):
+        """
+            Breadth-first search from start (see controller/traversal.py for the lazy traversals it is built on)
+        :return: None if start is not a vertex, else the dict mapping every vertex reachable from start to the vertex it
+                was discovered from (None for start), in the order the vertices were discovered
+        """
         if not self.__graph.is_vertex(start):
             return None
-        queue = []
-        parent = {}
-        queue.append(start)
-        parent[start] = None
-        while len(queue) != 0:
-            current_vertex = queue.pop()
-            for successor in self.__graph.parse_out_vertices(current_vertex):
-                if successor not in parent:
-                    parent[successor] = current_vertex
-                    queue.append(successor)
-        return parent
+        return {vertex: parent for parent, vertex, depth in breadth_first(self.__graph, start)}
+
+    def is_reachable(self, start_vertex, end_vertex, max_hops=None) -> bool:
+        """
+            Checks if end_vertex can be reached from start_vertex using at most max_hops edges (any number if None).
+        The search stops as soon as end_vertex is found.
+        raises GraphError if one of the vertices is not in the graph
+        """
+        return is_reachable(self.__graph, start_vertex, end_vertex, max_hops)
+
+    def connected_components(self) -> ConnectedComponents:
+        """
+            Labels every vertex of the current (undirected) graph with the id of its connected component in linear
+        time. No subgraph is built; ConnectedComponents.get_subgraph builds one when it is needed.
+        :return: the ConnectedComponents of the current graph
+        """
+        return ConnectedComponents(self.__graph)
+
+    @staticmethod
+    def count_connected_components_in_file(file_path: str) -> int:
+        """
+            Counts the connected components of an undirected graph file while it is read, without loading the graph
+        :param file_path: path of a file in one of the formats accepted by read_undirected_graph
+        :return: the number of connected components
+        """
+        return count_components_in_file(file_path)
+
+    def strongly_connected_components(self) -> StronglyConnectedComponents:
+        """
+            Finds the strongly connected components of the current directed graph in linear time
+        :return: the StronglyConnectedComponents of the current graph, numbered in topological order
+        """
+        return StronglyConnectedComponents(self.__graph)
+
+    def condense_graph(self) -> StronglyConnectedComponents:
+        """
+            Replaces the current graph with its condensation, a DAG with one vertex per strongly connected component,
+        so that the topological sort and the scheduling functions can be used on graphs with cycles
+        :return: the StronglyConnectedComponents of the replaced graph, mapping its vertices to the new ones
+        """
+        components = self.strongly_connected_components()
+        self.__graph = components.get_condensation()
+        self.__graph_is_undirected = False
+        return components
 
     def connected_components_BFS(self) -> list:
         """
                 Goes through all the connected components of the current graph and creates the appropriate subgraphs
-            representing each connected component. To achieve this, we use BFS on each node of the current graph,
-            marking the nodes visited by BFS such that we don't check the same connected component twice.
+            representing each connected component. The components are found by connected_components and every
+            subgraph is built in one bulk load.
         :return: a list of subgraphs representing the connected components of the current graph
         """
-        # Remember visited vertices
-        visited = {}
-        # The list of subgraphs
-        connected_components = []
-        # Go through all vertices
-        for vertex in self.__graph.parse_all_vertices():
-            # Check if they are not in an already parsed connected component
-            if vertex not in visited:
-                # Do a BFS on the current vertex that is not in any of the previous connected components and remember all the vertices parsed by BFS
-                parents = self.BFS(vertex)
-                # Initiate current subgraph (connected component of the big graph)
-                current_connected_component = DirectedCostGraph()
-                # Go through all vertices parsed by BFS
-                for accessible_vertex_in_component in parents:
-                    # Add vertex parsed by BFS to subgraph
-                    current_connected_component.add_vertex(accessible_vertex_in_component)
-                    # Mark vertex as visited
-                    visited[accessible_vertex_in_component] = True
-                    # Parse all neighbours of the current vertex to add ALL edges of the current vertex
-                    for neighbour in self.__graph.parse_out_vertices(accessible_vertex_in_component):
-                        # Add edge to the subgraph
-                        edge_cost = self.__graph.get_edge_cost(accessible_vertex_in_component, neighbour)
-                        current_connected_component.add_vertex(neighbour)
-                        current_connected_component.add_edge(accessible_vertex_in_component, neighbour, edge_cost)
-                        current_connected_component.add_edge(neighbour, accessible_vertex_in_component, edge_cost)
-                connected_components.append(current_connected_component)
-        return connected_components
+        components = self.connected_components()
+        return [components.get_subgraph(component) for component in range(components.get_number_of_components())]
 
     @staticmethod
     def find_path_from_predecessors(predecessors: dict, final_vertex):
@@ -316,21 +681,16 @@ class GraphController:
                     E.g: path: [3, 4, 2, 5, 0]
                     this means that to reach vertex 0 from 3 we have to go 3 --> 4 --> 2 --> 5 --> 0
         """
-        # Initiate the path with the destination vertex
-        path = [final_vertex]
-        current = predecessors[final_vertex]
-        # Parse the predecessors dict while constructing the path
-        while current is not None:
-            path.append(current)
-            current = predecessors[current]
-        # By going through the predecessors the path will be reversed, therefore we fix it through reversing it back
-        path.reverse()
-        return path
+        return find_path_from_predecessors(predecessors, final_vertex)
 
     def shortest_path(self, start_vertex, end_vertex):
         """
-            Computes the shortest path from the start vertex to the end vertex using Bellman-Ford algorithm and returns
-        the distance to that vertex (integer) and the correct path to the end vertex (a list of vertices)
+            Computes the shortest path from the start vertex to the end vertex and returns the distance to that vertex
+        (integer) and the correct path to the end vertex (a list of vertices).
+        The edge costs are scanned once: if none is negative the engine uses bidirectional Dijkstra, which stops as
+        soon as the path is known, otherwise it uses queue-based Bellman-Ford, which only revisits vertices whose
+        distance changed. When a start vertex is queried again, its whole tree is computed once and kept in the
+        shortest path tree cache, which answers the following queries from it.
         If there exists a negative cycle, then the algorithm returns false
         :param start_vertex: vertex to start path from
         :param end_vertex: vertex to end path to
@@ -346,126 +706,187 @@ class GraphController:
                                        --> path is a list representing the vertices needed to get from start_vertex to end_vertex
                                             by iterating ascending through the list we get the path starting from start_vertex to end_vertex
         """
-        # Prerequisites
-        distance = {}
-        predecessor = {}
-        """ Initialize the default values for all vertices in distance and predecessor """
-        for vertex in self.__graph.parse_all_vertices():
-            distance[vertex] = float('inf')
-            predecessor[vertex] = None
-        # Distance to from start to start is ofcourse 0
-        distance[start_vertex] = 0
-
-        """ Relax the graph at most N - 1 times (where N is the number of vertices of the current graph) or until we no longer get any changes
-         We relax it N - 1 times because the longest possible path from start_vertex to end_vertex would include N - 1 edges """
-        changed = True
-        i = 0
-        while changed and i < self.__graph.get_number_of_vertices():
-            changed = False
-            i += 1
-            # Parse ALL edges of the graph
-            for edge in self.__graph.parse_all_edges():
-                edge_start = edge[0]
-                edge_end = edge[1]
-                cost = self.__graph.get_edge_cost(edge_start, edge_end)
-                # Check if we found a better distance from start_vertex to the current vertex
-                if distance[edge_start] + cost < distance[edge_end]:
-                    changed = True
-                    # Update the distance with the new-found better distance
-                    distance[edge_end] = distance[edge_start] + cost
-                    # Update the predecessor dict used to create the path
-                    predecessor[edge_end] = edge_start
-
-        """ Check for negative cycles """
-        for vertex in self.__graph.parse_all_vertices():
-            prev = predecessor[vertex]
-            if prev is None:
-                continue
-            cost = self.__graph.get_edge_cost(prev, vertex)
-            if distance[prev] + cost < distance[vertex]:
-                # This means we found a negative cycle
-                # Maybe raise exception instead of returning false, not sure
-                return False
-
-        """ Compute the path from the predecessors """
-        path = self.find_path_from_predecessors(predecessor, end_vertex)
-        return distance[end_vertex], path
+        maintained_tree = self.__get_maintained_tree()
+        if maintained_tree is not None and maintained_tree.get_start_vertex() == start_vertex:
+            if not self.__graph.is_vertex(end_vertex):
+                raise GraphError("Vertex is not within the graph.")
+            return maintained_tree.shortest_path(end_vertex)
+        shortest_path_tree = self.__shortest_path_cache.get(self.__graph, start_vertex)
+        engine = self.__get_shortest_path_engine()
+        if shortest_path_tree is None:
+            if not engine.has_negative_costs() and \
+                    not self.__shortest_path_cache.is_repeated_start_vertex(self.__graph, start_vertex):
+                return engine.shortest_path(start_vertex, end_vertex)
+            # With negative costs the whole tree is computed anyway, and a start vertex queried again is likely to be
+            # queried more, so keep the tree for the next queries
+            shortest_path_tree = self.__compute_shortest_path_tree(start_vertex)
+        if shortest_path_tree is False:
+            return False
+        if not self.__graph.is_vertex(end_vertex):
+            raise GraphError("Vertex is not within the graph.")
+        distance, predecessor = shortest_path_tree
+        return distance[end_vertex], self.find_path_from_predecessors(predecessor, end_vertex)
+
+    def __get_shortest_path_engine(self) -> ShortestPathEngine:
+        """
+            Returns the engine of the current graph, creating a new one when the graph was replaced or modified so
+        that the scan of the edge costs is only done once per version of the graph
+        """
+        engine_key = (id(self.__graph), self.__graph.get_version())
+        if self.__shortest_path_engine is None or self.__shortest_path_engine_key != engine_key:
+            self.__shortest_path_engine = ShortestPathEngine(self.__graph)
+            self.__shortest_path_engine_key = engine_key
+        return self.__shortest_path_engine
+
+    def shortest_paths_from(self, start_vertex):
+        """
+            Returns the shortest path tree rooted at start_vertex, taking it from the LRU cache of trees when the graph
+        did not change since it was computed
+        :return: False if there exists a negative cycle reachable from the start vertex
+                Else
+                the tuple (distance, predecessor) of dicts with the meaning described in shortest_path
+        """
+        maintained_tree = self.__get_maintained_tree()
+        if maintained_tree is not None and maintained_tree.get_start_vertex() == start_vertex:
+            return maintained_tree.get_tree()
+        shortest_path_tree = self.__shortest_path_cache.get(self.__graph, start_vertex)
+        if shortest_path_tree is None:
+            shortest_path_tree = self.__compute_shortest_path_tree(start_vertex)
+        return shortest_path_tree
+
+    def __compute_shortest_path_tree(self, start_vertex):
+        shortest_path_tree = self.__get_shortest_path_engine().single_source(start_vertex)
+        if shortest_path_tree is None:
+            shortest_path_tree = False
+        self.__shortest_path_cache.put(self.__graph, start_vertex, shortest_path_tree)
+        return shortest_path_tree
+
+    def set_shortest_path_cache_size(self, max_cached_vertices: int) -> None:
+        """
+            Sets the memory bound of the shortest path tree cache, as the total number of vertices of the cached trees
+        """
+        self.__shortest_path_cache.set_max_cached_vertices(max_cached_vertices)
+
+    def get_shortest_path_cache_statistics(self) -> dict:
+        return self.__shortest_path_cache.get_statistics()
+
+    def find_negative_cycle(self, start_vertex=None):
+        """
+            Finds a negative cycle reachable from start_vertex, or anywhere in the graph if start_vertex is None.
+        The search stops as soon as the cycle closes in the shortest path tree (see
+        ShortestPathEngine.find_negative_cycle), so it usually takes far less than the N rounds of Bellman-Ford.
+        :return: None if there is no such cycle, otherwise the list of its vertices in order, the last vertex having an
+                edge back to the first one
+        """
+        return self.__get_shortest_path_engine().find_negative_cycle(start_vertex)
+
+    def shortest_path_vectorized(self, start_vertex, end_vertex):
+        """
+            Computes the same result as shortest_path with a Bellman-Ford whose relaxation rounds are NumPy operations
+        over the src, dst and cost arrays of all the edges (see controller/vectorized_bellman_ford.py). The arrays are
+        built once per version of the graph. Meant for graphs with negative costs; needs numpy.
+        :return: False if there exists a negative cycle reachable from the start vertex, else (distance, path)
+        """
+        # The graph itself is part of the key, so its id can not be reused by another graph while the arrays are kept
+        edge_arrays_key = (self.__graph, self.__graph.get_version())
+        if self.__edge_arrays is None or self.__edge_arrays_key != edge_arrays_key:
+            self.__edge_arrays = EdgeArrays(self.__graph)
+            self.__edge_arrays_key = edge_arrays_key
+        return self.__edge_arrays.shortest_path(start_vertex, end_vertex)
+
+    def all_pairs_shortest_paths(self, output_path: str = "data/distances.dcm", max_workers=None) -> bool:
+        """
+            Computes the distances between all pairs of vertices with Johnson's algorithm, running Dijkstra from every
+        source in a pool of worker processes that share the graph, and streams them to a distance matrix file that
+        controller.all_pairs.DistanceMatrixFile can open (see controller/all_pairs.py for the file format)
+        :param output_path: the distance matrix file to be written
+        :param max_workers: the number of worker processes, one per CPU if None
+        :return: False if there exists a negative cycle, True otherwise
+        """
+        return johnson_all_pairs(self.__graph, output_path, max_workers)
+
+    def get_schedule(self):
+        """
+            Computes the topological order, earliest and latest times, slack, duration and critical path of the current
+        graph in a single forward and backward pass (see controller/scheduling.py). The result is cached until the
+        graph changes, so the functions below share one computation.
+        :return: the Schedule, or None if the graph has a cycle
+        """
+        if self.__schedule is None or not self.__schedule.is_up_to_date(self.__graph):
+            self.__schedule = compute_schedule(self.__graph)
+            if self.__schedule is None:
+                return None
+        return self.__schedule
 
     def topological_sort_counting_predecessors(self):
         if self.__graph.get_number_of_vertices() == 0:
             return None
+        schedule = self.get_schedule()
+        if schedule is None:
+            return None
+        return list(schedule.get_order())
+
+    def topological_levels(self):
+        """
+            Splits the vertices of the current graph into topological levels: the vertices without predecessors, then
+        the vertices whose predecessors are all in the levels before, and so on (see controller/topological_levels.py)
+        The levels are kept until the graph changes, so get_antichain_width does not compute them again.
+        :return: the list of levels (not a copy, it must not be modified), or None if the graph has a cycle
+        """
+        levels_key = (self.__graph, self.__graph.get_version())
+        if self.__levels_key != levels_key:
+            self.__levels = topological_levels(self.__graph)
+            self.__levels_key = levels_key
+        return self.__levels
 
-        # Dict with the number of predecessors of each vertex
-        in_degree = {}
-        # The final sorted vertices
-        result = []
-        # deque for the nodes with no predecessors for parsing
-        queue = deque()
-        # Update for each vertex its number of predecessors in dict
-        for vertex in self.__graph.parse_all_vertices():
-            number_of_predecessors = self.__graph.get_in_degree(vertex)
-            if number_of_predecessors == 0:
-                queue.append(vertex)
-            in_degree[vertex] = self.__graph.get_in_degree(vertex)
-
-        # Process vertices with no predecessors
-        while queue:
-            vertex = queue.popleft()
-            result.append(vertex)
-            # Decrement incoming edges for each successor
-            for successor in self.__graph.parse_out_vertices(vertex):
-                in_degree[successor] -= 1
-                if in_degree[successor] == 0:
-                    queue.append(successor)
-
-        # If all vertices have been added to the graph, then it is a DAG
-        if len(result) == self.__graph.get_number_of_vertices():
-            return result
-        # Else, it has a cycle
-        return None
+    def get_antichain_width(self):
+        """
+        :return: the number of vertices of the widest topological level, or None if the graph has a cycle
+        """
+        levels = self.topological_levels()
+        if levels is None:
+            return None
+        return get_antichain_width(levels)
+
+    def __get_compact_graph(self) -> CompactDirectedCostGraph:
+        """
+            Returns the current graph as a CompactDirectedCostGraph, converting it only once per version of the graph
+        """
+        if isinstance(self.__graph, CompactDirectedCostGraph):
+            return self.__graph
+        # The graph itself is part of the key, so its id can not be reused by another graph while the copy is kept
+        compact_graph_key = (self.__graph, self.__graph.get_version())
+        if self.__compact_graph_key != compact_graph_key:
+            self.__compact_graph = CompactDirectedCostGraph.from_graph(self.__graph)
+            self.__compact_graph_key = compact_graph_key
+        return self.__compact_graph
+
+    def earliest_start_vectorized(self):
+        """
+            Same result as earliest_start, computed level by level with NumPy on a compact copy of the graph, which is
+        made once per version of the graph
+        :return: None if the graph has a cycle, else the dict of earliest times
+                raises GraphError if numpy is not installed
+        """
+        result = vectorized_earliest_start(self.__get_compact_graph())
+        if result is None:
+            return None
+        return result[1]
 
     def earliest_start(self):
-        sorted_vertices = self.topological_sort_counting_predecessors()
-        if sorted_vertices is None:
+        schedule = self.get_schedule()
+        if schedule is None:
             return None
-        earliest_start_time = {}
-        for vertex in sorted_vertices:
-            max_time = 0
-            for predecessor in self.__graph.parse_in_vertices(vertex):
-                max_time = max(max_time, earliest_start_time[predecessor] + self.get_edge_cost(predecessor, vertex))
-            earliest_start_time[vertex] = max_time
-        max_total_time = 0
-        for key in earliest_start_time:
-            max_total_time = max(max_total_time, earliest_start_time[key])
-        return earliest_start_time
+        return dict(schedule.get_earliest_start())
 
     def latest_start(self):
-        sorted_vertices = self.topological_sort_counting_predecessors()
-        if sorted_vertices is None:
+        schedule = self.get_schedule()
+        if schedule is None:
             return None
-        latest_start_times = {}
-        earliest_start_times = self.earliest_start()
-        for vertex in self.__graph.parse_all_vertices():
-            latest_start_times[vertex] = float('inf')
-        # Nth vertex
-        index = self.get_number_of_vertices() - 2
-        latest_start_times[index + 1] = earliest_start_times[index + 1]
-        # Parse in reverse topological order
-        while index >= 0:
-            min_time = float('inf')
-            for successor in self.__graph.parse_out_vertices(sorted_vertices[index]):
-                min_time = min(min_time, latest_start_times[successor] - self.get_edge_cost(sorted_vertices[index], successor))
-            latest_start_times[sorted_vertices[index]] = min_time
-            index -= 1
-        return latest_start_times
+        return dict(schedule.get_latest_start())
 
     def critical_activities(self):
-        earliest_times = self.earliest_start()
-        if earliest_times is None:
+        schedule = self.get_schedule()
+        if schedule is None:
             return None
-        latest_times = self.latest_start()
-        critical_vertices = []
-        for vertex in self.__graph.parse_all_vertices():
-            if earliest_times[vertex] == latest_times[vertex]:
-                critical_vertices.append(vertex)
-        return critical_vertices
\ No newline at end of file
+        return schedule.get_critical_vertices()
@@ -0,0 +1,267 @@
+"""
+Random graph generation.
+
+An edge is identified by a number: (u, v) of a directed graph on n vertices is u * n + v, in 0 .. n * n - 1, and
+the edge {u, v} with u < v of an undirected graph without loops is v * (v - 1) / 2 + u, in 0 .. n * (n - 1) / 2 - 1.
+Drawing a graph with exactly m edges is then drawing m distinct numbers, which sample_distinct does in O(m) steps
+whatever the density: with Floyd's algorithm when m is at most half the possible edges, and otherwise by drawing the
+edges that are left out and keeping all the others.
+
+The write_* functions generate the graph families used for scaling tests and stream them straight to a file, a chunk of
+lines at a time, so the graph is never held in memory:
+    - write_barabasi_albert_graph: power-law graphs with a few hubs of very high degree
+    - write_grid_graph: 2D grids with negative costs, whose edges go right and down, so there is no negative cycle
+    - write_layered_dag: deep DAGs for the scheduling functions
+    - write_activity_network: the same shape, in the activity file format of read_activities_graph
+The graphs are written in the "number_of_vertices number_of_edges" header format of read_directed_graph, with the
+vertices 0 .. number_of_vertices - 1.
+
+Run from the practical1 folder:
+    python -m controller.graph_generators family file_path arguments... [seed]
+e.g. python -m controller.graph_generators grid data/grid.txt 1000 1000
+"""
+import random
+import sys
+from array import array
+from itertools import islice
+from math import isqrt
+
+from errors.exceptions import GraphError
+
+
+def sample_distinct(population_size: int, sample_size: int, generator: random.Random) -> list:
+    """
+        Draws sample_size distinct numbers from 0 .. population_size - 1, every subset being equally likely
+    :return: the list of numbers, in increasing order
+            raises GraphError if sample_size is negative or larger than population_size
+    """
+    if not 0 <= sample_size <= population_size:
+        raise GraphError(f'Can not choose {sample_size} out of {population_size}.')
+    if 2 * sample_size > population_size:
+        left_out = set(sample_distinct(population_size, population_size - sample_size, generator))
+        return [number for number in range(population_size) if number not in left_out]
+    # Floyd's algorithm: one draw per chosen number, never retried
+    chosen = set()
+    for upper_bound in range(population_size - sample_size, population_size):
+        number = generator.randint(0, upper_bound)
+        chosen.add(upper_bound if number in chosen else number)
+    return sorted(chosen)
+
+
+def draw_costs(number_of_edges: int, cost_range: tuple, generator: random.Random) -> list:
+    """
+        Draws all the edge costs in one batch, uniformly from cost_range[0] .. cost_range[1]
+    """
+    return generator.choices(range(cost_range[0], cost_range[1] + 1), k=number_of_edges)
+
+
+def random_directed_edges(number_of_vertices: int, number_of_edges: int, cost_range: tuple = (0, 99), seed=None):
+    """
+        Draws a random directed graph (loops allowed) with exactly number_of_edges distinct edges
+    :return: the parallel lists (edge_starts, edge_ends, edge_costs), ready for DirectedCostGraph.load_edges
+            raises GraphError if there can not be that many edges
+    """
+    generator = random.Random(seed)
+    edge_ids = sample_distinct(number_of_vertices * number_of_vertices, number_of_edges, generator)
+    edge_starts = [edge_id // number_of_vertices for edge_id in edge_ids]
+    edge_ends = [edge_id % number_of_vertices for edge_id in edge_ids]
+    return edge_starts, edge_ends, draw_costs(number_of_edges, cost_range, generator)
+
+
+def random_undirected_edges(number_of_vertices: int, number_of_edges: int, cost_range: tuple = (0, 99), seed=None):
+    """
+        Draws a random undirected graph without loops with exactly number_of_edges distinct edges
+    :return: the parallel lists (edge_starts, edge_ends, edge_costs) with every edge once, its start being the
+            smaller vertex
+            raises GraphError if there can not be that many edges
+    """
+    generator = random.Random(seed)
+    edge_ids = sample_distinct(number_of_vertices * (number_of_vertices - 1) // 2, number_of_edges, generator)
+    edge_starts = []
+    edge_ends = []
+    for edge_id in edge_ids:
+        # edge_id = edge_end * (edge_end - 1) / 2 + edge_start with edge_start < edge_end
+        edge_end = (1 + isqrt(1 + 8 * edge_id)) // 2
+        edge_starts.append(edge_id - edge_end * (edge_end - 1) // 2)
+        edge_ends.append(edge_end)
+    return edge_starts, edge_ends, draw_costs(number_of_edges, cost_range, generator)
+
+
+LINES_PER_WRITE = 65536
+
+
+def _write_lines(file_path: str, header, lines) -> None:
+    """
+        Writes the header line (if it is not None) and then the lines produced by the iterable, joining them into chunks
+    of LINES_PER_WRITE lines so that there is one write call per chunk
+    """
+    output_file = open(file_path, "wt")
+    try:
+        if header is not None:
+            output_file.write(header + "\n")
+        lines = iter(lines)
+        chunk = list(islice(lines, LINES_PER_WRITE))
+        while chunk:
+            chunk.append("")
+            output_file.write("\n".join(chunk))
+            chunk = list(islice(lines, LINES_PER_WRITE))
+    finally:
+        output_file.close()
+
+
+def write_barabasi_albert_graph(file_path: str, number_of_vertices: int, edges_per_vertex: int,
+                                cost_range: tuple = (0, 99), seed=None, both_directions: bool = False) -> int:
+    """
+        Writes a Barabasi-Albert graph: the vertices 0 .. edges_per_vertex - 1 start without edges and every following
+    vertex gets edges to edges_per_vertex distinct older vertices, each picked with a probability proportional to its
+    degree, so the degrees follow a power law. The edges go from the new vertex to the older one.
+    Only the ends of the edges are kept in memory, in an array of 4 or 8 bytes per edge; their starts are implied by the
+    order in which they are made.
+    :param both_directions: if True every edge is also written in the opposite direction, so the hubs have both a high
+                            in degree and a high out degree
+    :return: the number of edges written
+            raises GraphError if number_of_vertices is not greater than edges_per_vertex or edges_per_vertex < 1
+    """
+    if not 1 <= edges_per_vertex < number_of_vertices:
+        raise GraphError("The number of edges per vertex must be at least 1 and less than the number of vertices.")
+    generator = random.Random(seed)
+    number_of_edges = edges_per_vertex * (number_of_vertices - edges_per_vertex) * (2 if both_directions else 1)
+
+    def lines():
+        edge_ends = array('l')
+        for vertex in range(edges_per_vertex, number_of_vertices):
+            if vertex == edges_per_vertex:
+                chosen = range(edges_per_vertex)
+            else:
+                # Every edge has two ends: a uniform end of a uniform edge is a vertex picked by degree. The start of
+                # edge i is the vertex that made it, edges_per_vertex + i // edges_per_vertex
+                number_of_ends = 2 * len(edge_ends)
+                chosen = {}
+                while len(chosen) < edges_per_vertex:
+                    end = generator.randrange(number_of_ends)
+                    edge = end >> 1
+                    chosen[edge_ends[edge] if end & 1 else edges_per_vertex + edge // edges_per_vertex] = None
+            costs = draw_costs(edges_per_vertex, cost_range, generator)
+            for older_vertex, cost in zip(chosen, costs):
+                edge_ends.append(older_vertex)
+                yield f'{vertex} {older_vertex} {cost}'
+                if both_directions:
+                    yield f'{older_vertex} {vertex} {cost}'
+
+    _write_lines(file_path, f'{number_of_vertices} {number_of_edges}', lines())
+    return number_of_edges
+
+
+def write_grid_graph(file_path: str, number_of_rows: int, number_of_columns: int, cost_range: tuple = (-10, 99),
+                     seed=None) -> int:
+    """
+        Writes a grid where vertex row * number_of_columns + column has an edge to its right and to its lower neighbour.
+    The costs may be negative, but since every edge goes right or down there is no cycle, so no negative cycle either.
+    :return: the number of edges written
+    """
+    generator = random.Random(seed)
+    number_of_vertices = number_of_rows * number_of_columns
+    number_of_edges = number_of_rows * (number_of_columns - 1) + (number_of_rows - 1) * number_of_columns
+
+    def lines():
+        for row in range(number_of_rows):
+            costs = iter(draw_costs(2 * number_of_columns, cost_range, generator))
+            for vertex in range(row * number_of_columns, (row + 1) * number_of_columns):
+                if (vertex + 1) % number_of_columns:
+                    yield f'{vertex} {vertex + 1} {next(costs)}'
+                if row + 1 < number_of_rows:
+                    yield f'{vertex} {vertex + number_of_columns} {next(costs)}'
+
+    _write_lines(file_path, f'{number_of_vertices} {number_of_edges}', lines())
+    return number_of_edges
+
+
+def _layered_predecessors(number_of_layers: int, layer_width: int, predecessors_per_vertex: int, generator):
+    """
+        For every vertex of the layers 1 .. number_of_layers - 1, in order, yields the pair (vertex, predecessors) where
+    predecessors are predecessors_per_vertex distinct vertices of the layer before; vertex i of layer k is
+    k * layer_width + i
+    """
+    for vertex in range(layer_width, number_of_layers * layer_width):
+        layer_start = (vertex // layer_width - 1) * layer_width
+        yield vertex, [layer_start + index
+                       for index in sample_distinct(layer_width, predecessors_per_vertex, generator)]
+
+
+def write_layered_dag(file_path: str, number_of_layers: int, layer_width: int, predecessors_per_vertex: int,
+                      cost_range: tuple = (0, 99), seed=None) -> int:
+    """
+        Writes a DAG of number_of_layers layers of layer_width vertices, where every vertex after the first layer has
+    edges from predecessors_per_vertex vertices of the layer before, so every path from the first to the last layer has
+    number_of_layers - 1 edges
+    :return: the number of edges written
+            raises GraphError if predecessors_per_vertex is not between 0 and layer_width
+    """
+    if not 0 <= predecessors_per_vertex <= layer_width:
+        raise GraphError("The number of predecessors must be between 0 and the layer width.")
+    generator = random.Random(seed)
+    number_of_vertices = number_of_layers * layer_width
+    number_of_edges = max(0, number_of_layers - 1) * layer_width * predecessors_per_vertex
+    pairs = _layered_predecessors(number_of_layers, layer_width, predecessors_per_vertex, generator)
+
+    def lines():
+        for vertex, predecessors in pairs:
+            for predecessor, cost in zip(predecessors, draw_costs(len(predecessors), cost_range, generator)):
+                yield f'{predecessor} {vertex} {cost}'
+
+    _write_lines(file_path, f'{number_of_vertices} {number_of_edges}', lines())
+    return number_of_edges
+
+
+def write_activity_network(file_path: str, number_of_layers: int, layer_width: int, predecessors_per_activity: int,
+                           duration_range: tuple = (1, 20), seed=None) -> int:
+    """
+        Writes an activity file (see controller/activity_network.py) with the shape of write_layered_dag: activity i of
+    layer k is named a{k * layer_width + i}, the activities of the first layer can start right away and every other one
+    waits for predecessors_per_activity activities of the layer before
+    :return: the number of activities written
+            raises GraphError if predecessors_per_activity is not between 1 and layer_width
+    """
+    if not 1 <= predecessors_per_activity <= layer_width:
+        raise GraphError("The number of predecessors must be between 1 and the layer width.")
+    generator = random.Random(seed)
+    number_of_activities = number_of_layers * layer_width
+    pairs = _layered_predecessors(number_of_layers, layer_width, predecessors_per_activity, generator)
+
+    def lines():
+        durations = draw_costs(layer_width, duration_range, generator)
+        for activity, duration in zip(range(min(layer_width, number_of_activities)), durations):
+            yield f'a{activity} - {duration}'
+        for activity, predecessors in pairs:
+            predecessor_names = ",".join([f'a{predecessor}' for predecessor in predecessors])
+            yield f'a{activity} {predecessor_names} {generator.randint(*duration_range)}'
+
+    _write_lines(file_path, None, lines())
+    return number_of_activities
+
+
+GENERATORS = {
+    "barabasi-albert": (write_barabasi_albert_graph, "number_of_vertices edges_per_vertex"),
+    "grid": (write_grid_graph, "number_of_rows number_of_columns"),
+    "layered-dag": (write_layered_dag, "number_of_layers layer_width predecessors_per_vertex"),
+    "activities": (write_activity_network, "number_of_layers layer_width predecessors_per_activity"),
+}
+
+
+def main(arguments) -> None:
+    if len(arguments) < 2 or arguments[0] not in GENERATORS:
+        for family, (function, parameters) in GENERATORS.items():
+            print(f'python -m controller.graph_generators {family} file_path {parameters} [seed]')
+        return
+    function, parameters = GENERATORS[arguments[0]]
+    numbers = [int(argument) for argument in arguments[2:]]
+    number_of_parameters = len(parameters.split())
+    if len(numbers) not in (number_of_parameters, number_of_parameters + 1):
+        print(f'Expected: {parameters} [seed]')
+        return
+    seed = numbers.pop() if len(numbers) > number_of_parameters else None
+    print(function(arguments[1], *numbers, seed=seed))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
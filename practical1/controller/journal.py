@@ -0,0 +1,167 @@
+"""
+Journal of the changes made to a graph, for unlimited undo / redo.
+
+Every change is stored as a small delta holding what is needed to apply it and to revert it:
+    ("add_vertex", vertex)
+    ("remove_vertex", vertex, inbound_edges, outbound_edges)   the edges as lists of (other vertex, cost) pairs
+    ("add_edge", edge_start, edge_end, cost)
+    ("remove_edge", edge_start, edge_end, cost)
+    ("modify_edge_cost", edge_start, edge_end, old_cost, new_cost)
+so the memory used grows with the number of changes, not with the size of the graph.
+
+The journal can also be written to a file as it grows, one JSON list per line: the deltas above plus ["undo"] and
+["redo"] lines. Replaying such a file on the graph the session started from rebuilds the state of the session, e.g.
+after a crash. Once the graph is replaced (read from a file, reverted to a snapshot, ...), a ["reset"] line is written
+before its first change: the lines after it do not apply to the graph the file was started on.
+"""
+import json
+
+from errors.exceptions import GraphError
+
+
+def apply_operations(entry):
+    """
+    :return: the list of (method name, arguments) graph changes that apply the delta entry
+    """
+    kind = entry[0]
+    if kind == "remove_vertex":
+        return [("remove_vertex", (entry[1],))]
+    if kind == "remove_edge":
+        return [("remove_edge", (entry[1], entry[2]))]
+    if kind == "modify_edge_cost":
+        return [("modify_edge_cost", (entry[1], entry[2], entry[4]))]
+    return [(kind, tuple(entry[1:]))]
+
+
+def revert_operations(entry):
+    """
+    :return: the list of (method name, arguments) graph changes that revert the delta entry
+    """
+    kind = entry[0]
+    if kind == "add_vertex":
+        return [("remove_vertex", (entry[1],))]
+    if kind == "remove_vertex":
+        vertex, inbound_edges, outbound_edges = entry[1:]
+        return [("add_vertex", (vertex,))] + \
+               [("add_edge", (vertex, successor, cost)) for successor, cost in outbound_edges] + \
+               [("add_edge", (predecessor, vertex, cost)) for predecessor, cost in inbound_edges]
+    if kind == "add_edge":
+        return [("remove_edge", (entry[1], entry[2]))]
+    if kind == "remove_edge":
+        return [("add_edge", (entry[1], entry[2], entry[3]))]
+    if kind == "modify_edge_cost":
+        return [("modify_edge_cost", (entry[1], entry[2], entry[3]))]
+    raise GraphError(f'Unknown journal entry {entry}.')
+
+
+class MutationJournal:
+    def __init__(self):
+        """
+            Creates an empty journal
+
+        graph -> the graph the deltas apply to; recording a change of another graph starts the journal over
+        undo_entries -> the deltas that can be undone, the most recent last
+        redo_entries -> the deltas that were undone and can be redone, the most recently undone last
+        journal_file -> the open file the journal is written to, or None
+        file_graph -> the graph the last lines of the journal file apply to
+        """
+        self.__graph = None
+        self.__undo_entries = []
+        self.__redo_entries = []
+        self.__journal_file = None
+        self.__file_graph = None
+
+    def __write(self, graph, entry) -> None:
+        if self.__journal_file is not None:
+            if graph is not self.__file_graph:
+                self.__journal_file.write(json.dumps(["reset"]) + "\n")
+                self.__file_graph = graph
+            self.__journal_file.write(json.dumps(entry) + "\n")
+            self.__journal_file.flush()
+
+    def open_file(self, file_path: str, graph) -> None:
+        """
+            Starts writing every change, undo and redo of graph to file_path (the file is overwritten); a change of
+        another graph is written after a ["reset"] line
+        """
+        self.close_file()
+        self.__journal_file = open(file_path, "wt")
+        self.__file_graph = graph
+
+    def close_file(self) -> None:
+        if self.__journal_file is not None:
+            self.__journal_file.close()
+            self.__journal_file = None
+            self.__file_graph = None
+
+    def clear(self) -> None:
+        self.__graph = None
+        self.__undo_entries = []
+        self.__redo_entries = []
+
+    def record(self, graph, entry) -> None:
+        """
+            Records a change that was just made to the graph; the changes that were undone can not be redone anymore
+        """
+        if graph is not self.__graph:
+            self.clear()
+            self.__graph = graph
+        self.__undo_entries.append(entry)
+        self.__redo_entries = []
+        self.__write(graph, list(entry))
+
+    def pop_undo(self, graph):
+        """
+            Takes the most recent change of the graph, which the caller has to revert with revert_operations
+        :return: the delta, or None if there is nothing to undo (or the journal belongs to another graph)
+        """
+        if graph is not self.__graph or not self.__undo_entries:
+            return None
+        entry = self.__undo_entries.pop()
+        self.__redo_entries.append(entry)
+        self.__write(graph, ["undo"])
+        return entry
+
+    def pop_redo(self, graph):
+        """
+            Takes the most recently undone change of the graph, which the caller has to apply with apply_operations
+        :return: the delta, or None if there is nothing to redo (or the journal belongs to another graph)
+        """
+        if graph is not self.__graph or not self.__redo_entries:
+            return None
+        entry = self.__redo_entries.pop()
+        self.__undo_entries.append(entry)
+        self.__write(graph, ["redo"])
+        return entry
+
+    def get_number_of_entries(self, graph) -> tuple:
+        """
+        :return: the tuple (number of changes of the graph that can be undone, number of changes that can be redone),
+                (0, 0) if the journal belongs to another graph
+        """
+        if graph is not self.__graph:
+            return 0, 0
+        return len(self.__undo_entries), len(self.__redo_entries)
+
+
+def read_journal_file(file_path: str):
+    """
+        Reads a file written by MutationJournal, one entry at a time
+    :return: a generator of the entries as tuples, ("undo",), ("redo",) and ("reset",) included
+            raises GraphError if a line is not a journal entry
+    """
+    input_file = open(file_path, "rt")
+    try:
+        for line_number, line in enumerate(input_file, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                raise GraphError(f'Line {line_number} of {file_path} is not a journal entry.')
+            if entry[0] == "remove_vertex":
+                entry[2] = [tuple(edge) for edge in entry[2]]
+                entry[3] = [tuple(edge) for edge in entry[3]]
+            yield tuple(entry)
+    finally:
+        input_file.close()
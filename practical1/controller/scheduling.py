@@ -0,0 +1,122 @@
+"""
+Critical path scheduling on a DAG whose edge costs are durations.
+
+The whole schedule is computed at once by compute_schedule:
+    - the topological order, found by counting predecessors (Kahn's algorithm)
+    - one forward pass in topological order: earliest[v] = max(0, earliest[u] + cost(u, v)) over the inbound edges
+    - one backward pass in reverse topological order: latest[v] = min(latest[w] - cost(v, w)) over the outbound edges,
+      and for every vertex without successors (every sink, not just the last vertex) latest[v] = duration, the
+      greatest earliest time
+and kept in a Schedule, which the controller caches until the graph changes.
+"""
+from collections import deque
+
+
+class Schedule:
+    def __init__(self, graph, order, earliest, latest, critical_predecessor):
+        """
+            The result of compute_schedule for the current version of the graph
+
+        order -> the vertices in topological order
+        earliest, latest -> dicts with the earliest and latest time of every vertex
+        critical_predecessor -> dict mapping every vertex to the predecessor that gave it its earliest time (None for
+                                vertices without predecessors)
+        """
+        self.__graph = graph
+        self.__version = graph.get_version()
+        self.__order = order
+        self.__earliest = earliest
+        self.__latest = latest
+        self.__critical_predecessor = critical_predecessor
+        self.__duration = max(earliest.values(), default=0)
+
+    def is_up_to_date(self, graph) -> bool:
+        return graph is self.__graph and graph.get_version() == self.__version
+
+    def get_order(self) -> list:
+        return self.__order
+
+    def get_earliest_start(self) -> dict:
+        return self.__earliest
+
+    def get_latest_start(self) -> dict:
+        return self.__latest
+
+    def get_slack(self) -> dict:
+        """
+        :return: dict with the time every vertex can be delayed by without delaying the project
+        """
+        return {vertex: self.__latest[vertex] - self.__earliest[vertex] for vertex in self.__order}
+
+    def get_duration(self):
+        return self.__duration
+
+    def get_critical_vertices(self) -> list:
+        """
+        :return: the vertices with no slack, in the order of the graph's vertices
+        """
+        return [vertex for vertex in self.__graph.iterate_all_vertices()
+                if self.__earliest[vertex] == self.__latest[vertex]]
+
+    def get_critical_path(self) -> list:
+        """
+        :return: a longest path of the graph, from a vertex without predecessors to a vertex whose earliest time is the
+                duration; every vertex on it is critical
+        """
+        if not self.__order:
+            return []
+        vertex = next(vertex for vertex in reversed(self.__order) if self.__earliest[vertex] == self.__duration)
+        path = [vertex]
+        while self.__critical_predecessor[path[-1]] is not None:
+            path.append(self.__critical_predecessor[path[-1]])
+        path.reverse()
+        return path
+
+
+def compute_schedule(graph):
+    """
+        Computes the topological order, the earliest and latest times and the critical predecessors of all vertices in
+    one topological sort, one forward pass and one backward pass over the edges
+    :return: the Schedule, or None if the graph has a cycle
+    """
+    in_degree = {}
+    queue = deque()
+    for vertex in graph.iterate_all_vertices():
+        in_degree[vertex] = graph.get_in_degree(vertex)
+        if in_degree[vertex] == 0:
+            queue.append(vertex)
+    order = []
+    while queue:
+        vertex = queue.popleft()
+        order.append(vertex)
+        for successor in graph.iterate_out_vertices(vertex):
+            in_degree[successor] -= 1
+            if in_degree[successor] == 0:
+                queue.append(successor)
+    if len(order) != len(in_degree):
+        return None
+
+    # Forward pass: every edge pushes the finish time of its start to its end
+    earliest = dict.fromkeys(order, 0)
+    critical_predecessor = dict.fromkeys(order, None)
+    for vertex in order:
+        current_time = earliest[vertex]
+        for successor, cost in graph.iterate_out_edge_costs(vertex):
+            new_time = current_time + cost
+            if new_time > earliest[successor] or \
+                    (new_time == earliest[successor] and critical_predecessor[successor] is None):
+                earliest[successor] = new_time
+                critical_predecessor[successor] = vertex
+
+    # Backward pass: sinks end with the project, the others as late as their successors allow
+    duration = max(earliest.values(), default=0)
+    latest = {}
+    for vertex in reversed(order):
+        latest_time = None
+        for successor, cost in graph.iterate_out_edge_costs(vertex):
+            if latest_time is None or latest[successor] - cost < latest_time:
+                latest_time = latest[successor] - cost
+        latest[vertex] = duration if latest_time is None else latest_time
+    # Listed in topological order, like the earliest times
+    latest = {vertex: latest[vertex] for vertex in order}
+    return Schedule(graph, order, earliest, latest, critical_predecessor)
@@ -0,0 +1,382 @@
+"""
+Single-source shortest path engine used by GraphController.shortest_path.
+
+The costs of the graph are scanned once to choose the algorithm:
+    - all costs non-negative -> Dijkstra with a binary heap, O((V + E) log V)
+    - some negative cost     -> queue-based Bellman-Ford (SPFA), which only rescans the successors of vertices whose
+                                distance changed; with Tarjan's subtree disassembly it stops as soon as a negative
+                                cycle reachable from the start vertex closes, and can report that cycle
+
+Point-to-point queries on graphs without negative costs use bidirectional Dijkstra, searching forward from the start
+vertex over the outbound edges and backward from the end vertex over the inbound edges, and stop as soon as the two
+searches can no longer find a shorter path. When the end vertex is close to the start vertex only a small part of the
+graph is visited.
+
+ShortestPathTreeCache keeps the most recently used shortest path trees, so repeated queries from the same start
+vertex are answered without running any algorithm. The first query from a start vertex is answered by the point-to-point
+search; when the start vertex comes back, its whole tree is computed and cached.
+"""
+from collections import deque, OrderedDict
+from heapq import heappush, heappop
+from itertools import count
+
+from errors.exceptions import GraphError
+
+
+def find_path_from_predecessors(predecessors: dict, final_vertex):
+    """
+        Builds the path that ends in final_vertex by following the predecessors dict back to a vertex whose
+    predecessor is None (see GraphController.find_path_from_predecessors)
+    :return: the list of vertices of the path, starting with the start vertex and ending with final_vertex
+    """
+    path = [final_vertex]
+    current = predecessors[final_vertex]
+    while current is not None:
+        path.append(current)
+        current = predecessors[current]
+    path.reverse()
+    return path
+
+
+class ShortestPathEngine:
+    def __init__(self, graph):
+        """
+            Creates an engine answering shortest path queries on the graph
+
+        has_negative_costs -> None until the edge costs are scanned for the first time, then whether any of them is
+                                negative
+        """
+        self.__graph = graph
+        self.__has_negative_costs = None
+
+    def has_negative_costs(self) -> bool:
+        """
+            Scans the signs of all edge costs once and remembers the answer
+        """
+        if self.__has_negative_costs is None:
+            self.__has_negative_costs = False
+            for vertex in self.__graph.iterate_all_vertices():
+                for successor, cost in self.__graph.iterate_out_edge_costs(vertex):
+                    if cost < 0:
+                        self.__has_negative_costs = True
+                        return True
+        return self.__has_negative_costs
+
+    def single_source(self, start_vertex):
+        """
+            Computes the shortest path tree rooted at start_vertex with the fastest algorithm valid for the graph
+        :return: None if there is a negative cycle reachable from start_vertex
+                Else
+                the tuple (distance, predecessor) of dicts holding every vertex of the graph, where unreachable
+                vertices have distance inf and the predecessor of start_vertex and of unreachable vertices is None
+                raises GraphError if start_vertex is not in the graph
+        """
+        if not self.__graph.is_vertex(start_vertex):
+            raise GraphError("Vertex is not within the graph.")
+        if self.has_negative_costs():
+            return self.__bellman_ford_queue(start_vertex)
+        return self.__dijkstra(start_vertex)
+
+    def shortest_path(self, start_vertex, end_vertex):
+        """
+            Computes the shortest path between two vertices, stopping as early as the costs of the graph allow
+        :return: False if there is a negative cycle reachable from start_vertex
+                Else
+                the tuple (distance, path) with the same meaning as GraphController.shortest_path: if end_vertex is
+                unreachable the distance is inf and the path is [end_vertex]
+                raises GraphError if one of the vertices is not in the graph
+        """
+        if not self.__graph.is_vertex(start_vertex) or not self.__graph.is_vertex(end_vertex):
+            raise GraphError("Vertex is not within the graph.")
+        if self.has_negative_costs():
+            shortest_path_tree = self.__bellman_ford_queue(start_vertex)
+            if shortest_path_tree is None:
+                return False
+            distance, predecessor = shortest_path_tree
+            return distance[end_vertex], find_path_from_predecessors(predecessor, end_vertex)
+        return self.__bidirectional_dijkstra(start_vertex, end_vertex)
+
+    def __bidirectional_dijkstra(self, start_vertex, end_vertex):
+        if start_vertex == end_vertex:
+            return 0, [start_vertex]
+        tie_breaker = count()
+        # Forward search from start_vertex, "predecessor" leads back to start_vertex
+        forward_distance = {start_vertex: 0}
+        predecessor = {start_vertex: None}
+        forward_heap = [(0, next(tie_breaker), start_vertex)]
+        # Backward search from end_vertex, "successor" leads forward to end_vertex
+        backward_distance = {end_vertex: 0}
+        successor = {end_vertex: None}
+        backward_heap = [(0, next(tie_breaker), end_vertex)]
+
+        best_distance = float('inf')
+        meeting_vertex = None
+        # No path through an unsettled vertex can cost less than the sum of the smallest keys of the two heaps
+        while forward_heap and backward_heap and forward_heap[0][0] + backward_heap[0][0] < best_distance:
+            if forward_heap[0][0] <= backward_heap[0][0]:
+                current_distance, _, vertex = heappop(forward_heap)
+                if current_distance > forward_distance[vertex]:
+                    continue
+                for next_vertex, cost in self.__graph.iterate_out_edge_costs(vertex):
+                    new_distance = current_distance + cost
+                    if new_distance < forward_distance.get(next_vertex, float('inf')):
+                        forward_distance[next_vertex] = new_distance
+                        predecessor[next_vertex] = vertex
+                        heappush(forward_heap, (new_distance, next(tie_breaker), next_vertex))
+                        if next_vertex in backward_distance and \
+                                new_distance + backward_distance[next_vertex] < best_distance:
+                            best_distance = new_distance + backward_distance[next_vertex]
+                            meeting_vertex = next_vertex
+            else:
+                current_distance, _, vertex = heappop(backward_heap)
+                if current_distance > backward_distance[vertex]:
+                    continue
+                for previous_vertex, cost in self.__graph.iterate_in_edge_costs(vertex):
+                    new_distance = current_distance + cost
+                    if new_distance < backward_distance.get(previous_vertex, float('inf')):
+                        backward_distance[previous_vertex] = new_distance
+                        successor[previous_vertex] = vertex
+                        heappush(backward_heap, (new_distance, next(tie_breaker), previous_vertex))
+                        if previous_vertex in forward_distance and \
+                                new_distance + forward_distance[previous_vertex] < best_distance:
+                            best_distance = new_distance + forward_distance[previous_vertex]
+                            meeting_vertex = previous_vertex
+
+        if meeting_vertex is None:
+            return float('inf'), [end_vertex]
+        path = find_path_from_predecessors(predecessor, meeting_vertex)
+        vertex = successor[meeting_vertex]
+        while vertex is not None:
+            path.append(vertex)
+            vertex = successor[vertex]
+        return best_distance, path
+
+    def __dijkstra(self, start_vertex):
+        vertices = self.__graph.parse_all_vertices()
+        distance = dict.fromkeys(vertices, float('inf'))
+        predecessor = dict.fromkeys(vertices, None)
+        distance[start_vertex] = 0
+        # The counter breaks ties between equal distances without comparing the vertices themselves
+        tie_breaker = count()
+        heap = [(0, next(tie_breaker), start_vertex)]
+        while heap:
+            current_distance, _, vertex = heappop(heap)
+            # Skip the stale heap entries of vertices that were already settled with a smaller distance
+            if current_distance > distance[vertex]:
+                continue
+            for successor, cost in self.__graph.iterate_out_edge_costs(vertex):
+                new_distance = current_distance + cost
+                if new_distance < distance[successor]:
+                    distance[successor] = new_distance
+                    predecessor[successor] = vertex
+                    heappush(heap, (new_distance, next(tie_breaker), successor))
+        return distance, predecessor
+
+    def __bellman_ford_queue(self, start_vertex):
+        distance, predecessor, negative_cycle = self.__bellman_ford_subtree_disassembly(start_vertex)
+        if negative_cycle is not None:
+            return None
+        return distance, predecessor
+
+    def find_negative_cycle(self, start_vertex=None):
+        """
+            Looks for a negative cycle reachable from start_vertex, or anywhere in the graph if start_vertex is None
+        :return: None if there is no such cycle
+                Else
+                the list of the vertices of the cycle in order: every vertex has an edge to the next one and the last
+                vertex has an edge back to the first one
+                raises GraphError if start_vertex is not in the graph
+        """
+        if start_vertex is not None and not self.__graph.is_vertex(start_vertex):
+            raise GraphError("Vertex is not within the graph.")
+        if not self.has_negative_costs():
+            return None
+        return self.__bellman_ford_subtree_disassembly(start_vertex)[2]
+
+    def __bellman_ford_subtree_disassembly(self, start_vertex):
+        """
+            Queue-based Bellman-Ford with Tarjan's subtree disassembly. Before a vertex v gets a new predecessor u, the
+        subtree of v in the current shortest path tree is taken apart: its vertices have distances computed through
+        the old, larger distance of v, so they are not scanned until they are improved again. If u itself is in that
+        subtree, the new edge closes a cycle of the tree whose cost is negative, and the search stops right away
+        instead of running for N rounds.
+        :param start_vertex: the root of the search, or None to start from all the vertices at distance 0 (as if from
+                            a virtual vertex with a 0 cost edge to each of them)
+        :return: the tuple (distance, predecessor, negative_cycle) where negative_cycle is None if no negative cycle
+                was found, or the list of its vertices otherwise (the distances are then meaningless)
+        """
+        vertices = self.__graph.parse_all_vertices()
+        predecessor = dict.fromkeys(vertices, None)
+        children = {vertex: set() for vertex in vertices}
+        if start_vertex is None:
+            distance = dict.fromkeys(vertices, 0)
+            queue = deque(vertices)
+        else:
+            distance = dict.fromkeys(vertices, float('inf'))
+            distance[start_vertex] = 0
+            queue = deque([start_vertex])
+        # Vertices waiting in the queue with a distance that is still worth scanning
+        active = set(queue)
+        while queue:
+            vertex = queue.popleft()
+            if vertex not in active:
+                continue
+            active.discard(vertex)
+            current_distance = distance[vertex]
+            for successor, cost in self.__graph.iterate_out_edge_costs(vertex):
+                if current_distance + cost >= distance[successor]:
+                    continue
+                if vertex == successor:
+                    # A negative loop on a single vertex
+                    return distance, predecessor, [vertex]
+                # Collect the subtree of the successor, looking for the vertex being scanned
+                subtree = list(children[successor])
+                index = 0
+                while index < len(subtree):
+                    if subtree[index] == vertex:
+                        cycle = [vertex]
+                        while cycle[-1] != successor:
+                            cycle.append(predecessor[cycle[-1]])
+                        cycle.reverse()
+                        return distance, predecessor, cycle
+                    subtree.extend(children[subtree[index]])
+                    index += 1
+                # Disassemble it
+                children[successor].clear()
+                for descendant in subtree:
+                    predecessor[descendant] = None
+                    children[descendant].clear()
+                    active.discard(descendant)
+                old_parent = predecessor[successor]
+                if old_parent is not None:
+                    children[old_parent].discard(successor)
+                distance[successor] = current_distance + cost
+                predecessor[successor] = vertex
+                children[vertex].add(successor)
+                if successor not in active:
+                    active.add(successor)
+                    queue.append(successor)
+        return distance, predecessor, None
+
+
+class ShortestPathTreeCache:
+    def __init__(self, max_cached_vertices: int = 1000000, max_tracked_start_vertices: int = 100000):
+        """
+            Creates an LRU cache of shortest path trees keyed by their start vertex
+
+        max_cached_vertices -> memory bound of the cache: the total number of vertices over all the cached trees.
+                                Every vertex of a tree costs one entry in the distance dict and one in the predecessor
+                                dict. Least recently used trees are evicted to stay under the bound.
+        max_tracked_start_vertices -> bound of queried_start_vertices, which is forgotten once it is reached
+        trees -> OrderedDict from the start vertex to its (distance, predecessor) tree, or to False if there is a
+                    negative cycle reachable from it; the most recently used tree is last
+        graph, graph_version -> the graph the trees were computed on and its version at that time; the cache is
+                    emptied as soon as it is used with another graph or after the graph changed
+        queried_start_vertices -> the start vertices queried without caching their tree since the graph changed (see
+                    is_repeated_start_vertex)
+        hits, misses -> the number of get calls that found the tree and that did not
+        computed_trees -> the number of trees computed and given to put, whether they fit in the cache or not
+        """
+        self.__max_cached_vertices = max_cached_vertices
+        self.__max_tracked_start_vertices = max_tracked_start_vertices
+        self.__trees = OrderedDict()
+        self.__cached_vertices = 0
+        self.__graph = None
+        self.__graph_version = None
+        self.__queried_start_vertices = set()
+        self.__hits = 0
+        self.__misses = 0
+        self.__computed_trees = 0
+        self.__evictions = 0
+        self.__invalidations = 0
+
+    def __check_graph(self, graph):
+        if graph is not self.__graph or graph.get_version() != self.__graph_version:
+            if self.__trees:
+                self.__invalidations += 1
+            self.clear()
+            self.__graph = graph
+            self.__graph_version = graph.get_version()
+
+    @staticmethod
+    def __tree_size(tree):
+        if tree is False:
+            return 1
+        return len(tree[0])
+
+    def get(self, graph, start_vertex):
+        """
+        :return: the cached (distance, predecessor) tree of start_vertex on the current version of the graph, False if
+                the start vertex reaches a negative cycle, or None if the tree is not cached
+        """
+        self.__check_graph(graph)
+        tree = self.__trees.get(start_vertex)
+        if tree is None:
+            self.__misses += 1
+            return None
+        self.__hits += 1
+        self.__trees.move_to_end(start_vertex)
+        return tree
+
+    def is_repeated_start_vertex(self, graph, start_vertex) -> bool:
+        """
+            Tells whether start_vertex was already queried on the current version of the graph, remembering it for the
+        next call. A single query is answered faster by a search that stops at the end vertex, so the caller only
+        computes and caches the whole tree once a start vertex comes back.
+        """
+        self.__check_graph(graph)
+        if start_vertex in self.__queried_start_vertices:
+            return True
+        if len(self.__queried_start_vertices) >= self.__max_tracked_start_vertices:
+            self.__queried_start_vertices.clear()
+        self.__queried_start_vertices.add(start_vertex)
+        return False
+
+    def put(self, graph, start_vertex, tree) -> None:
+        """
+            Caches the tree of start_vertex (False for a reachable negative cycle), evicting the least recently used
+        trees if the memory bound is exceeded. A tree larger than the whole bound is not cached.
+        """
+        self.__check_graph(graph)
+        self.__computed_trees += 1
+        size = self.__tree_size(tree)
+        if size > self.__max_cached_vertices:
+            return
+        if start_vertex in self.__trees:
+            self.__cached_vertices -= self.__tree_size(self.__trees.pop(start_vertex))
+        while self.__trees and self.__cached_vertices + size > self.__max_cached_vertices:
+            evicted_vertex, evicted_tree = self.__trees.popitem(last=False)
+            self.__cached_vertices -= self.__tree_size(evicted_tree)
+            self.__evictions += 1
+        self.__trees[start_vertex] = tree
+        self.__cached_vertices += size
+
+    def set_max_cached_vertices(self, max_cached_vertices: int) -> None:
+        self.__max_cached_vertices = max_cached_vertices
+        while self.__trees and self.__cached_vertices > self.__max_cached_vertices:
+            evicted_vertex, evicted_tree = self.__trees.popitem(last=False)
+            self.__cached_vertices -= self.__tree_size(evicted_tree)
+            self.__evictions += 1
+
+    def clear(self) -> None:
+        self.__trees.clear()
+        self.__queried_start_vertices.clear()
+        self.__cached_vertices = 0
+
+    def get_statistics(self) -> dict:
+        """
+        :return: a dict with the hits, misses, computed trees, evictions and invalidations so far, the hit rate, the
+                number of cached trees and the number of vertices they hold out of max_cached_vertices
+        """
+        lookups = self.__hits + self.__misses
+        return {
+            "hits": self.__hits,
+            "misses": self.__misses,
+            "hit_rate": self.__hits / lookups if lookups else 0.0,
+            "computed_trees": self.__computed_trees,
+            "evictions": self.__evictions,
+            "invalidations": self.__invalidations,
+            "cached_trees": len(self.__trees),
+            "cached_vertices": self.__cached_vertices,
+            "max_cached_vertices": self.__max_cached_vertices,
+        }
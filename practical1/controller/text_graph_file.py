@@ -0,0 +1,129 @@
+"""
+Fast writer for the text graph format of read_directed_graph, and transparent compression of graph files.
+
+write_text_graph builds the file in chunks of VERTICES_PER_CHUNK vertices, joined into one string per chunk, so there is
+one write call per chunk instead of one per edge. By default the edges are written without a header and every isolated
+vertex gets a line of its own. The "number_of_vertices number_of_edges" header is written only when it is asked for and
+the vertices are 0 .. number_of_vertices - 1, the only case the header format can describe.
+
+Files whose name ends in .gz are gzip compressed and files ending in .zst are zstd compressed, both when reading and
+when writing (see open_graph_file). zstd needs the zstandard package, gzip only the standard library.
+"""
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+
+from domain.compact_graph import CompactDirectedCostGraph
+from errors.exceptions import GraphError
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+VERTICES_PER_CHUNK = 4096
+# The default level of gzip, 9, takes twice as long to write a graph file and makes it hardly any smaller
+GZIP_LEVEL = 6
+
+# One thread, so that background writes happen one after the other, in the order they were started
+_background_writer = ThreadPoolExecutor(max_workers=1)
+
+
+def open_graph_file(file_path: str, mode: str = "rb"):
+    """
+        Opens a graph file like open does, compressing or decompressing it on the fly if its name ends in .gz or .zst
+    raises GraphError for a .zst file if zstandard is not installed
+    """
+    if file_path.endswith(".gz"):
+        return gzip.open(file_path, mode, compresslevel=GZIP_LEVEL)
+    if file_path.endswith(".zst"):
+        if zstandard is None:
+            raise GraphError("Reading or writing .zst files needs zstandard to be installed.")
+        return zstandard.open(file_path, mode)
+    return open(file_path, mode)
+
+
+def _edge_lines(graph, vertices, with_isolated_vertices: bool):
+    """
+        The lines of the edges going out of the vertices, for a graph that is not compact; if with_isolated_vertices is
+    True, isolated vertices get a line with just the vertex
+    """
+    lines = []
+    for vertex in vertices:
+        edge_costs = graph.parse_out_edge_costs(vertex)
+        if edge_costs:
+            prefix = f'{vertex} '
+            lines.extend([f'{prefix}{successor} {cost}' for successor, cost in edge_costs])
+        elif with_isolated_vertices and graph.get_in_degree(vertex) == 0:
+            lines.append(f'{vertex}')
+    return lines
+
+
+def _compact_edge_lines(graph: CompactDirectedCostGraph, first_index: int, last_index: int,
+                        with_isolated_vertices: bool):
+    """
+        The same lines as _edge_lines, for the vertices first_index .. last_index - 1 of a compact graph, read straight
+    from its CSR arrays
+    """
+    vertices, out_offsets, out_targets, out_costs, in_offsets, in_sources = graph.get_csr_arrays()
+    lines = []
+    for index in range(first_index, last_index):
+        vertex = index if vertices is None else vertices[index]
+        row_start = out_offsets[index]
+        row_end = out_offsets[index + 1]
+        if row_start != row_end:
+            prefix = f'{vertex} '
+            if vertices is None:
+                lines.extend([f'{prefix}{successor} {cost}' for successor, cost
+                              in zip(out_targets[row_start:row_end], out_costs[row_start:row_end])])
+            else:
+                lines.extend([f'{prefix}{vertices[successor]} {cost}' for successor, cost
+                              in zip(out_targets[row_start:row_end], out_costs[row_start:row_end])])
+        elif with_isolated_vertices and in_offsets[index] == in_offsets[index + 1]:
+            lines.append(f'{vertex}')
+    return lines
+
+
+def write_text_graph(graph, file_path: str, with_header: bool = False) -> bool:
+    """
+        Writes the graph in the text format of read_directed_graph, compressed if the file name ends in .gz or .zst
+    :param with_header: if True and the vertices are 0 .. number_of_vertices - 1, the file starts with the
+                        "number_of_vertices number_of_edges" line
+    :return: True if the header was written, False otherwise
+            raises GraphError for a .zst file if zstandard is not installed
+    """
+    number_of_vertices = graph.get_number_of_vertices()
+    is_compact = isinstance(graph, CompactDirectedCostGraph)
+    if is_compact:
+        vertices = graph.get_csr_arrays()[0]
+        is_dense = vertices is None
+    else:
+        vertices = graph.parse_all_vertices()
+        is_dense = all(index == vertex for index, vertex in enumerate(vertices))
+    with_header = with_header and is_dense
+
+    output_file = open_graph_file(file_path, "wt")
+    try:
+        if with_header:
+            output_file.write(f'{number_of_vertices} {graph.get_number_of_edges()}\n')
+        for first_index in range(0, number_of_vertices, VERTICES_PER_CHUNK):
+            last_index = min(first_index + VERTICES_PER_CHUNK, number_of_vertices)
+            # With the header, the isolated vertices need no line of their own
+            if is_compact:
+                lines = _compact_edge_lines(graph, first_index, last_index, not with_header)
+            else:
+                lines = _edge_lines(graph, vertices[first_index:last_index], not with_header)
+            if lines:
+                lines.append("")
+                output_file.write("\n".join(lines))
+    finally:
+        output_file.close()
+    return with_header
+
+
+def write_text_graph_in_background(graph, file_path: str, with_header: bool = False):
+    """
+        Starts writing a copy of the graph with write_text_graph on a background thread. The copy is copy on write
+    (see DirectedCostGraph.get_copy), so taking it is O(1) and the graph can be modified while the file is written.
+    :return: a concurrent.futures.Future whose result is the one of write_text_graph (result() raises its errors)
+    """
+    return _background_writer.submit(write_text_graph, graph.get_copy(), file_path, with_header)
@@ -0,0 +1,103 @@
+"""
+Level decomposition of a DAG.
+
+Kahn's algorithm removes the vertices without predecessors round by round; the vertices freed in the same round form
+a level. Level 0 holds the vertices without predecessors and every edge goes from a level to a strictly greater one, so
+    - the vertices of a level do not depend on each other and can be processed together (each level is an antichain)
+    - once all the levels before it are done, the values of a level only depend on finished vertices
+
+vectorized_earliest_start uses this to compute the earliest_start times of GraphController with NumPy: for every level
+the outbound edges of all its vertices are gathered into one slice of the CSR arrays and relaxed with a single
+np.maximum.at. NumPy is only needed by that function.
+"""
+from domain.compact_graph import CompactDirectedCostGraph
+from errors.exceptions import GraphError
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def topological_levels(graph):
+    """
+        Splits the vertices of the graph into levels, processing a whole Kahn frontier per round
+    :return: the list of levels (lists of vertices), or None if the graph has a cycle
+    """
+    in_degree = {vertex: graph.get_in_degree(vertex) for vertex in graph.iterate_all_vertices()}
+    level = [vertex for vertex, degree in in_degree.items() if degree == 0]
+    levels = []
+    number_of_sorted_vertices = 0
+    while level:
+        levels.append(level)
+        number_of_sorted_vertices += len(level)
+        next_level = []
+        for vertex in level:
+            for successor in graph.iterate_out_vertices(vertex):
+                in_degree[successor] -= 1
+                if in_degree[successor] == 0:
+                    next_level.append(successor)
+        level = next_level
+    if number_of_sorted_vertices != len(in_degree):
+        return None
+    return levels
+
+
+def get_antichain_width(levels) -> int:
+    """
+        The size of the widest level: that many vertices can be processed at the same time. Since every level is an
+    antichain, this is a lower bound of the width of the DAG.
+    """
+    return max(map(len, levels), default=0)
+
+
+def vectorized_earliest_start(graph):
+    """
+        Computes the levels and the earliest start times (the same as GraphController.earliest_start) of a DAG, one
+    level per batch of NumPy operations
+    :return: None if the graph has a cycle
+            Else
+            the tuple (levels, earliest) where levels is a list of lists of vertices and earliest a dict mapping every
+            vertex to its earliest time
+            raises GraphError if numpy is not installed
+    """
+    if numpy is None:
+        raise GraphError("The vectorized earliest start needs numpy to be installed.")
+    if not isinstance(graph, CompactDirectedCostGraph):
+        graph = CompactDirectedCostGraph.from_graph(graph)
+    vertices, out_offsets, out_targets, out_costs, in_offsets, in_sources = graph.get_csr_arrays()
+    number_of_vertices = graph.get_number_of_vertices()
+    out_offsets = numpy.asarray(out_offsets, dtype=numpy.int64)
+    out_targets = numpy.asarray(out_targets, dtype=numpy.int64)
+    out_costs = numpy.asarray(out_costs, dtype=numpy.int64)
+
+    in_degree = numpy.bincount(out_targets, minlength=number_of_vertices)
+    earliest = numpy.zeros(number_of_vertices, dtype=numpy.int64)
+    frontier = numpy.flatnonzero(in_degree == 0)
+    dense_levels = []
+    number_of_sorted_vertices = 0
+    while frontier.size:
+        dense_levels.append(frontier)
+        number_of_sorted_vertices += frontier.size
+        # The outbound edges of the level: row i of the CSR arrays is out_offsets[i] .. out_offsets[i + 1]
+        row_starts = out_offsets[frontier]
+        row_lengths = out_offsets[frontier + 1] - row_starts
+        number_of_edges = int(row_lengths.sum())
+        if number_of_edges == 0:
+            break
+        row_ends = numpy.cumsum(row_lengths)
+        positions = numpy.repeat(row_starts - row_ends + row_lengths, row_lengths) + numpy.arange(number_of_edges)
+        targets = out_targets[positions]
+        numpy.maximum.at(earliest, targets, numpy.repeat(earliest[frontier], row_lengths) + out_costs[positions])
+        numpy.subtract.at(in_degree, targets, 1)
+        candidates = numpy.unique(targets)
+        frontier = candidates[in_degree[candidates] == 0]
+    if number_of_sorted_vertices != number_of_vertices:
+        return None
+
+    if vertices is None:
+        levels = [level.tolist() for level in dense_levels]
+        return levels, dict(enumerate(earliest.tolist()))
+    vertex_ids = numpy.asarray(vertices, dtype=numpy.int64)
+    levels = [vertex_ids[level].tolist() for level in dense_levels]
+    return levels, dict(zip(vertex_ids.tolist(), earliest.tolist()))
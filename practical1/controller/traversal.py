@@ -0,0 +1,121 @@
+"""
+Lazy traversals of a graph (DirectedCostGraph or CompactDirectedCostGraph).
+
+Every traversal is a generator: vertices are produced as they are discovered, so the caller can stop iterating at any
+moment and the rest of the graph is never touched. The successors of a vertex are read through
+graph.iterate_out_vertices, which does not copy the adjacency of the vertex.
+
+breadth_first and depth_first yield (parent, vertex, depth) triples: (parent, vertex) is the edge through which the
+vertex was discovered (parent is None for the start vertex) and depth is the number of edges on that path. Both accept
+    max_depth -> vertices deeper than max_depth are not discovered
+    stop -> a predicate called as stop(vertex, depth) on every yielded vertex; the traversal ends right after the first
+            vertex it returns True for
+"""
+from collections import deque
+
+from errors.exceptions import GraphError
+
+
+def breadth_first(graph, start_vertex, max_depth=None, stop=None):
+    """
+        Breadth-first traversal from start_vertex: vertices are yielded in order of their distance in edges
+    raises GraphError if start_vertex is not in the graph
+    """
+    if not graph.is_vertex(start_vertex):
+        raise GraphError("Vertex is not within the graph.")
+    yield None, start_vertex, 0
+    if stop is not None and stop(start_vertex, 0):
+        return
+    visited = {start_vertex}
+    queue = deque([(start_vertex, 0)])
+    while queue:
+        vertex, depth = queue.popleft()
+        if max_depth is not None and depth >= max_depth:
+            continue
+        for successor in graph.iterate_out_vertices(vertex):
+            if successor not in visited:
+                visited.add(successor)
+                yield vertex, successor, depth + 1
+                if stop is not None and stop(successor, depth + 1):
+                    return
+                queue.append((successor, depth + 1))
+
+
+def depth_first(graph, start_vertex, max_depth=None, stop=None):
+    """
+        Iterative depth-first traversal from start_vertex: vertices are yielded in preorder, a vertex being yielded
+    before any vertex discovered through it. The path to the current vertex is kept as a stack of successor
+    iterators, so deep graphs do not hit the recursion limit.
+    With max_depth, a vertex may first be discovered through a path longer than its distance, which would cut off its
+    successors; such a vertex is expanded again (but not yielded again) whenever a shorter path reaches it, so every
+    vertex at most max_depth edges away is yielded.
+    raises GraphError if start_vertex is not in the graph
+    """
+    if not graph.is_vertex(start_vertex):
+        raise GraphError("Vertex is not within the graph.")
+    yield None, start_vertex, 0
+    if stop is not None and stop(start_vertex, 0):
+        return
+    # The depth of the shortest path found so far to every discovered vertex
+    depths = {start_vertex: 0}
+    stack = [(start_vertex, graph.iterate_out_vertices(start_vertex))]
+    while stack:
+        vertex, successors = stack[-1]
+        depth = len(stack)
+        if max_depth is not None and depth > max_depth:
+            stack.pop()
+            continue
+        for successor in successors:
+            if successor not in depths:
+                depths[successor] = depth
+                yield vertex, successor, depth
+                if stop is not None and stop(successor, depth):
+                    return
+                stack.append((successor, graph.iterate_out_vertices(successor)))
+                break
+            if max_depth is not None and depth < depths[successor]:
+                depths[successor] = depth
+                stack.append((successor, graph.iterate_out_vertices(successor)))
+                break
+        else:
+            stack.pop()
+
+
+def breadth_first_layers(graph, start_vertex, max_depth=None):
+    """
+        Breadth-first traversal that yields one list per layer: the vertices at distance 0 (only start_vertex),
+    then 1, 2, ... edges from start_vertex, up to max_depth
+    raises GraphError if start_vertex is not in the graph
+    """
+    if not graph.is_vertex(start_vertex):
+        raise GraphError("Vertex is not within the graph.")
+    visited = {start_vertex}
+    layer = [start_vertex]
+    depth = 0
+    while layer:
+        yield layer
+        if max_depth is not None and depth >= max_depth:
+            return
+        next_layer = []
+        for vertex in layer:
+            for successor in graph.iterate_out_vertices(vertex):
+                if successor not in visited:
+                    visited.add(successor)
+                    next_layer.append(successor)
+        layer = next_layer
+        depth += 1
+
+
+def is_reachable(graph, start_vertex, end_vertex, max_hops=None) -> bool:
+    """
+        Checks if there is a path of at most max_hops edges (of any length if max_hops is None) from start_vertex to
+    end_vertex. The breadth-first traversal stops as soon as end_vertex is discovered.
+    raises GraphError if one of the vertices is not in the graph
+    """
+    if not graph.is_vertex(end_vertex):
+        raise GraphError("Vertex is not within the graph.")
+    for parent, vertex, depth in breadth_first(graph, start_vertex, max_hops,
+                                               lambda discovered_vertex, depth: discovered_vertex == end_vertex):
+        if vertex == end_vertex:
+            return True
+    return False
@@ -0,0 +1,90 @@
+"""
+Bellman-Ford over NumPy edge arrays, for graphs with negative costs where Dijkstra can not be used.
+
+The edges are kept as three parallel arrays (src, dst, cost) and every relaxation round is a handful of array
+operations: the candidate distances of all the edges are computed at once and np.minimum.at scatters the smallest
+candidate of every vertex into the new distances. Rounds stop as soon as nothing changes; if distances still change in
+round N (N = number of vertices) there is a negative cycle reachable from the start vertex, exactly as in the
+original Bellman-Ford.
+
+NumPy is only needed when this module is used.
+"""
+from domain.compact_graph import CompactDirectedCostGraph
+from errors.exceptions import GraphError
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class EdgeArrays:
+    def __init__(self, graph):
+        """
+            Builds the src, dst and cost arrays of the graph, with vertices numbered by their dense index
+
+        vertices -> numpy array with the vertex id of every dense index
+        index -> dict from vertex id to dense index
+        """
+        if numpy is None:
+            raise GraphError("The vectorized Bellman-Ford needs numpy to be installed.")
+        if not isinstance(graph, CompactDirectedCostGraph):
+            graph = CompactDirectedCostGraph.from_graph(graph)
+        vertices, out_offsets, out_targets, out_costs, in_offsets, in_sources = graph.get_csr_arrays()
+        self.number_of_vertices = graph.get_number_of_vertices()
+        out_offsets = numpy.asarray(out_offsets, dtype=numpy.int64)
+        self.src = numpy.repeat(numpy.arange(self.number_of_vertices, dtype=numpy.int64), numpy.diff(out_offsets))
+        self.dst = numpy.asarray(out_targets, dtype=numpy.int64)
+        self.cost = numpy.asarray(out_costs, dtype=numpy.float64)
+        if vertices is None:
+            self.vertices = numpy.arange(self.number_of_vertices, dtype=numpy.int64)
+        else:
+            self.vertices = numpy.asarray(vertices, dtype=numpy.int64)
+        self.index = {vertex: position for position, vertex in enumerate(self.vertices.tolist())}
+
+    def bellman_ford(self, start_vertex):
+        """
+        :return: None if there is a negative cycle reachable from start_vertex
+                Else
+                the tuple (distance, predecessor) of numpy arrays indexed by dense vertex, where distance is inf for
+                unreachable vertices and predecessor is -1 for the start vertex and for unreachable vertices
+                raises GraphError if start_vertex is not in the graph
+        """
+        if start_vertex not in self.index:
+            raise GraphError("Vertex is not within the graph.")
+        distance = numpy.full(self.number_of_vertices, numpy.inf)
+        predecessor = numpy.full(self.number_of_vertices, -1, dtype=numpy.int64)
+        distance[self.index[start_vertex]] = 0
+        for i in range(self.number_of_vertices):
+            candidate = distance[self.src] + self.cost
+            new_distance = distance.copy()
+            numpy.minimum.at(new_distance, self.dst, candidate)
+            improved = new_distance < distance
+            if not improved.any():
+                return distance, predecessor
+            # The predecessor of an improved vertex is the start of any edge that produced its new distance
+            relaxing_edges = improved[self.dst] & (candidate == new_distance[self.dst])
+            predecessor[self.dst[relaxing_edges]] = self.src[relaxing_edges]
+            distance = new_distance
+        # Distances were still changing in round N
+        return None
+
+    def shortest_path(self, start_vertex, end_vertex):
+        """
+        :return: the same result as GraphController.shortest_path: False if there is a negative cycle reachable from
+                start_vertex, otherwise (distance, path), with (inf, [end_vertex]) if end_vertex is unreachable
+        """
+        if end_vertex not in self.index:
+            raise GraphError("Vertex is not within the graph.")
+        shortest_path_tree = self.bellman_ford(start_vertex)
+        if shortest_path_tree is None:
+            return False
+        distance, predecessor = shortest_path_tree
+        end = self.index[end_vertex]
+        if distance[end] == numpy.inf:
+            return float('inf'), [end_vertex]
+        path = [end]
+        while predecessor[path[-1]] != -1:
+            path.append(int(predecessor[path[-1]]))
+        path.reverse()
+        return int(distance[end]), self.vertices[path].tolist()
@@ -0,0 +1,339 @@
+"""
+Immutable, array-backed variant of DirectedCostGraph.
+
+The graph is kept in compressed sparse row form (CSR) for the outbound edges and in compressed sparse column form
+(CSC) for the inbound edges:
+
+    out_offsets[i] .. out_offsets[i + 1]  -> slice of out_targets / out_costs holding the successors of vertex i
+    in_offsets[i] .. in_offsets[i + 1]    -> slice of in_sources holding the predecessors of vertex i
+
+Vertices are stored internally by their dense index (0 .. n - 1). When the vertex ids of the graph are exactly
+0 .. n - 1 no translation table is kept at all, otherwise the "vertices" array maps a dense index back to its id.
+The successors of every vertex are sorted by dense index, so edge lookups are a binary search in the row.
+"""
+from array import array
+from bisect import bisect_left
+
+from errors.exceptions import GraphError
+
+ARRAY_TYPECODE = 'q'
+
+
+class CompactDirectedCostGraph:
+    def __init__(self, vertices, out_offsets, out_targets, out_costs, in_offsets, in_sources):
+        """
+            Creates a compact graph over already built CSR/CSC arrays. Use from_graph or from_edges to build one.
+
+        vertices -> sequence mapping a dense index to its vertex id, or None if the ids are 0 .. n - 1
+        out_offsets, out_targets, out_costs -> the CSR arrays of the outbound edges (targets are dense indices)
+        in_offsets, in_sources -> the CSC arrays of the inbound edges (sources are dense indices)
+
+        Any sequence of integers supporting len and indexing can be used (array, memoryview, ...).
+        """
+        self.__vertices = vertices
+        self.__out_offsets = out_offsets
+        self.__out_targets = out_targets
+        self.__out_costs = out_costs
+        self.__in_offsets = in_offsets
+        self.__in_sources = in_sources
+        self.__number_of_vertices = len(out_offsets) - 1
+        self.__index = None
+        if vertices is not None:
+            self.__index = {vertex: index for index, vertex in enumerate(vertices)}
+
+    @classmethod
+    def from_edges(cls, vertices, edge_starts, edge_ends, edge_costs):
+        """
+            Builds a compact graph from a list of vertex ids and three parallel sequences describing the edges.
+        Duplicate edges are dropped in a single batch step, keeping the first occurrence (like add_edge does).
+        :return: the new CompactDirectedCostGraph
+                raises GraphError if an edge uses a vertex that is not in the vertex list, or if a vertex id or a cost
+                does not fit in a 64 bit integer
+        """
+        vertices = list(vertices)
+        number_of_vertices = len(vertices)
+        try:
+            vertex_array = array(ARRAY_TYPECODE, vertices)
+        except (TypeError, OverflowError):
+            raise GraphError("Compact graphs need integer vertex ids.")
+        identity = vertices == list(range(number_of_vertices))
+        if identity:
+            starts = list(edge_starts)
+            ends = list(edge_ends)
+        else:
+            index = {vertex: position for position, vertex in enumerate(vertices)}
+            try:
+                starts = [index[vertex] for vertex in edge_starts]
+                ends = [index[vertex] for vertex in edge_ends]
+            except KeyError:
+                raise GraphError("Vertex is not within the graph.")
+        costs = list(edge_costs)
+        if starts and (min(starts) < 0 or max(starts) >= number_of_vertices
+                       or min(ends) < 0 or max(ends) >= number_of_vertices):
+            raise GraphError("Vertex is not within the graph.")
+
+        # Sort the edges by (start, end); the sort is stable so the first of any duplicates comes first
+        keys = [start * number_of_vertices + end for start, end in zip(starts, ends)]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+
+        out_offsets = array(ARRAY_TYPECODE, bytes(8 * (number_of_vertices + 1)))
+        out_targets = array(ARRAY_TYPECODE)
+        out_costs = array(ARRAY_TYPECODE)
+        in_degree = [0] * number_of_vertices
+        previous_key = None
+        try:
+            for edge in order:
+                if keys[edge] == previous_key:
+                    continue
+                previous_key = keys[edge]
+                out_offsets[starts[edge] + 1] += 1
+                out_targets.append(ends[edge])
+                out_costs.append(costs[edge])
+                in_degree[ends[edge]] += 1
+        except (TypeError, OverflowError):
+            raise GraphError("Compact graphs need integer edge costs.")
+        for vertex in range(number_of_vertices):
+            out_offsets[vertex + 1] += out_offsets[vertex]
+
+        # Counting sort of the edges by their end vertex gives the CSC arrays
+        in_offsets = array(ARRAY_TYPECODE, bytes(8 * (number_of_vertices + 1)))
+        for vertex in range(number_of_vertices):
+            in_offsets[vertex + 1] = in_offsets[vertex] + in_degree[vertex]
+        in_sources = array(ARRAY_TYPECODE, bytes(8 * len(out_targets)))
+        next_slot = list(in_offsets[:number_of_vertices])
+        for start in range(number_of_vertices):
+            for position in range(out_offsets[start], out_offsets[start + 1]):
+                end = out_targets[position]
+                in_sources[next_slot[end]] = start
+                next_slot[end] += 1
+
+        return cls(None if identity else vertex_array,
+                   out_offsets, out_targets, out_costs, in_offsets, in_sources)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+            Builds a compact copy of a DirectedCostGraph (or of any graph exposing the same read API)
+        """
+        edge_starts = []
+        edge_ends = []
+        edge_costs = []
+        for edge_start, edge_end in graph.parse_all_edges():
+            edge_starts.append(edge_start)
+            edge_ends.append(edge_end)
+            edge_costs.append(graph.get_edge_cost(edge_start, edge_end))
+        return cls.from_edges(graph.parse_all_vertices(), edge_starts, edge_ends, edge_costs)
+
+    def get_csr_arrays(self):
+        """
+        :return: the tuple (vertices, out_offsets, out_targets, out_costs, in_offsets, in_sources) backing the graph,
+                where vertices is None if the vertex ids are 0 .. n - 1
+        """
+        return (self.__vertices, self.__out_offsets, self.__out_targets, self.__out_costs,
+                self.__in_offsets, self.__in_sources)
+
+    def get_version(self):
+        """
+            The compact graph never changes, so its version is always 0
+        """
+        return 0
+
+    def __index_of(self, vertex):
+        """
+        :return: the dense index of the vertex or None if it is not in the graph
+        """
+        if self.__index is not None:
+            return self.__index.get(vertex)
+        if isinstance(vertex, int) and 0 <= vertex < self.__number_of_vertices:
+            return vertex
+        return None
+
+    def __vertex_at(self, index):
+        if self.__vertices is None:
+            return index
+        return self.__vertices[index]
+
+    def __checked_index_of(self, vertex):
+        index = self.__index_of(vertex)
+        if index is None:
+            raise GraphError("Vertex is not within the graph.")
+        return index
+
+    def __edge_position(self, edge_start, edge_end):
+        """
+        :return: the position of the edge in the out_targets / out_costs arrays or None if there is no such edge
+        """
+        start = self.__index_of(edge_start)
+        end = self.__index_of(edge_end)
+        if start is None or end is None:
+            return None
+        row_start = self.__out_offsets[start]
+        row_end = self.__out_offsets[start + 1]
+        position = bisect_left(self.__out_targets, end, row_start, row_end)
+        if position < row_end and self.__out_targets[position] == end:
+            return position
+        return None
+
+    def is_vertex(self, vertex):
+        return self.__index_of(vertex) is not None
+
+    def is_edge(self, edge_start, edge_end):
+        return self.__edge_position(edge_start, edge_end) is not None
+
+    def get_number_of_vertices(self):
+        return self.__number_of_vertices
+
+    def get_number_of_edges(self):
+        return len(self.__out_targets)
+
+    def parse_all_vertices(self):
+        if self.__vertices is None:
+            return list(range(self.__number_of_vertices))
+        return list(self.__vertices)
+
+    def parse_all_edges(self):
+        edges = []
+        for start in range(self.__number_of_vertices):
+            start_vertex = self.__vertex_at(start)
+            for position in range(self.__out_offsets[start], self.__out_offsets[start + 1]):
+                edges.append((start_vertex, self.__vertex_at(self.__out_targets[position])))
+        return edges
+
+    def parse_out_vertices(self, start_vertex):
+        start = self.__checked_index_of(start_vertex)
+        successors = self.__out_targets[self.__out_offsets[start]:self.__out_offsets[start + 1]]
+        return [self.__vertex_at(successor) for successor in successors]
+
+    def parse_in_vertices(self, end_vertex):
+        end = self.__checked_index_of(end_vertex)
+        predecessors = self.__in_sources[self.__in_offsets[end]:self.__in_offsets[end + 1]]
+        return [self.__vertex_at(predecessor) for predecessor in predecessors]
+
+    def iterate_all_vertices(self):
+        """
+            function returns an iterator over the vertices, without copying them
+            the compact graph can not be modified, so unlike in DirectedCostGraph its iterators need no guard
+        """
+        if self.__vertices is None:
+            return iter(range(self.__number_of_vertices))
+        return iter(self.__vertices)
+
+    def iterate_all_edges(self):
+        """
+            function returns an iterator over the (start, end) tuples of all edges, grouped by their start vertex
+        """
+        return ((self.__vertex_at(start), self.__vertex_at(self.__out_targets[position]))
+                for start in range(self.__number_of_vertices)
+                for position in range(self.__out_offsets[start], self.__out_offsets[start + 1]))
+
+    def iterate_out_vertices(self, start_vertex):
+        """
+            function returns an iterator over the successors of the vertex, reading its row of the CSR array through a
+            memoryview instead of copying it
+        """
+        start = self.__checked_index_of(start_vertex)
+        successors = memoryview(self.__out_targets)[self.__out_offsets[start]:self.__out_offsets[start + 1]]
+        if self.__vertices is None:
+            return iter(successors)
+        return map(self.__vertices.__getitem__, successors)
+
+    def iterate_in_vertices(self, end_vertex):
+        """
+            function returns an iterator over the predecessors of the vertex, without copying its row of the CSC array
+        """
+        end = self.__checked_index_of(end_vertex)
+        predecessors = memoryview(self.__in_sources)[self.__in_offsets[end]:self.__in_offsets[end + 1]]
+        if self.__vertices is None:
+            return iter(predecessors)
+        return map(self.__vertices.__getitem__, predecessors)
+
+    def iterate_out_edge_costs(self, vertex):
+        """
+            function returns an iterator over the (successor, cost) tuples of the edges going out of the vertex
+            raises GraphError if the vertex is not found in graph
+        """
+        start = self.__checked_index_of(vertex)
+        row_start = self.__out_offsets[start]
+        row_end = self.__out_offsets[start + 1]
+        return zip(self.iterate_out_vertices(vertex), memoryview(self.__out_costs)[row_start:row_end])
+
+    def iterate_in_edge_costs(self, vertex):
+        """
+            function returns an iterator over the (predecessor, cost) tuples of the edges coming into the vertex
+            raises GraphError if the vertex is not found in graph
+        """
+        return ((predecessor, self.get_edge_cost(predecessor, vertex))
+                for predecessor in self.iterate_in_vertices(vertex))
+
+    def parse_out_edge_costs(self, vertex):
+        """
+            function returns a list of (successor, cost) tuples for the edges going out of the specified vertex
+            raises GraphError if the vertex is not found in graph
+        """
+        start = self.__checked_index_of(vertex)
+        row_start = self.__out_offsets[start]
+        row_end = self.__out_offsets[start + 1]
+        successors = self.__out_targets[row_start:row_end]
+        costs = self.__out_costs[row_start:row_end]
+        if self.__vertices is None:
+            return list(zip(successors, costs))
+        return [(self.__vertices[successor], cost) for successor, cost in zip(successors, costs)]
+
+    def parse_in_edge_costs(self, vertex):
+        """
+            function returns a list of (predecessor, cost) tuples for the edges coming into the specified vertex
+            raises GraphError if the vertex is not found in graph
+        """
+        return [(predecessor, self.get_edge_cost(predecessor, vertex)) for predecessor in self.parse_in_vertices(vertex)]
+
+    def parse_out_edges(self, vertex):
+        """
+        function returns a list of tuples meaning the edges that are going out of the specified vertex
+        raises GraphError if the vertex is not found in graph
+        """
+        return [(vertex, successor) for successor in self.parse_out_vertices(vertex)]
+
+    def parse_in_edges(self, vertex):
+        """
+            function returns the list of inbound edges of the parameter "vertex" with the intent to be iterated upon
+            raises GraphError if the vertex is not found in graph
+        """
+        return [(predecessor, vertex) for predecessor in self.parse_in_vertices(vertex)]
+
+    def get_in_degree(self, vertex):
+        index = self.__checked_index_of(vertex)
+        return self.__in_offsets[index + 1] - self.__in_offsets[index]
+
+    def get_out_degree(self, vertex):
+        index = self.__checked_index_of(vertex)
+        return self.__out_offsets[index + 1] - self.__out_offsets[index]
+
+    def get_edge_cost(self, edge_start, edge_end):
+        position = self.__edge_position(edge_start, edge_end)
+        if position is None:
+            raise GraphError("Edge not in graph")
+        return self.__out_costs[position]
+
+    def get_copy(self):
+        """
+            The compact graph can not be modified, so sharing it is as good as copying it
+        """
+        return self
+
+    def add_vertex(self, new_vertex):
+        raise GraphError("The compact graph can not be modified.")
+
+    def add_edge(self, edge_start, edge_end, cost: int = 0):
+        raise GraphError("The compact graph can not be modified.")
+
+    def remove_vertex(self, vertex):
+        raise GraphError("The compact graph can not be modified.")
+
+    def remove_edge(self, edge_start, edge_end):
+        raise GraphError("The compact graph can not be modified.")
+
+    def modify_edge_cost(self, edge_start, edge_end, new_cost: int = 0):
+        raise GraphError("The compact graph can not be modified.")
+
+    def initialize_vertices(self, number_of_initial_vertices):
+        raise GraphError("The compact graph can not be modified.")
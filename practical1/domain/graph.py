@@ -22,25 +22,42 @@ Required operations:
         Think about the desirable behaviour of an Edge_property attached to the original graph, when a copy is made.
 
 """
-from errors.exceptions import GraphError
+import sys
 
-from copy import deepcopy
+from errors.exceptions import GraphError
 
 
 class DirectedCostGraph:
     def __init__(self):
         """
-            Creates a directed cost graph with 3 dictionaries that will be filled with data from the input file
+            Creates a directed cost graph with 2 dictionaries that will be filled with data from the input file
         from the specified path
 
-        dict_in -> dict that holds as key a vertex and as value a list of predecessor vertices
-        dict_out -> dict that holds as key a vertex and as value a list of successor vertices
-        dict_costs -> dict that holds as key a tuple containing the start and end of the edge and as value the edge's
-                    cost
+        dict_in -> dict that holds as key a vertex and as value a dict whose keys are the predecessor vertices
+                    (the values are unused, the dict is an insertion ordered set)
+        dict_out -> dict that holds as key a vertex and as value a dict that maps every successor vertex to the cost
+                    of the edge going to it
+        number_of_edges -> the number of edges currently in the graph
+        version -> counter increased by every change of the graph, so results computed from the graph can tell
+                    whether they are still up to date
+        is_shared -> True once the dicts of the graph are shared with a copy made by get_copy (copy on write)
+        owns_vertex_dicts -> whether dict_in and dict_out themselves belong only to this graph
+        owned_in, owned_out -> the vertices whose inner dicts belong only to this graph; only used while is_shared
+
+        Keeping the edges of every vertex in a dict makes membership, adding, removing and cost lookup O(1), while
+        iterating them still follows their insertion order.
         """
         self.__dict_in = {}
         self.__dict_out = {}
-        self.__dict_costs = {}
+        self.__number_of_edges = 0
+        self.__version = 0
+        self.__is_shared = False
+        self.__owns_vertex_dicts = True
+        self.__owned_in = set()
+        self.__owned_out = set()
+
+    def get_version(self):
+        return self.__version
 
     def is_vertex(self, vertex):
         if vertex in self.__dict_in or vertex in self.__dict_out:
@@ -53,13 +70,10 @@ class DirectedCostGraph:
         :return -> True if there is such an edge
                 -> False if there is not
         """
-        if not self.is_vertex(edge_start) or not self.is_vertex(edge_end):
-            return False
-        if edge_start not in self.__dict_in[edge_end]:
+        successors = self.__dict_out.get(edge_start)
+        if successors is None:
             return False
-        if edge_end not in self.__dict_out[edge_start]:
-            return False
-        return True
+        return edge_end in successors
 
     def add_vertex(self, new_vertex):
         """
@@ -69,32 +83,42 @@ class DirectedCostGraph:
         """
         if self.is_vertex(new_vertex):
             return False
-        self.__dict_in[new_vertex] = []
-        self.__dict_out[new_vertex] = []
+        self.__own_vertex_dicts()
+        self.__dict_in[new_vertex] = {}
+        self.__dict_out[new_vertex] = {}
+        if self.__is_shared:
+            self.__owned_in.add(new_vertex)
+            self.__owned_out.add(new_vertex)
+        self.__version += 1
         return True
 
     def add_edge(self, edge_start, edge_end, cost: int = 0):
         """
-        Updates the in and out dictionaries of the vertices of the edge and adds a new edge to the cost dict
+        Updates the in and out dictionaries of the vertices of the edge, storing the cost with the successor
         :return: True if we managed to add a new edge
                 False if the edge was already in the graph
                 GraphError if the vertices are not in the graph.
         """
-        if not self.is_vertex(edge_start) or not self.is_vertex(edge_end):
+        successors = self.__dict_out.get(edge_start)
+        predecessors = self.__dict_in.get(edge_end)
+        if successors is None or predecessors is None:
             raise GraphError("Vertex is not within the graph.")
-        if self.is_edge(edge_start, edge_end):
+        if edge_end in successors:
             return False
+        if self.__is_shared:
+            predecessors = self.__own_in(edge_end)
+            successors = self.__own_out(edge_start)
         # Add predecessor
-        self.__dict_in[edge_end].append(edge_start)
-        # Add successor
-        self.__dict_out[edge_start].append(edge_end)
-        # Add cost
-        self.__dict_costs[(edge_start, edge_end)] = cost
+        predecessors[edge_start] = None
+        # Add successor together with the cost
+        successors[edge_end] = cost
+        self.__number_of_edges += 1
+        self.__version += 1
         return True
 
     def remove_vertex(self, vertex):
         """
-        Modifies dict_in, dict_out, dict_costs such that the vertex is removed completely from the graph
+        Modifies dict_in, dict_out such that the vertex is removed completely from the graph
         :return: False if operation was unsuccessful or if there is no such vertex
                 True if we managed to remove the vertex and its side effects from the graph.
         """
@@ -102,46 +126,47 @@ class DirectedCostGraph:
             return False
         for predecessor in list(self.__dict_in[vertex]):
             self.remove_edge(predecessor, vertex)
-        self.__dict_in.pop(vertex)
         for successor in list(self.__dict_out[vertex]):
             self.remove_edge(vertex, successor)
+        self.__own_vertex_dicts()
+        self.__dict_in.pop(vertex)
         self.__dict_out.pop(vertex)
+        self.__owned_in.discard(vertex)
+        self.__owned_out.discard(vertex)
+        self.__version += 1
         return True
 
     def remove_edge(self, edge_start, edge_end):
         """
-        Modifies dict_in, dict_out, dict_costs such that the edge (edge_start, edge_end) is removed completely from the
-        graph
+        Modifies dict_in, dict_out such that the edge (edge_start, edge_end) is removed completely from the graph
         :param edge_start: the vertex where the edge starts
         :param edge_end: the vertex where the edge ends
         :return: False if the operation was unsuccessful or if there is no such edge
-                True if dict_int, dict_out and dict_costs were successfully modified such that the specified edge is
+                True if dict_int and dict_out were successfully modified such that the specified edge is
                          no longer in the graph
         """
         if not self.is_edge(edge_start, edge_end):
             return False
-        # if not edge_start in self.__dict_in[edge_end]:
-        #     return False
-        # if not edge_end in self.__dict_out[edge_start]:
-        #     return False
-        # if not (edge_start, edge_end) in self.__dict_costs.keys():
-        #     return False
-        self.__dict_in[edge_end].remove(edge_start)
-        self.__dict_out[edge_start].remove(edge_end)
-        self.__dict_costs.pop((edge_start, edge_end))
+        del self.__own_in(edge_end)[edge_start]
+        del self.__own_out(edge_start)[edge_end]
+        self.__number_of_edges -= 1
+        self.__version += 1
         return True
 
     def get_number_of_vertices(self):
         return len(self.__dict_in)
 
     def get_number_of_edges(self):
-        return len(self.__dict_costs)
+        return self.__number_of_edges
 
     def parse_all_vertices(self):
         return list(self.__dict_in.keys())
 
     def parse_all_edges(self):
-        return list(self.__dict_costs.keys())
+        """
+            function returns the list of all edges as (start, end) tuples, grouped by their start vertex
+        """
+        return [(edge_start, edge_end) for edge_start, successors in self.__dict_out.items() for edge_end in successors]
 
     def parse_out_vertices(self, start_vertex):
         return list(self.__dict_out[start_vertex])
@@ -149,6 +174,92 @@ class DirectedCostGraph:
     def parse_in_vertices(self, end_vertex):
         return list(self.__dict_in[end_vertex])
 
+    def __guarded(self, items):
+        """
+            Iterates the items of one of the dicts of the graph without copying them. Every time the caller asks for
+        the next item, the version of the graph is compared with the one the iteration started with.
+        raises GraphError if the graph was modified during the iteration
+        """
+        version = self.__version
+        for item in items:
+            yield item
+            if self.__version != version:
+                raise GraphError("The graph was modified during iteration.")
+
+    def iterate_all_vertices(self):
+        """
+            function returns an iterator over the vertices, without copying them
+            like all the iterate_* functions, the iterator raises GraphError if the graph is modified while it is used
+        """
+        return self.__guarded(self.__dict_in)
+
+    def iterate_all_edges(self):
+        """
+            function returns an iterator over the (start, end) tuples of all edges, grouped by their start vertex
+        """
+        version = self.__version
+        for edge_start, successors in self.__dict_out.items():
+            for edge_end in successors:
+                yield edge_start, edge_end
+                if self.__version != version:
+                    raise GraphError("The graph was modified during iteration.")
+
+    def iterate_out_vertices(self, start_vertex):
+        """
+            function returns an iterator over the successors of the vertex, without copying them
+        """
+        return self.__guarded(self.__dict_out[start_vertex])
+
+    def iterate_in_vertices(self, end_vertex):
+        """
+            function returns an iterator over the predecessors of the vertex, without copying them
+        """
+        return self.__guarded(self.__dict_in[end_vertex])
+
+    def iterate_out_edge_costs(self, vertex):
+        """
+            function returns an iterator over the (successor, cost) tuples of the edges going out of the vertex
+            raises GraphError if the vertex is not found in graph
+        """
+        if vertex not in self.__dict_out:
+            raise GraphError("Vertex is not within the graph.")
+        return self.__guarded(self.__dict_out[vertex].items())
+
+    def iterate_in_edge_costs(self, vertex):
+        """
+            function returns an iterator over the (predecessor, cost) tuples of the edges coming into the vertex
+            raises GraphError if the vertex is not found in graph
+        """
+        if vertex not in self.__dict_in:
+            raise GraphError("Vertex is not within the graph.")
+        return self.__guarded_in_edge_costs(vertex)
+
+    def __guarded_in_edge_costs(self, vertex):
+        version = self.__version
+        dict_out = self.__dict_out
+        for predecessor in self.__dict_in[vertex]:
+            yield predecessor, dict_out[predecessor][vertex]
+            if self.__version != version:
+                raise GraphError("The graph was modified during iteration.")
+
+    def parse_out_edge_costs(self, vertex):
+        """
+            function returns a list of (successor, cost) tuples for the edges going out of the specified vertex
+            raises GraphError if the vertex is not found in graph
+        """
+        if not self.is_vertex(vertex):
+            raise GraphError("Vertex is not within the graph.")
+        return list(self.__dict_out[vertex].items())
+
+    def parse_in_edge_costs(self, vertex):
+        """
+            function returns a list of (predecessor, cost) tuples for the edges coming into the specified vertex
+            raises GraphError if the vertex is not found in graph
+        """
+        if not self.is_vertex(vertex):
+            raise GraphError("Vertex is not within the graph.")
+        return [(predecessor, self.__dict_out[predecessor][vertex]) for predecessor in self.__dict_in[vertex]]
+
     def parse_out_edges(self, vertex):
         """
         function returns a list of tuples meaning the edges that are going out of the specified vertex
@@ -194,7 +305,7 @@ class DirectedCostGraph:
     def get_edge_cost(self, edge_start, edge_end):
         if not self.is_edge(edge_start, edge_end):
             raise GraphError("Edge not in graph")
-        return self.__dict_costs[(edge_start, edge_end)]
+        return self.__dict_out[edge_start][edge_end]
 
     def modify_edge_cost(self, edge_start, edge_end, new_cost: int = 0):
         """
@@ -203,15 +314,115 @@ class DirectedCostGraph:
         """
         if not self.is_edge(edge_start, edge_end):
             raise GraphError(f'There is no edge from {edge_start} to {edge_end}')
-        self.__dict_costs[(edge_start, edge_end)] = new_cost
+        self.__own_out(edge_start)[edge_end] = new_cost
+        self.__version += 1
+
+    def __own_vertex_dicts(self):
+        """
+            Copies dict_in and dict_out (but not the inner dicts they hold) if they are shared with a copy of the graph
+        """
+        if not self.__owns_vertex_dicts:
+            self.__dict_in = dict(self.__dict_in)
+            self.__dict_out = dict(self.__dict_out)
+            self.__owns_vertex_dicts = True
+
+    def __own_in(self, vertex):
+        """
+        :return: the dict of predecessors of the vertex, copied first if it is shared with a copy of the graph
+        """
+        if self.__is_shared and vertex not in self.__owned_in:
+            self.__own_vertex_dicts()
+            self.__dict_in[vertex] = dict(self.__dict_in[vertex])
+            self.__owned_in.add(vertex)
+        return self.__dict_in[vertex]
+
+    def __own_out(self, vertex):
+        """
+        :return: the dict of successors of the vertex, copied first if it is shared with a copy of the graph
+        """
+        if self.__is_shared and vertex not in self.__owned_out:
+            self.__own_vertex_dicts()
+            self.__dict_out[vertex] = dict(self.__dict_out[vertex])
+            self.__owned_out.add(vertex)
+        return self.__dict_out[vertex]
+
+    def __share(self):
+        self.__is_shared = True
+        self.__owns_vertex_dicts = False
+        self.__owned_in = set()
+        self.__owned_out = set()
 
     def get_copy(self):
-        return deepcopy(self)
+        """
+            Makes a copy of the graph in O(1): the copy shares all the dicts of the graph, and each of the two graphs
+        copies a dict only before modifying it for the first time (copy on write). The first change after a copy
+        duplicates dict_in and dict_out, which hold one reference per vertex; after that only the adjacency dicts of
+        the vertices that are changed get duplicated.
+        :return: the copy, which can be modified independently of the graph
+        """
+        copy = DirectedCostGraph()
+        copy.__dict_in = self.__dict_in
+        copy.__dict_out = self.__dict_out
+        copy.__number_of_edges = self.__number_of_edges
+        copy.__version = self.__version
+        self.__share()
+        copy.__share()
+        return copy
+
+    def get_unshared_size(self, other=None) -> int:
+        """
+            Estimates the memory used by the dicts of the graph, leaving out the dicts it shares with other
+        :param other: another DirectedCostGraph, usually a copy of this one, or None to count everything
+        :return: the size in bytes (the vertex ids and costs themselves are not counted)
+        """
+        size = 0
+        for own_dict, other_dict in ((self.__dict_in, other.__dict_in if other is not None else None),
+                                     (self.__dict_out, other.__dict_out if other is not None else None)):
+            if own_dict is other_dict:
+                continue
+            size += sys.getsizeof(own_dict)
+            for vertex, inner_dict in own_dict.items():
+                if other_dict is None or other_dict.get(vertex) is not inner_dict:
+                    size += sys.getsizeof(inner_dict)
+        return size
+
+    def load_edges(self, vertices, edge_starts, edge_ends, edge_costs):
+        """
+            Replaces the content of the graph in a single pass, without validating every edge on its own.
+        The endpoints of all the edges are validated in one batch step before anything is built, and duplicate edges
+        keep the cost of their first occurrence (like add_edge does).
+        :param vertices: iterable of all the vertex ids of the graph
+        :param edge_starts, edge_ends, edge_costs: parallel sequences describing the edges
+        :return: the number of duplicate edges that were dropped
+                raises GraphError if an edge uses a vertex that is not in the vertex list
+        """
+        dict_out = {vertex: {} for vertex in vertices}
+        if not dict_out.keys() >= set(edge_starts) or not dict_out.keys() >= set(edge_ends):
+            raise GraphError("Vertex is not within the graph.")
+        dict_in = {vertex: {} for vertex in dict_out}
+        for edge_start, edge_end, cost in zip(edge_starts, edge_ends, edge_costs):
+            dict_out[edge_start].setdefault(edge_end, cost)
+            dict_in[edge_end][edge_start] = None
+        self.__dict_in = dict_in
+        self.__dict_out = dict_out
+        # All the dicts were just built, so none of them is shared any more
+        self.__is_shared = False
+        self.__owns_vertex_dicts = True
+        self.__owned_in = set()
+        self.__owned_out = set()
+        self.__number_of_edges = sum(map(len, dict_out.values()))
+        self.__version += 1
+        return len(edge_starts) - self.__number_of_edges
 
     def initialize_vertices(self, number_of_initial_vertices):
+        self.__own_vertex_dicts()
         for i in range(0, number_of_initial_vertices):
-            self.__dict_in[i] = []
-            self.__dict_out[i] = []
+            self.__dict_in[i] = {}
+            self.__dict_out[i] = {}
+            if self.__is_shared:
+                self.__owned_in.add(i)
+                self.__owned_out.add(i)
+        self.__version += 1
 
 
 if __name__ == "__main__":
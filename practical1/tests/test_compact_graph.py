@@ -0,0 +1,15 @@
+import pytest
+
+from domain.compact_graph import CompactDirectedCostGraph
+from errors.exceptions import GraphError
+
+
+@pytest.mark.parametrize("vertices", [["a", "b"], [0, 1 << 64]], ids=["str ids", "ids beyond int64"])
+def test_from_edges_rejects_vertex_ids_that_are_not_int64(vertices):
+    with pytest.raises(GraphError, match="integer vertex ids"):
+        CompactDirectedCostGraph.from_edges(vertices, [vertices[0]], [vertices[1]], [5])
+
+
+def test_from_edges_rejects_costs_that_are_not_int64():
+    with pytest.raises(GraphError, match="integer edge costs"):
+        CompactDirectedCostGraph.from_edges([0, 1], [0], [1], [2.5])
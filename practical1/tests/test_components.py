@@ -0,0 +1,14 @@
+from controller.graph_controller import GraphController
+from domain.graph import DirectedCostGraph
+
+
+def test_subgraphs_of_directed_graph_cover_every_vertex_and_edge():
+    """
+        The components of a graph read as directed used to follow the outbound edges only, so get_subgraph copied edges
+    into vertices of other components and raised GraphError
+    """
+    controller = GraphController(DirectedCostGraph())
+    controller.read_directed_graph("data/graph1k.txt")
+    subgraphs = controller.connected_components_BFS()
+    assert sum(subgraph.get_number_of_vertices() for subgraph in subgraphs) == controller.get_number_of_vertices()
+    assert sum(subgraph.get_number_of_edges() for subgraph in subgraphs) == controller.get_number_of_edges()
@@ -0,0 +1,18 @@
+from controller.graph_controller import GraphController
+from domain.graph import DirectedCostGraph
+
+
+def test_added_edge_makes_negative_cycle_reachable_from_maintained_tree():
+    """
+        Adding 0 -> 1 makes the negative cycle 2 -> 3 -> 2 reachable from the maintained tree of 0; the cycle does not
+    go through the end of the new edge nor through 0, and used to make add_edge loop forever
+    """
+    graph = DirectedCostGraph()
+    graph.initialize_vertices(4)
+    controller = GraphController(graph)
+    for edge_start, edge_end, cost in [(1, 2, 1), (2, 3, -5), (3, 2, 1)]:
+        controller.add_edge(edge_start, edge_end, cost)
+    assert controller.maintain_shortest_paths_from(0)
+    assert controller.add_edge(0, 1, 1)
+    assert controller.shortest_path(0, 3) is False
+    assert controller.shortest_paths_from(0) is False
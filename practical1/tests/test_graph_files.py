@@ -0,0 +1,20 @@
+import pytest
+
+from controller.graph_controller import GraphController
+from errors.exceptions import GraphError
+
+
+@pytest.mark.parametrize("contents", [
+    "3 2\n0 1 5\n1 x 7\n",
+    "3 3\n0 1 5\n1 2 7\n",
+    "0 1 5\n1 2 7.5\n2\n",
+], ids=["value not an integer", "fewer edges than the header", "cost not an integer"])
+def test_malformed_graph_file_is_rejected(tmp_path, contents):
+    """
+        A value that is not an integer used to end the parsing of the file there, so the graph silently lost the edges
+    after it (or raised a plain ValueError, depending on the version of numpy)
+    """
+    file_path = tmp_path / "graph.txt"
+    file_path.write_text(contents)
+    with pytest.raises(GraphError):
+        GraphController.parse_directed_graph_file(str(file_path))
@@ -0,0 +1,52 @@
+import pytest
+
+from controller.graph_controller import GraphController
+from domain.graph import DirectedCostGraph
+from errors.exceptions import GraphError
+
+
+def build_controller(number_of_vertices, edges) -> GraphController:
+    graph = DirectedCostGraph()
+    graph.initialize_vertices(number_of_vertices)
+    controller = GraphController(graph)
+    for edge_start, edge_end, cost in edges:
+        controller.add_edge(edge_start, edge_end, cost)
+    return controller
+
+
+def test_journal_statistics_after_revert_describe_reverted_graph():
+    """
+        The journal statistics used to describe the previous graph after a revert, while undo returned False
+    """
+    controller = build_controller(3, [(0, 1, 5)])
+    controller.make_graph_copy()
+    controller.add_edge(1, 2, 7)
+    assert controller.get_journal_statistics() == (2, 0)
+    controller.revert_to_last_copy()
+    assert controller.get_journal_statistics() == (0, 0)
+    assert not controller.undo()
+
+
+def test_journal_statistics_after_read_describe_read_graph():
+    controller = build_controller(3, [(0, 1, 5)])
+    controller.read_directed_graph("data/input.txt")
+    assert controller.get_journal_statistics() == (0, 0)
+
+
+def test_journal_file_replay_stops_at_replaced_graph(tmp_path):
+    """
+        The journal file used to go on recording after the graph was replaced, so replaying it on the graph it was
+    started on silently mixed the changes of both graphs
+    """
+    journal_path = str(tmp_path / "journal.txt")
+    controller = build_controller(3, [])
+    controller.start_journal_file(journal_path)
+    controller.add_edge(0, 1, 5)
+    controller.read_directed_graph("data/test.txt")
+    controller.add_vertex(104)
+    controller.stop_journal_file()
+    replayed_controller = build_controller(3, [])
+    with pytest.raises(GraphError):
+        replayed_controller.replay_journal_file(journal_path)
+    assert replayed_controller.get_number_of_vertices() == 3
+    assert replayed_controller.get_number_of_edges() == 1
@@ -0,0 +1,29 @@
+from controller.graph_controller import GraphController
+from domain.graph import DirectedCostGraph
+
+
+def test_repeated_start_vertex_hits_cache():
+    """
+        On graphs without negative costs every query used to run the point-to-point search without caching anything,
+    so repeated queries from the same start vertex never hit the cache
+    """
+    controller = GraphController(DirectedCostGraph())
+    controller.read_directed_graph("data/graph1k.txt")
+    distances = [controller.shortest_path(1, end_vertex)[0] for end_vertex in (100, 200, 300, 100)]
+    statistics = controller.get_shortest_path_cache_statistics()
+    assert distances[0] == distances[3] == 141
+    assert statistics["hits"] == 2
+    assert statistics["computed_trees"] == 1
+
+
+def test_every_query_not_answered_from_cache_is_a_miss():
+    """
+        Misses used to be counted only when a tree was stored, so the first query from a start vertex, answered by the
+    point-to-point search, counted nothing
+    """
+    controller = GraphController(DirectedCostGraph())
+    controller.read_directed_graph("data/graph1k.txt")
+    controller.shortest_path(1, 100)
+    controller.shortest_path(100, 1)
+    statistics = controller.get_shortest_path_cache_statistics()
+    assert statistics["misses"] == 2 and statistics["hits"] == 0
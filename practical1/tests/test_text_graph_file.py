@@ -0,0 +1,34 @@
+import os
+import tempfile
+
+from controller.graph_controller import GraphController
+from domain.graph import DirectedCostGraph
+
+
+def write_and_read_lines(controller, **options):
+    folder = tempfile.mkdtemp()
+    file_path = os.path.join(folder, "graph.txt")
+    try:
+        controller.write_graph_data(file_path, **options)
+        graph_file = open(file_path, "rt")
+        lines = graph_file.read().splitlines()
+        graph_file.close()
+    finally:
+        os.remove(file_path)
+        os.rmdir(folder)
+    return lines
+
+
+def build_controller() -> GraphController:
+    graph = DirectedCostGraph()
+    graph.initialize_vertices(3)
+    graph.add_edge(0, 1, 5)
+    return GraphController(graph)
+
+
+def test_write_graph_data_writes_no_header_by_default():
+    assert write_and_read_lines(build_controller()) == ["0 1 5", "2"]
+
+
+def test_write_graph_data_writes_header_when_asked():
+    assert write_and_read_lines(build_controller(), with_header=True) == ["3 1", "0 1 5"]
@@ -0,0 +1,27 @@
+import pytest
+
+from controller.graph_controller import GraphController
+from domain.graph import DirectedCostGraph
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@pytest.mark.skipif(numpy is None, reason="numpy is not installed")
+def test_vectorized_earliest_start_follows_graph_changes():
+    """
+        The compact copy used by earliest_start_vectorized is kept between calls; it must be made again once the graph
+    changes, or the earliest times of the old graph are returned
+    """
+    graph = DirectedCostGraph()
+    graph.initialize_vertices(4)
+    controller = GraphController(graph)
+    controller.add_edge(0, 1, 2)
+    controller.add_edge(1, 2, 3)
+    assert controller.earliest_start_vectorized() == controller.earliest_start()
+    controller.add_edge(0, 3, 1)
+    controller.add_edge(3, 2, 9)
+    assert controller.earliest_start_vectorized() == controller.earliest_start()
+    assert controller.get_antichain_width() == 2
@@ -0,0 +1,21 @@
+from controller.traversal import breadth_first, depth_first
+from domain.graph import DirectedCostGraph
+
+
+def build_graph(number_of_vertices, edges) -> DirectedCostGraph:
+    graph = DirectedCostGraph()
+    graph.initialize_vertices(number_of_vertices)
+    for edge_start, edge_end in edges:
+        graph.add_edge(edge_start, edge_end, 1)
+    return graph
+
+
+def test_depth_first_with_max_depth_expands_vertex_reached_by_shorter_path():
+    """
+        2 is first discovered through 0 -> 1 -> 2, at the depth limit; 0 -> 2 -> 3 is two edges long, so 3 must still
+    be found
+    """
+    graph = build_graph(4, [(0, 1), (1, 2), (2, 3), (0, 2)])
+    vertices = [vertex for parent, vertex, depth in depth_first(graph, 0, max_depth=2)]
+    assert sorted(vertices) == [0, 1, 2, 3]
+    assert sorted(vertices) == sorted(vertex for parent, vertex, depth in breadth_first(graph, 0, max_depth=2))
@@ -1,3 +1,4 @@
+from controller.batch_runner import run_query_file
 from controller.graph_controller import GraphController
 from errors.exceptions import GraphError, VertexNotIntegerError, EdgeInputError
 
@@ -6,15 +7,30 @@ class ConsoleUI:
     def __init__(self, graph_controller: GraphController):
         self.EXIT = '0'
         self.__graph_controller = graph_controller
+        self.__background_writes = []
 
     def start(self):
         while True:
+            self.report_background_writes()
             self.print_menu()
             user_option = self.read_general_user_input()
             if user_option == self.EXIT:
                 return
             self.interpret_user_option(user_option)
 
+    def report_background_writes(self):
+        """
+            Prints the outcome of the background writes that finished since the last call
+        """
+        finished_writes = [(file_path, write) for file_path, write in self.__background_writes if write.done()]
+        for file_path, write in finished_writes:
+            self.__background_writes.remove((file_path, write))
+            try:
+                write.result()
+                print(f'Graph written successfully to {file_path}')
+            except (GraphError, OSError) as error:
+                print(f'Could not write {file_path}: {error}')
+
     @staticmethod
     def read_general_user_input():
         return input("> ")
@@ -38,6 +54,18 @@ class ConsoleUI:
             raise EdgeInputError(VertexError)
         return edge_start, edge_end
 
+    def with_activity_names(self, vertices):
+        """
+            Replaces the vertices of an activity network with the names of their activities, for printing
+        :param vertices: a list of vertices or a dict whose keys are vertices
+        """
+        names = self.__graph_controller.get_activity_names()
+        if names is None:
+            return vertices
+        if isinstance(vertices, dict):
+            return {names[vertex]: value for vertex, value in vertices.items()}
+        return [names[vertex] for vertex in vertices]
+
     @staticmethod
     def print_menu():
         print("\nMenu:")
@@ -61,12 +89,30 @@ class ConsoleUI:
         print("\t18. Revert graph to last copy")
         print("\t19. Show the connected components of an UNDIRECTED graph")
         print("\t20. Show the minimum cost path between 2 given vertices")
-        print("\t21. Write the lowest cost walks from between 2 given vertices in graph 1k,10k,100k.")
+        print("\t21. Write the lowest cost walks between 2 given vertices in graph 1k,10k,100k.")
         print("\t22. Check if DAG")
         print("\t23. Earliest start")
         print("\t24. Latest start")
         print("\t25. Critical path")
         print("\t26. Read activities")
+        print("\t27. Read directed graph from file as a compact read-only graph")
+        print("\t28. Make the current graph compact and read-only")
+        print("\t29. Write the current graph to a binary file")
+        print("\t30. Read graph from a binary file")
+        print("\t31. Show shortest path cache statistics")
+        print("\t32. Count the connected components of an UNDIRECTED graph file without reading it")
+        print("\t33. Show the strongly connected components of a directed graph")
+        print("\t34. Replace current graph with its condensation (one vertex per strongly connected component)")
+        print("\t35. Check if a vertex can be reached from another within a number of edges")
+        print("\t36. Show the copies of the graph that can be reverted to")
+        print("\t37. Undo the last change")
+        print("\t38. Redo the last undone change")
+        print("\t39. Save every following change to a journal file")
+        print("\t40. Replay a journal file on the current graph")
+        print("\t41. Show the schedule: duration, slack of every vertex and critical path")
+        print("\t42. Show the topological levels and the width of the widest one")
+        print("\t43. Replace current graph with a random undirected graph")
+        print("\t44. Answer a file of shortest path queries over many graphs")
         print("\t0. EXIT")
 
     def interpret_user_option(self, user_option):
@@ -96,6 +142,24 @@ class ConsoleUI:
         LATEST_START = '24'
         CRITICAL_PATH = '25'
         READ_ACTIVITIES = '26'
+        READ_COMPACT_GRAPH = '27'
+        MAKE_GRAPH_COMPACT = '28'
+        WRITE_BINARY_GRAPH = '29'
+        READ_BINARY_GRAPH = '30'
+        SHORTEST_PATH_CACHE_STATISTICS = '31'
+        COUNT_COMPONENTS_IN_FILE = '32'
+        STRONGLY_CONNECTED_COMPONENTS = '33'
+        CONDENSE_GRAPH = '34'
+        REACHABILITY = '35'
+        SHOW_SNAPSHOTS = '36'
+        UNDO = '37'
+        REDO = '38'
+        START_JOURNAL_FILE = '39'
+        REPLAY_JOURNAL_FILE = '40'
+        SCHEDULE = '41'
+        TOPOLOGICAL_LEVELS = '42'
+        RANDOM_UNDIRECTED_GRAPH = '43'
+        BATCH_QUERIES = '44'
 
         if user_option == GET_VERTICES:
             print(f'The number of vertices is: {self.__graph_controller.get_number_of_vertices()}')
@@ -185,20 +249,26 @@ class ConsoleUI:
             except VertexNotIntegerError as VertexError:
                 print(VertexError)
                 return
-            if self.__graph_controller.add_vertex(new_vertex):
-                print("Vertex added successfully.")
-            else:
-                print("Vertex already in graph.")
+            try:
+                if self.__graph_controller.add_vertex(new_vertex):
+                    print("Vertex added successfully.")
+                else:
+                    print("Vertex already in graph.")
+            except GraphError as GE:
+                print(GE)
         elif user_option == REMOVE_VERTEX:
             try:
                 vertex_to_remove = self.read_user_input_vertex()
             except VertexNotIntegerError as VertexError:
                 print(VertexError)
                 return
-            if self.__graph_controller.remove_vertex(vertex_to_remove):
-                print(f"Vertex {vertex_to_remove} was successfully removed.")
-            else:
-                print(f'Could not remove vertex {vertex_to_remove}.')
+            try:
+                if self.__graph_controller.remove_vertex(vertex_to_remove):
+                    print(f"Vertex {vertex_to_remove} was successfully removed.")
+                else:
+                    print(f'Could not remove vertex {vertex_to_remove}.')
+            except GraphError as GE:
+                print(GE)
         elif user_option == ADD_EDGE:
             try:
                 edge = self.read_user_input_edge()
@@ -228,23 +298,38 @@ class ConsoleUI:
                 return
             edge_start = edge[0]
             edge_end = edge[1]
-            if self.__graph_controller.remove_edge(edge_start, edge_end):
-                print(f'Edge {edge} removed successfully.')
-            else:
-                print(f'Edge {edge} could not be removed.')
-        elif user_option == RANDOM_GRAPH:
+            try:
+                if self.__graph_controller.remove_edge(edge_start, edge_end):
+                    print(f'Edge {edge} removed successfully.')
+                else:
+                    print(f'Edge {edge} could not be removed.')
+            except GraphError as GE:
+                print(GE)
+        elif user_option == RANDOM_GRAPH or user_option == RANDOM_UNDIRECTED_GRAPH:
             try:
                 print("number of vertices: ")
                 number_of_vertices = int(self.read_general_user_input())
                 print("number of edges: ")
                 number_of_edges = int(self.read_general_user_input())
-                self.__graph_controller.random_directed_graph(number_of_vertices, number_of_edges)
+                print("seed (empty for a random one): ")
+                seed = self.read_general_user_input()
+                seed = int(seed) if seed else None
+                if user_option == RANDOM_GRAPH:
+                    randomized = self.__graph_controller.random_directed_graph(number_of_vertices, number_of_edges,
+                                                                               seed=seed)
+                else:
+                    randomized = self.__graph_controller.random_undirected_graph(number_of_vertices, number_of_edges,
+                                                                                 seed=seed)
             except ValueError:
-                print("Number of vertices and edges must be a number")
+                print("Number of vertices, edges and the seed must be numbers")
+                return
             except GraphError as GE:
                 print(GE)
                 return
-            print("Graph successfully randomized.")
+            if randomized:
+                print("Graph successfully randomized.")
+            else:
+                print("Too many edges for that number of vertices.")
         elif user_option == READ_GRAPH:
             print("File location from parent folder(default for default location): ")
             file_path = self.read_general_user_input()
@@ -263,22 +348,30 @@ class ConsoleUI:
                 file_path = "data/output.txt"
             if file_path.lower() == "default":
                 file_path = "data/input.txt"
-            self.__graph_controller.write_graph_data(file_path)
-            print(f'Graph written successfully to {file_path}')
+            try:
+                write = self.__graph_controller.write_graph_data(file_path, in_background=True)
+            except GraphError as GE:
+                print(GE)
+                return
+            self.__background_writes.append((file_path, write))
+            print(f'Writing the graph to {file_path} in the background (.gz or .zst names are compressed)')
         elif user_option == COPY_GRAPH:
             if self.__graph_controller.make_graph_copy():
                 print("Successfully copied graph.")
+                return
+            print("The graph is read-only, there is no need to copy it.")
         elif user_option == REVERT_TO_LAST_COPY:
             if self.__graph_controller.revert_to_last_copy():
                 print("Successfully reverted graph to last copy.")
                 return
             print("Could not revert graph.")
         elif user_option == CONNECTED_COMPONENTS_BFS:
-            list_of_connected_components = self.__graph_controller.connected_components_BFS()
-            for i in range(len(list_of_connected_components)):
-                print(f'Connected component {i + 1}: {list_of_connected_components[i].parse_all_vertices()}')
-                for vertex in list_of_connected_components[i].parse_all_vertices():
-                    print(list_of_connected_components[i].parse_out_edges(vertex))
+            connected_components = self.__graph_controller.connected_components()
+            for i in range(connected_components.get_number_of_components()):
+                component_vertices = connected_components.get_component_vertices(i)
+                print(f'Connected component {i + 1}: {component_vertices}')
+                for vertex in component_vertices:
+                    print(self.__graph_controller.get_outbound_edges(vertex))
         elif user_option == READ_UNDIRECTED_GRAPH:
             print("File location from parent folder(default for default location): ")
             file_path = self.read_general_user_input()
@@ -306,6 +399,10 @@ class ConsoleUI:
             returned = self.__graph_controller.shortest_path(start_vertex, end_vertex)
             if not returned:
                 print("There exists a negative cycle!")
+                negative_cycle = self.__graph_controller.find_negative_cycle(start_vertex)
+                cycle_edges = zip(negative_cycle, negative_cycle[1:] + negative_cycle[:1])
+                print(f'Cycle: {" --> ".join(str(vertex) for vertex in negative_cycle + negative_cycle[:1])}')
+                print(f'Cost: {sum(self.__graph_controller.get_edge_cost(*edge) for edge in cycle_edges)}')
                 return
             distance, path = returned
             if len(path) == 1:
@@ -314,67 +411,222 @@ class ConsoleUI:
                 print(f'Distance: {distance}')
                 print(f'Path: {path}')
         elif user_option == LOWEST_COST_WALKS_BIG_GRAPHS:
-            start_vertex = int(input("Start vertex: "))
-            end_vertex = int(input("End vertex: "))
+            try:
+                start_vertex = int(input("Start vertex: "))
+                end_vertex = int(input("End vertex: "))
+            except ValueError:
+                print("The vertices must be integers")
+                return
+            lines = []
+            for graph_name in ["Graph1k", "Graph10k", "Graph100k"]:
+                file_path = f'data/{graph_name.lower()}.txt'
+                try:
+                    self.__graph_controller.read_directed_graph(file_path)
+                except (OSError, GraphError) as error:
+                    lines.append(f'{graph_name}: could not be read: {error}')
+                    continue
+                for walk_start, walk_end, separator in [(start_vertex, end_vertex, ',  path:'),
+                                                        (end_vertex, start_vertex, ', path: ')]:
+                    try:
+                        returned = self.__graph_controller.shortest_path(walk_start, walk_end)
+                    except GraphError as error:
+                        lines.append(f'{graph_name} {walk_start} to {walk_end}: {error}')
+                        continue
+                    if returned is False:
+                        lines.append(f'{graph_name} {walk_start} to {walk_end}: negative cycle')
+                        continue
+                    distance, path = returned
+                    lines.append(f'{graph_name} {walk_start} to {walk_end}: distance: {distance}{separator}{path}')
             write_file = open("data/lowest-cost-walks.txt", "wt")
-
-            # Graph 1k
-            self.__graph_controller.read_directed_graph("data/graph1k.txt")
-            distance, path = self.__graph_controller.shortest_path(start_vertex, end_vertex)
-            write_file.write(f'Graph1k {start_vertex} to {end_vertex}: distance: {distance},  path:{path}')
-            distance, path = self.__graph_controller.shortest_path(end_vertex, start_vertex)
-            write_file.write(f'\nGraph1k {end_vertex} to {start_vertex}: distance: {distance}, path: {path}')
-
-            # Graph 10k
-            self.__graph_controller.read_directed_graph("data/graph10k.txt")
-            distance, path = self.__graph_controller.shortest_path(start_vertex, end_vertex)
-            write_file.write(f'\nGraph10k {start_vertex} to {end_vertex}: distance: {distance},  path:{path}')
-            distance, path = self.__graph_controller.shortest_path(end_vertex, start_vertex)
-            write_file.write(f'\nGraph10k {end_vertex} to {start_vertex}: distance: {distance}, path: {path}')
-
-            # Graph 100k
-            self.__graph_controller.read_directed_graph("data/graph100k.txt")
-            distance, path = self.__graph_controller.shortest_path(start_vertex, end_vertex)
-            write_file.write(f'\nGraph100k {start_vertex} to {end_vertex}: distance: {distance},  path:{path}')
-            distance, path = self.__graph_controller.shortest_path(end_vertex, start_vertex)
-            write_file.write(f'\nGraph100k {end_vertex} to {start_vertex}: distance: {distance}, path: {path}')
-
-            print("Done!")
+            write_file.write("\n".join(lines))
             write_file.close()
+            print("Done!")
+        elif user_option == BATCH_QUERIES:
+            query_file_path = input("Query file (graph_path start_vertex end_vertex per line): ")
+            output_path = input("Output file (.jsonl or .csv): ")
+            try:
+                number_of_answers, number_of_errors = run_query_file(query_file_path, output_path)
+            except (GraphError, OSError) as error:
+                print(error)
+                return
+            print(f'{number_of_answers} queries answered, {number_of_errors} errors, written to {output_path}')
         elif user_option == TOPOLOGICAL_SORT:
             sorted_graph = self.__graph_controller.topological_sort_counting_predecessors()
             if sorted_graph is None:
                 print("Graph contains a cycle")
                 return
-            print(sorted_graph)
+            print(self.with_activity_names(sorted_graph))
         elif user_option == EARLIEST_START:
             earliest_start = self.__graph_controller.earliest_start()
             if earliest_start is None:
                 print("The graph could not be sorted")
                 return
-            print(earliest_start)
+            print(self.with_activity_names(earliest_start))
         elif user_option == LATEST_START:
-            earliest_start = self.__graph_controller.latest_start()
-            if earliest_start is None:
+            latest_start = self.__graph_controller.latest_start()
+            if latest_start is None:
                 print("The graph could not be sorted")
                 return
-            print(earliest_start)
+            print(self.with_activity_names(latest_start))
         elif user_option == CRITICAL_PATH:
             critical_path = self.__graph_controller.critical_activities()
             if critical_path is None:
                 print("The graph could not be topologically sorted")
                 return
-            print(critical_path)
+            print(self.with_activity_names(critical_path))
         elif user_option == READ_ACTIVITIES:
             print("File location from parent folder(default for default location): ")
             file_path = self.read_general_user_input()
             if file_path == 'default':
-                file_path = "data/input.txt"
+                file_path = "data/activities.txt"
             try:
                 self.__graph_controller.read_activities_graph(file_path)
             except Exception:
                 print("Reading graph from file was unsuccessful.")
                 return
             print(f'Loaded graph from {file_path} successfully.')
+        elif user_option == READ_COMPACT_GRAPH:
+            print("File location from parent folder(default for default location): ")
+            file_path = self.read_general_user_input()
+            if file_path == 'default':
+                file_path = "data/input.txt"
+            try:
+                self.__graph_controller.read_compact_directed_graph(file_path)
+            except Exception:
+                print("Reading graph from file was unsuccessful.")
+                return
+            print(f'Loaded compact graph from {file_path} successfully.')
+        elif user_option == MAKE_GRAPH_COMPACT:
+            try:
+                self.__graph_controller.make_graph_compact()
+            except GraphError as GE:
+                print(GE)
+                return
+            print("The current graph is now compact and read-only.")
+        elif user_option == WRITE_BINARY_GRAPH:
+            print("File location from parent folder(default for default location): ")
+            file_path = self.read_general_user_input()
+            if file_path == 'default':
+                file_path = "data/output.dcg"
+            try:
+                self.__graph_controller.write_graph_binary(file_path)
+            except GraphError as GE:
+                print(GE)
+                return
+            print(f'Graph written successfully to {file_path}')
+        elif user_option == READ_BINARY_GRAPH:
+            print("File location from parent folder(default for default location): ")
+            file_path = self.read_general_user_input()
+            if file_path == 'default':
+                file_path = "data/output.dcg"
+            try:
+                self.__graph_controller.read_graph_binary(file_path)
+            except GraphError as GE:
+                print(GE)
+                return
+            except OSError:
+                print("Reading graph from file was unsuccessful.")
+                return
+            print(f'Loaded graph from {file_path} successfully.')
+        elif user_option == SHORTEST_PATH_CACHE_STATISTICS:
+            for name, value in self.__graph_controller.get_shortest_path_cache_statistics().items():
+                print(f'{name}: {value}')
+        elif user_option == COUNT_COMPONENTS_IN_FILE:
+            print("File location from parent folder(default for default location): ")
+            file_path = self.read_general_user_input()
+            if file_path == 'default':
+                file_path = "data/input.txt"
+            try:
+                number_of_components = self.__graph_controller.count_connected_components_in_file(file_path)
+            except OSError as file_error:
+                print(file_error)
+                return
+            print(f'The graph in {file_path} has {number_of_components} connected components.')
+        elif user_option == STRONGLY_CONNECTED_COMPONENTS:
+            strongly_connected_components = self.__graph_controller.strongly_connected_components()
+            for i in range(strongly_connected_components.get_number_of_components()):
+                print(f'Strongly connected component {i}: {strongly_connected_components.get_component_vertices(i)}')
+        elif user_option == CONDENSE_GRAPH:
+            strongly_connected_components = self.__graph_controller.condense_graph()
+            print(f'The graph was replaced by its condensation with '
+                  f'{strongly_connected_components.get_number_of_components()} vertices; vertex i stands for '
+                  f'strongly connected component i.')
+        elif user_option == REACHABILITY:
+            try:
+                edge = self.read_user_input_edge()
+            except EdgeInputError as EdgeError:
+                print(EdgeError)
+                return
+            print("Maximum number of edges (none for no limit): ")
+            max_hops = self.read_general_user_input()
+            try:
+                max_hops = None if max_hops == 'none' else int(max_hops)
+                reachable = self.__graph_controller.is_reachable(edge[0], edge[1], max_hops)
+            except ValueError:
+                print("The maximum number of edges must be an integer.")
+                return
+            except GraphError as GE:
+                print(GE)
+                return
+            if reachable:
+                print(f'{edge[1]} can be reached from {edge[0]}.')
+            else:
+                print(f'{edge[1]} can not be reached from {edge[0]}.')
+        elif user_option == SHOW_SNAPSHOTS:
+            snapshot_statistics = self.__graph_controller.get_snapshot_statistics()
+            if not snapshot_statistics:
+                print("There are no copies of the graph.")
+            for i, statistics in enumerate(snapshot_statistics):
+                print(f'Copy {i + 1} (most recent first): {statistics["vertices"]} vertices, '
+                      f'{statistics["edges"]} edges, '
+                      f'{statistics["unshared_bytes"] / 1024:.1f} KiB not shared with the newer graph')
+        elif user_option == UNDO:
+            if self.__graph_controller.undo():
+                print("Undid the last change.")
+                return
+            print("There is no change to undo.")
+        elif user_option == REDO:
+            if self.__graph_controller.redo():
+                print("Redid the last undone change.")
+                return
+            print("There is no change to redo.")
+        elif user_option == START_JOURNAL_FILE:
+            print("File location from parent folder(default for default location): ")
+            file_path = self.read_general_user_input()
+            if file_path == 'default':
+                file_path = "data/journal.txt"
+            try:
+                self.__graph_controller.start_journal_file(file_path)
+            except OSError as file_error:
+                print(file_error)
+                return
+            print(f'Every change will be saved to {file_path}.')
+        elif user_option == REPLAY_JOURNAL_FILE:
+            print("File location from parent folder(default for default location): ")
+            file_path = self.read_general_user_input()
+            if file_path == 'default':
+                file_path = "data/journal.txt"
+            try:
+                number_of_entries = self.__graph_controller.replay_journal_file(file_path)
+            except (OSError, GraphError) as replay_error:
+                print(replay_error)
+                return
+            print(f'Replayed {number_of_entries} journal entries.')
+        elif user_option == SCHEDULE:
+            schedule = self.__graph_controller.get_schedule()
+            if schedule is None:
+                print("The graph could not be topologically sorted")
+                return
+            print(f'Duration: {schedule.get_duration()}')
+            print(f'Slack: {self.with_activity_names(schedule.get_slack())}')
+            print(f'Critical path: {self.with_activity_names(schedule.get_critical_path())}')
+        elif user_option == TOPOLOGICAL_LEVELS:
+            levels = self.__graph_controller.topological_levels()
+            if levels is None:
+                print("Graph contains a cycle")
+                return
+            for i, level in enumerate(levels):
+                print(f'Level {i}: {self.with_activity_names(level)}')
+            print(f'Antichain width: {self.__graph_controller.get_antichain_width()}')
         else:
             print("Unknown command.")